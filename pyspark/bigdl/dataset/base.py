@@ -14,15 +14,23 @@
 # limitations under the License.
 #
 
+import hashlib
+import json
 import os
 import sys
-import shutil
-import tempfile
+import threading
 import time
 from distutils.dir_util import mkpath
-from six.moves.urllib.request import urlopen
+from six.moves.urllib.error import HTTPError
+from six.moves.urllib.request import Request, urlopen
 import numpy as np
 
+try:
+    import fcntl
+except ImportError:
+    # no inter-process lock on Windows
+    fcntl = None
+
 
 # Adopt from keras
 class Progbar(object):
@@ -146,53 +154,244 @@ def display_table(rows, positions):
     for objects in rows:
         display_row(objects, positions)
 
-# Adopt from keras
-# Under Python 2, 'urlretrieve' relies on FancyURLopener from legacy
-# urllib module, known to have issues with proxy management
-if sys.version_info[0] == 2:
-    def urlretrieve(url, filename, reporthook=None, data=None):
-        def chunk_read(response, chunk_size=8192, reporthook=None):
-            total_size = response.info().get('Content-Length').strip()
-            total_size = int(total_size)
-            count = 0
-            while 1:
-                chunk = response.read(chunk_size)
-                count += 1
-                if not chunk:
-                    reporthook(count, total_size, total_size)
-                    break
-                if reporthook:
-                    reporthook(count, chunk_size, total_size)
-                yield chunk
-
-        response = urlopen(url, data)
-        with open(filename, 'wb') as fd:
-            for chunk in chunk_read(response, reporthook=reporthook):
-                fd.write(chunk)
-else:
-    from six.moves.urllib.request import urlretrieve
-
-
-def maybe_download(filename, work_directory, source_url):
+
+DOWNLOAD_CHUNK_SIZE = 4 * 1024 * 1024
+DOWNLOAD_INDEX = ".bigdl_download_index.json"
+# rename over an existing file, os.rename can't on Windows
+_replace = getattr(os, "replace", os.rename)
+
+
+class FileLock(object):
+    """
+    An exclusive lock on a file shared by the processes on a host, so the executors
+    sharing a work directory download a file once. It does nothing without fcntl.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.fd = None
+
+    def __enter__(self):
+        self.fd = open(self.path, "a")
+        if fcntl is not None:
+            fcntl.flock(self.fd.fileno(), fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *args):
+        if fcntl is not None:
+            fcntl.flock(self.fd.fileno(), fcntl.LOCK_UN)
+        self.fd.close()
+
+
+def file_sha256(path, block_size=1 << 20):
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+def _read_index(work_directory):
+    path = os.path.join(work_directory, DOWNLOAD_INDEX)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except ValueError:
+        return {}
+
+
+def _update_index(work_directory, filename, entry):
+    path = os.path.join(work_directory, DOWNLOAD_INDEX)
+    with FileLock(path + ".lock"):
+        index = _read_index(work_directory)
+        index[filename] = entry
+        with open(path + ".tmp", "w") as f:
+            json.dump(index, f, indent=1, sort_keys=True)
+        _replace(path + ".tmp", path)
+
+
+def _index_entry(filepath, source_url, sha256):
+    stat = os.stat(filepath)
+    return {"url": source_url, "size": stat.st_size, "mtime": stat.st_mtime, "sha256": sha256}
+
+
+def _cached_sha256(filepath, work_directory):
+    """
+    The sha256 of a downloaded file, read from the index if the file is not changed.
+    """
+    entry = _read_index(work_directory).get(os.path.basename(filepath))
+    stat = os.stat(filepath)
+    if entry and entry.get("size") == stat.st_size and entry.get("mtime") == stat.st_mtime:
+        return entry["sha256"]
+    return file_sha256(filepath)
+
+
+def _probe(source_url):
+    """
+    Get the size of the file at source_url, and whether the server supports range requests.
+    """
+    try:
+        response = urlopen(Request(source_url, headers={"Range": "bytes=0-0"}))
+    except HTTPError as e:
+        if e.code != 416:
+            raise
+        # an empty file can't satisfy the range
+        return None, False
+    try:
+        content_range = response.info().get("Content-Range")
+        if response.getcode() == 206 and content_range and "/" in content_range:
+            total = content_range.split("/")[-1].strip()
+            if total != "*":
+                return int(total), True
+        length = response.info().get("Content-Length")
+        return (int(length) if length else None), False
+    finally:
+        response.close()
+
+
+def _download_stream(source_url, part_path, progress):
+    response = urlopen(source_url)
+    try:
+        with open(part_path, "wb") as f:
+            for block in iter(lambda: response.read(64 * 1024), b""):
+                f.write(block)
+                progress(len(block))
+    finally:
+        response.close()
+
+
+def _download_chunks(source_url, part_path, total_size, chunk_size, num_threads, progress):
+    """
+    Fetch the chunks of the file with range requests in parallel into part_path. The
+    finished chunks are recorded in part_path + ".done", so an interrupted download
+    resumes from the missing chunks.
+    """
+    done_path = part_path + ".done"
+    header = json.dumps({"url": source_url, "size": total_size, "chunk_size": chunk_size})
+    done = set()
+    if os.path.exists(part_path) and os.path.exists(done_path):
+        with open(done_path) as f:
+            lines = f.read().splitlines()
+        if lines and lines[0] == header:
+            done = set(int(line) for line in lines[1:] if line.strip())
+    if not done:
+        with open(part_path, "wb") as f:
+            f.truncate(total_size)
+        with open(done_path, "w") as f:
+            f.write(header + "\n")
+    chunk_num = (total_size + chunk_size - 1) // chunk_size
+    todo = [i for i in range(chunk_num) if i not in done]
+    progress(sum(min(chunk_size, total_size - i * chunk_size) for i in done))
+
+    lock = threading.Lock()
+    errors = []
+
+    def fetch(index):
+        start = index * chunk_size
+        end = min(start + chunk_size, total_size) - 1
+        response = urlopen(Request(source_url, headers={"Range": "bytes=%d-%d" % (start, end)}))
+        try:
+            if response.getcode() != 206:
+                raise IOError("%s does not return the range %d-%d" % (source_url, start, end))
+            with open(part_path, "r+b") as f:
+                f.seek(start)
+                for block in iter(lambda: response.read(64 * 1024), b""):
+                    f.write(block)
+                    progress(len(block))
+                if f.tell() != end + 1:
+                    raise IOError("Incomplete range %d-%d of %s" % (start, end, source_url))
+        finally:
+            response.close()
+        with lock:
+            with open(done_path, "a") as f:
+                f.write("%d\n" % index)
+
+    def worker():
+        while not errors:
+            with lock:
+                if not todo:
+                    return
+                index = todo.pop(0)
+            try:
+                fetch(index)
+            except Exception as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(max(1, min(num_threads, len(todo))))]
+    for t in threads:
+        t.daemon = True
+        t.start()
+    for t in threads:
+        t.join()
+    if errors:
+        raise errors[0]
+    os.remove(done_path)
+
+
+def maybe_download(filename, work_directory, source_url, sha256=None, num_threads=4,
+                   chunk_size=DOWNLOAD_CHUNK_SIZE):
+    """
+    Download source_url as filename into work_directory if it's not there yet.
+
+    If the server supports range requests, the file is fetched in chunks by num_threads
+    threads, and an interrupted download resumes from the chunks left. The file is written
+    to filename.part and renamed when it's complete, and a lock file keeps the processes
+    sharing work_directory from downloading it at the same time. The sha256 of the
+    downloaded files is kept in an index in work_directory, so an existing file is only
+    hashed again when it's changed.
+
+    :param filename: the file name in work_directory
+    :param work_directory: the directory to save the file
+    :param source_url: the url to download
+    :param sha256: the expected sha256 hex digest of the file, not checked if it's None
+    :param num_threads: the number of parallel range requests
+    :param chunk_size: the size of each range request in bytes
+    :return: the path of the file
+    """
     if not os.path.exists(work_directory):
         mkpath(work_directory)
     filepath = os.path.join(work_directory, filename)
+    part_path = filepath + ".part"
+
+    with FileLock(filepath + ".lock"):
+        if os.path.exists(filepath):
+            if sha256 is None:
+                return filepath
+            if _cached_sha256(filepath, work_directory) == sha256:
+                _update_index(work_directory, filename,
+                              _index_entry(filepath, source_url, sha256))
+                return filepath
+            print('Checksum mismatch, downloading', filename, 'again')
+            os.remove(filepath)
 
-    if not os.path.exists(filepath):
         print('Downloading data from', source_url)
-        global progbar
-        progbar = None
+        total_size, ranged = _probe(source_url)
+        progbar = Progbar(total_size) if total_size else None
+        received = [0]
+        progress_lock = threading.Lock()
 
-        def dl_progress(count, block_size, total_size):
-            global progbar
-            if progbar is None:
-                progbar = Progbar(total_size)
-            else:
-                progbar.update(count * block_size)
-        with tempfile.NamedTemporaryFile() as tmpfile:
-            temp_file_name = tmpfile.name
-            urlretrieve(source_url, temp_file_name, dl_progress)
-            shutil.copy2(temp_file_name, filepath)
-            size = os.path.getsize(filepath)
-            print('Successfully downloaded', filename, size, 'bytes.')
+        def progress(n):
+            with progress_lock:
+                received[0] += n
+                if progbar is not None and n > 0:
+                    progbar.update(min(received[0], total_size))
+
+        if ranged and total_size > 0:
+            _download_chunks(source_url, part_path, total_size, chunk_size,
+                             num_threads, progress)
+        else:
+            _download_stream(source_url, part_path, progress)
+        if progbar is not None:
+            progbar.update(total_size, force=True)
+
+        digest = file_sha256(part_path)
+        if sha256 is not None and digest != sha256:
+            os.remove(part_path)
+            raise IOError("Checksum mismatch for %s: expected %s, got %s"
+                          % (source_url, sha256, digest))
+        _replace(part_path, filepath)
+        _update_index(work_directory, filename, _index_entry(filepath, source_url, digest))
+        size = os.path.getsize(filepath)
+        print('Successfully downloaded', filename, size, 'bytes.')
     return filepath
@@ -17,6 +17,7 @@
 
 
 import gzip
+import os
 
 import numpy
 
@@ -73,20 +74,53 @@ def extract_labels(f):
         return labels
 
 
-def read_data_sets(train_dir, data_type="train"):
+def _load_cached(local_file, extract, suffix="", convert=None):
     """
-    Parse or download mnist data if train_dir is empty.
+    Load the array decoded from a gzipped IDX file, which is cached in an uncompressed
+    .npy file next to it. The cache is memory mapped read-only, so the processes on a
+    host share one copy in the page cache.
+
+    :param: local_file: the gzipped IDX file
+    :param: extract: the function decoding the IDX file
+    :param: suffix: the suffix of the cache file name, for the converted arrays
+    :param: convert: the function converting the decoded array before caching it
+    :return: a read-only memory mapped ndarray
+    """
+    cache = local_file[:-len(".gz")] + suffix + ".npy"
+    with base.FileLock(cache + ".lock"):
+        if not os.path.exists(cache) or \
+                os.path.getmtime(cache) < os.path.getmtime(local_file):
+            with open(local_file, 'rb') as f:
+                data = extract(f)
+            if convert is not None:
+                data = convert(data)
+            with open(cache + ".tmp", 'wb') as f:
+                numpy.save(f, data)
+            base._replace(cache + ".tmp", cache)
+    return numpy.load(cache, mmap_mode='r')
+
+
+def read_data_sets(train_dir, data_type="train", normalize=False):
+    """
+    Parse or download mnist data if train_dir is empty. The decoded data is cached in
+    .npy files in train_dir, and the cached files are memory mapped by the later calls.
 
     :param: train_dir: The directory storing the mnist data
 
     :param: data_type: Reading training set or testing set.It can be either "train" or "test"
 
+    :param: normalize: Return the features normalized by the mean and std of the data set
+                       as float32, so they don't need to be normalized per record.
+
     :return:
 
     ```
     (ndarray, ndarray) representing (features, labels)
-    features is a 4D unit8 numpy array [index, y, x, depth] representing each pixel valued from 0 to 255.
+    features is a 4D numpy array [index, y, x, depth]. By default it's uint8, each pixel
+    valued from 0 to 255. With normalize=True it's float32, each pixel already
+    standardized as (pixel - mean) / std with the mean and std of the data set.
     labels is 1D unit8 nunpy array representing the label valued from 0 to 9.
+    Both are read-only.
     ```
 
     """
@@ -96,28 +130,24 @@ def read_data_sets(train_dir, data_type="train"):
     TEST_LABELS = 't10k-labels-idx1-ubyte.gz'
 
     if data_type == "train":
-        local_file = base.maybe_download(TRAIN_IMAGES, train_dir,
-                                         SOURCE_URL + TRAIN_IMAGES)
-        with open(local_file, 'rb') as f:
-            train_images = extract_images(f)
-
-        local_file = base.maybe_download(TRAIN_LABELS, train_dir,
-                                         SOURCE_URL + TRAIN_LABELS)
-        with open(local_file, 'rb') as f:
-            train_labels = extract_labels(f)
-        return train_images, train_labels
-
+        images_file, labels_file = TRAIN_IMAGES, TRAIN_LABELS
+        mean, std = TRAIN_MEAN, TRAIN_STD
+    else:
+        images_file, labels_file = TEST_IMAGES, TEST_LABELS
+        mean, std = TEST_MEAN, TEST_STD
+
+    local_file = base.maybe_download(images_file, train_dir,
+                                     SOURCE_URL + images_file)
+    if normalize:
+        images = _load_cached(local_file, extract_images, ".normalized",
+                              lambda data: ((data - mean) / std).astype(numpy.float32))
     else:
-        local_file = base.maybe_download(TEST_IMAGES, train_dir,
-                                         SOURCE_URL + TEST_IMAGES)
-        with open(local_file, 'rb') as f:
-            test_images = extract_images(f)
-
-        local_file = base.maybe_download(TEST_LABELS, train_dir,
-                                         SOURCE_URL + TEST_LABELS)
-        with open(local_file, 'rb') as f:
-            test_labels = extract_labels(f)
-        return test_images, test_labels
+        images = _load_cached(local_file, extract_images)
+
+    local_file = base.maybe_download(labels_file, train_dir,
+                                     SOURCE_URL + labels_file)
+    labels = _load_cached(local_file, extract_labels)
+    return images, labels
 
 
 if __name__ == "__main__":
@@ -16,6 +16,7 @@
 
 import tarfile
 from bigdl.dataset import base
+import numpy as np
 import os
 import sys
 
@@ -50,35 +51,228 @@ def download_glove_w2v(dest_dir):
     return extracted_to
 
 
-def get_news20(source_dir="/tmp/news20/"):
+def _news20_labels(news_dir):
     """
-    Parse or download news20 if source_dir is empty.
+    The label of each class directory, numbered from 1 in sorted order.
+    """
+    labels = {}
+    for label_id, name in enumerate(sorted(os.listdir(news_dir)), 1):
+        if os.path.isdir(os.path.join(news_dir, name)):
+            labels[name] = label_id
+    return labels
+
+
+def _decode(content):
+    if sys.version_info < (3,):
+        return content
+    return content.decode('latin-1')
+
+
+def _decode_document(content):
+    """
+    Decode a document read as bytes like the text mode open did, translating "\\r\\n"
+    and "\\r" line endings to "\\n" on Python 3.
+    """
+    if sys.version_info < (3,):
+        return content
+    return _decode(content).replace('\r\n', '\n').replace('\r', '\n')
+
+
+def iter_news20(source_dir="/tmp/news20/"):
+    """
+    Parse or download news20 if source_dir is empty, and yield the documents one by one
+    instead of holding the whole corpus in memory. On Python 3 the documents are decoded
+    as latin-1 with the line endings translated to "\\n".
 
     :param source_dir: The directory storing news data.
-    :return: A list of (tokens, label)
+    :return: A generator of (content, label)
     """
     news_dir = download_news20(source_dir)
-    texts = []  # list of text samples
-    label_id = 0
-    for name in sorted(os.listdir(news_dir)):
+    labels = _news20_labels(news_dir)
+    for name in sorted(labels):
         path = os.path.join(news_dir, name)
-        label_id += 1
-        if os.path.isdir(path):
-            for fname in sorted(os.listdir(path)):
-                if fname.isdigit():
-                    fpath = os.path.join(path, fname)
-                    if sys.version_info < (3,):
-                        f = open(fpath)
-                    else:
-                        f = open(fpath, encoding='latin-1')
-                    content = f.read()
-                    texts.append((content, label_id))
-                    f.close()
+        for fname in sorted(os.listdir(path)):
+            if fname.isdigit():
+                with open(os.path.join(path, fname), "rb") as f:
+                    yield _decode_document(f.read()), labels[name]
+
 
+def get_news20(source_dir="/tmp/news20/"):
+    """
+    Parse or download news20 if source_dir is empty.
+
+    :param source_dir: The directory storing news data.
+    :return: A list of (tokens, label)
+    """
+    texts = list(iter_news20(source_dir))
     print('Found %s texts.' % len(texts))
     return texts
 
 
+def read_news20_rdd(sc, source_dir="/tmp/news20/", min_partitions=None):
+    """
+    Parse or download news20 if source_dir is empty, and read it as a RDD. The
+    documents are read by the executors straight from the extracted directory, so
+    source_dir should be on a file system all the executors can access when running
+    on a cluster. The documents are decoded like in iter_news20.
+
+    :param sc: The SparkContext
+    :param source_dir: The directory storing news data.
+    :param min_partitions: The suggested minimum number of partitions of the RDD
+    :return: A RDD of (content, label)
+    """
+    news_dir = os.path.abspath(download_news20(source_dir))
+    labels = _news20_labels(news_dir)
+
+    def is_document(path_content):
+        class_name, fname = path_content[0].rstrip("/").split("/")[-2:]
+        return fname.isdigit() and class_name in labels
+
+    def to_text(path_content):
+        path, content = path_content
+        return _decode_document(content), labels[path.rstrip("/").split("/")[-2]]
+
+    return sc.binaryFiles(os.path.join(news_dir, "*", "*"), min_partitions) \
+        .filter(is_document).map(to_text)
+
+
+class EmbeddingStore(object):
+    """
+    Word vectors stored as one contiguous float32 matrix, with a vocabulary mapping each
+    word to its row.
+
+    :param words: the words, in the order of the rows
+    :param vectors: a [len(words), dim] ndarray, may be memory mapped
+    """
+    def __init__(self, words, vectors):
+        if len(words) != len(vectors):
+            raise ValueError("%s words but %s vectors" % (len(words), len(vectors)))
+        self.words = list(words)
+        self.vectors = vectors if vectors.dtype == np.float32 else vectors.astype(np.float32)
+        self.index = dict((word, i) for i, word in enumerate(self.words))
+
+    @property
+    def dim(self):
+        return self.vectors.shape[1]
+
+    def __len__(self):
+        return len(self.words)
+
+    def __contains__(self, word):
+        return word in self.index
+
+    def lookup(self, words):
+        """
+        Gather the vectors of the words in one pass, the unknown words get zero vectors.
+
+        :param words: a list of words
+        :return: a [len(words), dim] float32 ndarray
+        """
+        rows = np.array([self.index.get(word, -1) for word in words], dtype=np.int64)
+        found = rows >= 0
+        result = np.zeros([len(rows), self.dim], dtype=np.float32)
+        result[found] = self.vectors[rows[found]]
+        return result
+
+    def subset(self, words):
+        """
+        The store of the given words, with their rows copied out of the matrix. It's much
+        smaller to broadcast than the whole store.
+
+        :param words: the words to keep, the unknown words are skipped
+        :return: an EmbeddingStore
+        """
+        kept = [word for word in words if word in self.index]
+        return EmbeddingStore(kept, self.lookup(kept))
+
+    def save(self, path):
+        """
+        Save the store as path.npy for the matrix and path.vocab for the words, one per line.
+        """
+        np.save(path + ".npy", self.vectors)
+        with open(path + ".vocab", "wb") as f:
+            for word in self.words:
+                f.write(_encode(word) + b"\n")
+
+    @staticmethod
+    def load(path, mmap=True):
+        """
+        Load a store saved by save, the matrix is memory mapped read-only by default.
+        """
+        with open(path + ".vocab", "rb") as f:
+            words = [_decode(line.rstrip(b"\n")) for line in f]
+        return EmbeddingStore(words, np.load(path + ".npy", mmap_mode='r' if mmap else None))
+
+    def __getstate__(self):
+        # the index is rebuilt when unpickled, it's as large as the words
+        return self.words, np.ascontiguousarray(self.vectors)
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+
+def _encode(word):
+    if sys.version_info < (3,):
+        return word
+    return word.encode('latin-1')
+
+
+def _glove_vectors(f):
+    """
+    Yield the items of the lines of a GloVe text file holding a word and its vector,
+    the lines without a vector are skipped.
+    """
+    for line in f:
+        items = line.rstrip().split(b" ")
+        if len(items) > 1:
+            yield items
+
+
+def _convert_glove(txt_path, path):
+    """
+    Convert a GloVe text file to an EmbeddingStore saved as path, streaming the lines
+    into a memory mapped matrix.
+    """
+    with open(txt_path, "rb") as f:
+        rows = 0
+        dim = 0
+        for items in _glove_vectors(f):
+            rows += 1
+            dim = dim or len(items) - 1
+        f.seek(0)
+        vectors = np.lib.format.open_memmap(path + ".npy.tmp", mode='w+',
+                                            dtype=np.float32, shape=(rows, dim))
+        with open(path + ".vocab.tmp", "wb") as vocab:
+            for i, items in enumerate(_glove_vectors(f)):
+                vocab.write(items[0] + b"\n")
+                vectors[i] = [float(item) for item in items[1:]]
+        vectors.flush()
+        del vectors
+    base._replace(path + ".vocab.tmp", path + ".vocab")
+    base._replace(path + ".npy.tmp", path + ".npy")
+
+
+def get_glove_store(source_dir="/tmp/news20/", dim=100):
+    """
+    Parse or download the pre-trained glove word2vec if source_dir is empty. The text file
+    is converted once to a binary EmbeddingStore next to it, which is memory mapped by the
+    later calls.
+
+    :param source_dir: The directory storing the pre-trained word2vec
+    :param dim: The dimension of a vector
+    :return: An EmbeddingStore
+    """
+    w2v_dir = download_glove_w2v(source_dir)
+    txt_path = os.path.join(w2v_dir, "glove.6B.%sd.txt" % dim)
+    path = txt_path[:-len(".txt")]
+    with base.FileLock(path + ".lock"):
+        if not os.path.exists(path + ".npy") or \
+                os.path.getmtime(path + ".npy") < os.path.getmtime(txt_path):
+            print("Converting %s to %s.npy" % (txt_path, path))
+            _convert_glove(txt_path, path)
+    return EmbeddingStore.load(path)
+
+
 def get_glove_w2v(source_dir="/tmp/news20/", dim=100):
     """
     Parse or download the pre-trained glove word2vec if source_dir is empty.
@@ -87,18 +281,8 @@ def get_glove_w2v(source_dir="/tmp/news20/", dim=100):
     :param dim: The dimension of a vector
     :return: A dict mapping from word to vector
     """
-    w2v_dir = download_glove_w2v(source_dir)
-    w2v_path = os.path.join(w2v_dir, "glove.6B.%sd.txt" % dim)
-    if sys.version_info < (3,):
-        w2v_f = open(w2v_path)
-    else:
-        w2v_f = open(w2v_path, encoding='latin-1')
-    pre_w2v = {}
-    for line in w2v_f.readlines():
-        items = line.split(" ")
-        pre_w2v[items[0]] = [float(i) for i in items[1:]]
-    w2v_f.close()
-    return pre_w2v
+    store = get_glove_store(source_dir, dim)
+    return dict((word, store.vectors[i].tolist()) for i, word in enumerate(store.words))
 
 
 if __name__ == "__main__":
@@ -14,13 +14,303 @@
 # limitations under the License.
 #
 
+import numpy as np
 
-from bigdl.util.common import Sample
+from bigdl.util.common import Sample, SampleBlock, get_dtype
 
 
 def normalizer(mean, std):
     """
-    Normalize features by standard deviation
+    Normalize features by standard deviation, works on both Sample and SampleBlock
     """
-    return lambda sample: Sample.from_ndarray((sample.features - mean) / std,
-                                              sample.label, sample.bigdl_type)
+    def normalize(record):
+        if isinstance(record, SampleBlock):
+            return SampleBlock.from_ndarray((record.features - mean) / std,
+                                            record.labels, record.bigdl_type, copy=False)
+        return Sample.from_ndarray((record.features - mean) / std,
+                                   record.label, record.bigdl_type, copy=False)
+    return normalize
+
+
+class Transformer(object):
+    """
+    A preprocessing stage working on a SampleBlock, whose features and labels are the
+    records stacked along the first dimension. A stage works on the whole block with
+    numpy, in place where it can, instead of creating a Sample per record. The block
+    owns its arrays unless it's created by SampleBlock.from_ndarray with copy=False, so
+    the arrays it was created from are left unchanged.
+
+    Stages are chained with `+` into a Pipeline, and `apply` runs all of them in one
+    pass over each partition of a RDD.
+
+    >>> import numpy as np
+    >>> block = SampleBlock.from_ndarray(np.arange(8).reshape([2, 1, 2, 2]), np.array([1, 2]))
+    >>> block = (Normalize(2.0, 2.0) + OneHot(2))(block)
+    >>> block.features[1].tolist()
+    [[[1.0, 1.5], [2.0, 2.5]]]
+    >>> block.labels.tolist()
+    [[1.0, 0.0], [0.0, 1.0]]
+    >>> features = np.zeros([2, 2], dtype="float32")
+    >>> block = Normalize(1.0, 2.0)(SampleBlock.from_ndarray(features, np.array([1, 2])))
+    >>> features.tolist()
+    [[0.0, 0.0], [0.0, 0.0]]
+    """
+    def transform(self, block):
+        """
+        Transform a SampleBlock.
+
+        :param block: a SampleBlock, whose arrays may be changed in place
+        :return: the transformed SampleBlock
+        """
+        raise NotImplementedError
+
+    def __call__(self, block):
+        return self.transform(block)
+
+    def __add__(self, other):
+        return Pipeline(self, other)
+
+    def seed_partition(self, index):
+        """
+        Reseed the random state of the stage for a partition. The stage is unpickled from
+        the same bytes in every task, so without it all the partitions and all the
+        recomputes of a partition would draw the same random numbers.
+
+        :param index: the index of the partition
+        """
+        pass
+
+    def transform_partition(self, index, iterator):
+        """
+        Transform the blocks of a partition, used by apply.
+
+        :param index: the index of the partition
+        :param iterator: an iterator of SampleBlock or (features_block, labels_block)
+        :return: a generator of SampleBlock
+        """
+        self.seed_partition(index)
+        for block in iterator:
+            if not isinstance(block, SampleBlock):
+                block = SampleBlock.from_ndarray(*block)
+            yield self.transform(block)
+
+    def apply(self, rdd):
+        """
+        Transform a RDD of SampleBlock, or of (features_block, labels_block) ndarray pairs,
+        in one pass over each partition.
+
+        :param rdd: a RDD of SampleBlock or (features_block, labels_block)
+        :return: a RDD of SampleBlock
+        """
+        return rdd.mapPartitionsWithIndex(self.transform_partition)
+
+
+class Pipeline(Transformer):
+    """
+    Run the stages one after another on each block.
+
+    :param stages: the transformers to chain
+    """
+    def __init__(self, *stages):
+        self.stages = []
+        for stage in stages:
+            self.stages.extend(stage.stages if isinstance(stage, Pipeline) else [stage])
+
+    def seed_partition(self, index):
+        for stage in self.stages:
+            stage.seed_partition(index)
+
+    def transform(self, block):
+        for stage in self.stages:
+            block = stage.transform(block)
+        return block
+
+
+def _writable_features(block):
+    """
+    The features of the block as a writable ndarray of the block's dtype. The features
+    decoded from the JVM or memory mapped are read-only, they are copied once per block.
+    """
+    dtype = get_dtype(block.bigdl_type)
+    features = block.features
+    if features.dtype != dtype or not features.flags.writeable:
+        features = features.astype(dtype)
+    block.features = features
+    return features
+
+
+def _partition_rng(seed, index):
+    """
+    The random state of a partition, drawn from the OS entropy if seed is None, otherwise
+    derived from the seed and the partition index.
+    """
+    if seed is None:
+        return np.random.RandomState()
+    return np.random.RandomState([seed, index])
+
+
+def _spatial_axes(data_format):
+    """
+    The height and width axes of the features of a block.
+    """
+    if data_format == "nchw":
+        return -2, -1
+    elif data_format == "nhwc":
+        return -3, -2
+    raise ValueError('data_format should be "nchw" or "nhwc", but got %s' % data_format)
+
+
+class Normalize(Transformer):
+    """
+    Normalize the features by a mean and a standard deviation.
+
+    :param mean: the mean subtracted from the features
+    :param std: the standard deviation dividing the features
+    """
+    def __init__(self, mean, std):
+        self.mean = mean
+        self.std = std
+
+    def transform(self, block):
+        features = _writable_features(block)
+        features -= self.mean
+        features /= self.std
+        return block
+
+
+class ChannelNormalize(Transformer):
+    """
+    Normalize each channel of the features by its own mean and standard deviation.
+
+    :param mean: the mean of each channel
+    :param std: the standard deviation of each channel
+    :param data_format: the layout of a record, "nchw" for channel first or "nhwc"
+                        for channel last
+    """
+    def __init__(self, mean, std, data_format="nchw"):
+        _spatial_axes(data_format)
+        self.mean = np.asarray(mean)
+        self.std = np.asarray(std)
+        self.data_format = data_format
+
+    def transform(self, block):
+        features = _writable_features(block)
+        shape = [1] * features.ndim
+        shape[1 if self.data_format == "nchw" else -1] = len(self.mean)
+        features -= self.mean.reshape(shape).astype(features.dtype)
+        features /= self.std.reshape(shape).astype(features.dtype)
+        return block
+
+
+class Crop(Transformer):
+    """
+    Crop the features of each record to height x width, at the center or at a random
+    position of each record.
+
+    :param height: the height of the cropped features
+    :param width: the width of the cropped features
+    :param random: crop at a random position of each record, otherwise at the center
+    :param data_format: the layout of a record, "nchw" or "nhwc"
+    :param seed: the seed of the random positions, each partition of a RDD gets its own
+                 random state derived from it
+    """
+    def __init__(self, height, width, random=False, data_format="nchw", seed=None):
+        self.height_axis, self.width_axis = _spatial_axes(data_format)
+        self.height = height
+        self.width = width
+        self.random = random
+        self.seed = seed
+        self.rng = np.random.RandomState(seed)
+
+    def transform(self, block):
+        features = block.features
+        full_height = features.shape[self.height_axis]
+        full_width = features.shape[self.width_axis]
+        if full_height < self.height or full_width < self.width:
+            raise ValueError("Can't crop %sx%s from %sx%s" % (
+                self.height, self.width, full_height, full_width))
+        if not self.random:
+            top = (full_height - self.height) // 2
+            left = (full_width - self.width) // 2
+            # a view of the block, nothing is copied
+            block.features = self._view(features, top, left)
+            return block
+
+        tops = self.rng.randint(0, full_height - self.height + 1, len(features))
+        lefts = self.rng.randint(0, full_width - self.width + 1, len(features))
+        shape = list(features.shape)
+        shape[self.height_axis] = self.height
+        shape[self.width_axis] = self.width
+        cropped = np.empty(shape, dtype=features.dtype)
+        for i in range(len(features)):
+            cropped[i] = self._view(features[i:i + 1], tops[i], lefts[i])[0]
+        block.features = cropped
+        return block
+
+    def seed_partition(self, index):
+        self.rng = _partition_rng(self.seed, index)
+
+    def _view(self, features, top, left):
+        index = [slice(None)] * features.ndim
+        index[self.height_axis] = slice(top, top + self.height)
+        index[self.width_axis] = slice(left, left + self.width)
+        return features[tuple(index)]
+
+
+class HorizontalFlip(Transformer):
+    """
+    Flip the features of each record horizontally with a probability.
+
+    :param probability: the probability to flip a record
+    :param data_format: the layout of a record, "nchw" or "nhwc"
+    :param seed: the seed choosing the records to flip, each partition of a RDD gets its
+                 own random state derived from it
+    """
+    def __init__(self, probability=0.5, data_format="nchw", seed=None):
+        self.width_axis = _spatial_axes(data_format)[1]
+        self.probability = probability
+        self.seed = seed
+        self.rng = np.random.RandomState(seed)
+
+    def seed_partition(self, index):
+        self.rng = _partition_rng(self.seed, index)
+
+    def transform(self, block):
+        flipped = np.nonzero(self.rng.rand(len(block.features)) < self.probability)[0]
+        if len(flipped):
+            features = _writable_features(block)
+            # reverse the width axis by slicing, np.flip needs numpy 1.12
+            index = [slice(None)] * features.ndim
+            index[self.width_axis] = slice(None, None, -1)
+            features[flipped] = features[flipped][tuple(index)]
+        return block
+
+
+class OneHot(Transformer):
+    """
+    Encode the class labels as one-hot vectors.
+
+    :param class_num: the number of classes
+    :param label_start: the label of the first class, BigDL labels start from 1
+    """
+    def __init__(self, class_num, label_start=1):
+        self.class_num = class_num
+        self.label_start = label_start
+
+    def transform(self, block):
+        labels = block.labels.reshape(len(block.labels)).astype(np.int64) - self.label_start
+        one_hot = np.zeros([len(labels), self.class_num], dtype=get_dtype(block.bigdl_type))
+        one_hot[np.arange(len(labels)), labels] = 1
+        block.labels = one_hot
+        return block
+
+
+def _test():
+    import doctest
+    (failure_count, test_count) = doctest.testmod(optionflags=doctest.ELLIPSIS)
+    if failure_count:
+        exit(-1)
+
+
+if __name__ == "__main__":
+    _test()
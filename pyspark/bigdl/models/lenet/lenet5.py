@@ -48,15 +48,13 @@ def get_mnist(sc, data_type="train", location="/tmp/mnist"):
     :param sc: SparkContext
     :param data_type: training data or testing data
     :param location: Location storing the mnist
-    :return: A RDD of Sample
+    :return: A RDD of SampleBlock, one block per partition
     """
-    (images, labels) = mnist.read_data_sets(location, data_type)
-    images = sc.parallelize(images)
-    labels = sc.parallelize(labels)
+    (images, labels) = mnist.read_data_sets(location, data_type, normalize=True)
     # Target start from 1 in BigDL
-    record = images.zip(labels).map(lambda features_label:
-                                    Sample.from_ndarray(features_label[0], features_label[1] + 1))
-    return record
+    blocks = zip(np.array_split(images, sc.defaultParallelism),
+                 np.array_split(labels + 1, sc.defaultParallelism))
+    return to_sample_rdd(sc.parallelize(list(blocks), sc.defaultParallelism))
 
 
 if __name__ == "__main__":
@@ -80,10 +78,8 @@ if __name__ == "__main__":
             else:
                 return MaxIteration(options.endTriggerNum)
 
-        train_data = get_mnist(sc, "train").map(
-            normalizer(mnist.TRAIN_MEAN, mnist.TRAIN_STD))
-        test_data = get_mnist(sc, "test").map(
-            normalizer(mnist.TEST_MEAN, mnist.TEST_STD))
+        train_data = get_mnist(sc, "train")
+        test_data = get_mnist(sc, "test")
 
         optimizer = Optimizer(
             model=build_model(10),
@@ -103,8 +99,7 @@ if __name__ == "__main__":
         parameters = trained_model.parameters()
     elif options.action == "test":
         # Load a pre-trained model and then validate it through top1 accuracy.
-        test_data = get_mnist(sc, "test").map(
-            normalizer(mnist.TEST_MEAN, mnist.TEST_STD))
+        test_data = get_mnist(sc, "test")
         model = Model.load(options.modelPath)
         results = model.test(test_data, options.batchSize, [Top1Accuracy()])
         for result in results:
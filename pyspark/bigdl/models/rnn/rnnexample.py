@@ -90,8 +90,7 @@ def prepare_data(sc, folder, vocabsize, training_split):
         size = len(labeled_sent[0])
         feature_onehot = np.zeros(size * total_vocab_len, dtype='int').reshape(
             [size, total_vocab_len])
-        for i, el in enumerate(labeled_sent[0]):
-            feature_onehot[i, el] = 1
+        feature_onehot[np.arange(size), labeled_sent[0]] = 1
         return feature_onehot, label
 
     def padding(features, label, length):
@@ -15,7 +15,6 @@
 #
 
 
-import itertools
 import re
 from optparse import OptionParser
 
@@ -52,18 +51,8 @@ def pad(l, fill_value, width):
         return l
 
 
-def to_vec(token, b_w2v, embedding_dim):
-    if token in b_w2v:
-        return b_w2v[token]
-    else:
-        return pad([], 0, embedding_dim)
-
-
 def to_sample(vectors, label, embedding_dim):
-    # flatten nested list
-    flatten_features = list(itertools.chain(*vectors))
-    features = np.array(flatten_features, dtype='float').reshape(
-        [sequence_len, embedding_dim])
+    features = vectors.reshape([sequence_len, embedding_dim])
 
     if model_type.lower() == "cnn":
         features = features.transpose(1, 0)
@@ -103,8 +92,7 @@ def train(sc,
           batch_size,
           sequence_len, max_words, embedding_dim, training_split):
     print('Processing text dataset')
-    texts = news20.get_news20()
-    data_rdd = sc.parallelize(texts, 2)
+    data_rdd = news20.read_news20_rdd(sc)
 
     word_to_ic = analyze_texts(data_rdd)
 
@@ -112,9 +100,8 @@ def train(sc,
     word_to_ic = dict(word_to_ic[10: max_words])
     bword_to_ic = sc.broadcast(word_to_ic)
 
-    w2v = news20.get_glove_w2v(dim=embedding_dim)
-    filtered_w2v = dict((w, v) for w, v in w2v.items() if w in word_to_ic)
-    bfiltered_w2v = sc.broadcast(filtered_w2v)
+    w2v = news20.get_glove_store(dim=embedding_dim)
+    bfiltered_w2v = sc.broadcast(w2v.subset(word_to_ic))
 
     tokens_rdd = data_rdd.map(lambda text_label:
                               ([w for w in text_to_words(text_label[0]) if
@@ -122,9 +109,8 @@ def train(sc,
     padded_tokens_rdd = tokens_rdd.map(
         lambda tokens_label: (pad(tokens_label[0], "##", sequence_len), tokens_label[1]))
     vector_rdd = padded_tokens_rdd.map(lambda tokens_label:
-                                       ([to_vec(w, bfiltered_w2v.value,
-                                                embedding_dim) for w in
-                                         tokens_label[0]], tokens_label[1]))
+                                       (bfiltered_w2v.value.lookup(tokens_label[0]),
+                                        tokens_label[1]))
     sample_rdd = vector_rdd.map(
         lambda vectors_label: to_sample(vectors_label[0], vectors_label[1], embedding_dim))
 
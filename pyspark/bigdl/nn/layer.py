@@ -15,7 +15,10 @@
 #
 
 
+import os
 import sys
+import threading
+from multiprocessing.pool import ThreadPool
 
 import numpy as np
 
@@ -23,11 +26,13 @@ from bigdl.util.common import JTensor
 from bigdl.util.common import JavaValue
 from bigdl.util.common import callBigDlFunc
 from bigdl.util.common import callJavaFunc
+from bigdl.util.common import get_bigdl_context
 from bigdl.util.common import get_spark_context
 from bigdl.util.common import to_list
 from bigdl.util.common import INTMAX, INTMIN, DOUBLEMAX
 from bigdl.optim.optimizer import L1Regularizer, L2Regularizer, L1L2Regularizer
 from py4j.java_gateway import JavaObject
+from pyspark.sql import DataFrame
 
 if sys.version >= '3':
     long = int
@@ -103,14 +108,14 @@ class Layer(JavaValue):
         Give this model a name. There would be a generated name
         consist of class name and UUID if user doesn't set it.
         """
-        callJavaFunc(get_spark_context(), self.value.setName, name)
+        callJavaFunc(get_bigdl_context(), self.value.setName, name)
         return self
 
     def name(self):
         """
         Name of this layer
         """
-        return callJavaFunc(get_spark_context(), self.value.getName)
+        return callJavaFunc(get_bigdl_context(), self.value.getName)
 
     def set_seed(self, seed=123):
         """
@@ -195,13 +200,65 @@ class Layer(JavaValue):
                                grad_output_is_table)
         return self.convert_output(output)
 
+    def _stack_batch(self, inputs):
+        if type(inputs) is list:
+            if len(inputs) == 0:
+                raise Exception('Error when checking: empty input')
+            inputs = np.stack([np.asarray(i) for i in inputs])
+        elif not hasattr(inputs, 'shape'):
+            raise Exception(
+                'Error when checking: expecting list of ndarray or ndarray')
+        return JTensor.from_ndarray(inputs, self.bigdl_type)
+
+    def forward_batch(self, inputs, batch_size=None):
+        """
+        NB: It's for debug only, please use optimizer.optimize() in production.
+        Computes the outputs of many records at once. The records are stacked and sent to
+        the JVM in one transfer, where forward runs on mini-batches of batch_size records, and
+        all the outputs come back in one transfer. Only single tensor input is supported.
+
+        :param inputs: list of ndarray of the same shape, or one ndarray whose first
+                       dimension indexes the records
+        :param batch_size: number of records per forward, default to all of them
+        :return: list of ndarray, one output per record
+        """
+        jinput = self._stack_batch(inputs)
+        output = callBigDlFunc(self.bigdl_type,
+                               "modelForwardBatch",
+                               self.value,
+                               jinput,
+                               batch_size if batch_size else jinput.shape[0])
+        return list(output.to_ndarray())
+
+    def backward_batch(self, inputs, grad_outputs, batch_size=None):
+        """
+        NB: It's for debug only, please use optimizer.optimize() in production.
+        Batched version of backward, see forward_batch. Each mini-batch is forwarded again
+        before its backward, and the gradients of the parameters are accumulated over all
+        the records.
+
+        :param inputs: list of ndarray of the same shape, or one stacked ndarray
+        :param grad_outputs: list of ndarray of the same shape, or one stacked ndarray
+        :param batch_size: number of records per forward/backward, default to all of them
+        :return: list of ndarray, one gradient of input per record
+        """
+        jinput = self._stack_batch(inputs)
+        jgrad_output = self._stack_batch(grad_outputs)
+        grad_input = callBigDlFunc(self.bigdl_type,
+                                   "modelBackwardBatch",
+                                   self.value,
+                                   jinput,
+                                   jgrad_output,
+                                   batch_size if batch_size else jinput.shape[0])
+        return list(grad_input.to_ndarray())
+
     def zero_grad_parameters(self):
         """
         NB: It's for debug only, please use optimizer.optimize() in production.
         If the module has parameters, this will zero the accumulation of the gradients with respect
         to these parameters. Otherwise, it does nothing.
         """
-        callJavaFunc(get_spark_context(), self.value.zeroGradParameters)
+        callJavaFunc(get_bigdl_context(), self.value.zeroGradParameters)
 
     def update_parameters(self, learning_rate):
         """
@@ -216,7 +273,39 @@ class Layer(JavaValue):
         """
         Initialize the model weights.
         """
-        callJavaFunc(get_spark_context(), self.value.reset)
+        callJavaFunc(get_bigdl_context(), self.value.reset)
+        return self
+
+    def enable_profiling(self, enabled=True):
+        """
+        Enable or disable profiling of this layer and its sub layers, it's disabled by
+        default. When it's enabled, the layers count their forward and backward calls, and
+        Optimizer.optimize adds the time and calls spent on its replicas to the model.
+
+        :param enabled: enable or disable profiling
+        """
+        callJavaFunc(get_bigdl_context(), self.value.setProfiling, enabled)
+        return self
+
+    def get_times(self):
+        """
+        Get the time spent on each layer. The time of a container is broken down into its
+        layers. The forward and backward time is always recorded, while the calls are only
+        counted and the time spent on the replicas in Optimizer.optimize is only added to
+        the model when profiling is enabled by enable_profiling.
+
+        :return: dict(layername -> (forward seconds, backward seconds, forward calls, \
+        backward calls))
+        """
+        times = callBigDlFunc(self.bigdl_type, "modelGetTimes", self.value)
+        return dict((name, tuple(value)) for name, value in times.items())
+
+    def reset_times(self):
+        """
+        Clear the time and calls recorded by this layer and its sub layers, e.g. to
+        start profiling a new run.
+        """
+        callJavaFunc(get_bigdl_context(), self.value.resetTimes)
         return self
 
     def parameters(self):
@@ -230,27 +319,112 @@ class Layer(JavaValue):
                                        self.value)
 
         def to_ndarray(params):
-            return dict((param_name,
-                         np.array(values[0], dtype=self.get_dtype()).reshape(
-                             values[1])) for param_name, values in
-                        params.items())
+            return dict((param_name, tensor.to_ndarray())
+                        for param_name, tensor in params.items())
 
         return dict((layer_name, to_ndarray(params)) for layer_name, params in
                 name_to_params.items())
 
-    def predict(self, data_rdd):
+    def get_flat_weights(self):
+        """
+        Get all the weights and biases of this layer as one contiguous ndarray, which
+        is transferred from the JVM as a single binary buffer and wrapped without copying,
+        so it is read-only.
+
+        :return: (flat ndarray, index), index is a list of (offset, shape) locating \
+        each weight or bias in the flat ndarray, in the order of get_weights
+
+        >>> linear = Linear(3, 2)
+        creating: createLinear
+        >>> flat, index = linear.get_flat_weights()
+        >>> flat.shape
+        (8,)
+        >>> index
+        [(0, (2, 3)), (6, (2,))]
+        """
+        flat, shapes = callBigDlFunc(self.bigdl_type,
+                                     "modelGetFlatWeights", self.value)
+        index = []
+        offset = 0
+        for shape in shapes:
+            index.append((offset, tuple(shape)))
+            offset += int(np.prod(shape))
+        return flat.storage, index
+
+    def set_flat_weights(self, flat):
+        """
+        Set all the weights and biases of this layer from one contiguous ndarray in
+        the layout of get_flat_weights.
+
+        :param flat: ndarray holding all the weights and biases
+
+        >>> linear = Linear(3, 2)
+        creating: createLinear
+        >>> linear.set_flat_weights(np.arange(8))
+        >>> linear.get_weights()[1]
+        array([ 6.,  7.], dtype=float32)
+        """
+        callBigDlFunc(self.bigdl_type, "modelSetFlatWeights", self.value,
+                      JTensor.from_ndarray(np.ravel(flat), self.bigdl_type))
+
+    def predict(self, data_rdd, features_col="features", feature_shape=None):
         """
         Model inference base on the given data.
         You need to invoke collect() to trigger those action \
         as the returning result is an RDD.
 
-        :param data_rdd: the data to be predict.
+        :param data_rdd: the data to be predict, a RDD of Sample or a DataFrame.
+        :param features_col: feature column if data_rdd is a DataFrame.
+        :param feature_shape: shape of a feature if data_rdd is a DataFrame, \
+        None to keep it flat.
         :return: An RDD represent the predict result.
         """
-        result = callBigDlFunc(self.bigdl_type,
-                             "modelPredictRDD", self.value, data_rdd)
+        if isinstance(data_rdd, DataFrame):
+            result = callBigDlFunc(self.bigdl_type, "modelPredictDataFrame",
+                                   self.value, data_rdd, features_col, feature_shape)
+        else:
+            result = callBigDlFunc(self.bigdl_type,
+                                   "modelPredictRDD", self.value, data_rdd)
         return result.map(lambda data: data.to_ndarray())
 
+    def predict_iterator(self, data_rdd, batch_size=32, features_col="features",
+                         feature_shape=None):
+        """
+        Model inference base on the given data, streaming the result to the driver.
+        Partitions are fetched one at a time by toLocalIterator, so the driver only
+        holds the predictions of one partition instead of collecting the whole RDD.
+
+        :param data_rdd: the data to be predict, a RDD of Sample or a DataFrame.
+        :param batch_size: number of records in each yielded batch, \\
+        the last batch of a partition may be smaller.
+        :param features_col: feature column if data_rdd is a DataFrame.
+        :param feature_shape: shape of a feature if data_rdd is a DataFrame, \\
+        None to keep it flat.
+        :return: An iterator of ndarray, each one stacks the predict result \\
+        of a mini batch along the first dimension.
+        """
+        if isinstance(data_rdd, DataFrame):
+            result = callBigDlFunc(self.bigdl_type, "modelPredictBatchesDataFrame",
+                                   self.value, data_rdd, features_col, feature_shape,
+                                   batch_size)
+        else:
+            result = callBigDlFunc(self.bigdl_type, "modelPredictBatches",
+                                   self.value, data_rdd, batch_size)
+        for batch in result.toLocalIterator():
+            yield batch.to_ndarray()
+
+    def predictor(self, num_threads=1):
+        """
+        Create a thread-safe predictor of this layer. Unlike forward, which reuses
+        the output buffers of the layer and thus can't be called concurrently, the
+        predictor holds num_threads clones sharing the weights of this layer, so
+        num_threads callers could run forward at the same time.
+
+        :param num_threads: number of clones, i.e. the max number of concurrent calls
+        :return: a ReplicaPredictor
+        """
+        return ReplicaPredictor(self, num_threads, self.bigdl_type)
+
     def predict_class(self, data_rdd):
         """
         module predict, return the predict label
@@ -262,15 +436,23 @@ class Layer(JavaValue):
                                "modelPredictClass", self.value, data_rdd)
         return result
 
-    def test(self, val_rdd, batch_size, val_methods):
+    def test(self, val_rdd, batch_size, val_methods, features_col="features",
+             label_col="label", feature_shape=None):
         """
         A method to benchmark the model quality.
 
-        :param val_rdd: the input data
+        :param val_rdd: the input data, a RDD of Sample or a DataFrame
         :param batch_size: batch size
         :param val_methods: a list of validation methods. i.e: Top1Accuracy,Top5Accuracy and Loss.
+        :param features_col: feature column if val_rdd is a DataFrame
+        :param label_col: label column if val_rdd is a DataFrame
+        :param feature_shape: shape of a feature if val_rdd is a DataFrame, None to keep it flat
         :return:
         """
+        if isinstance(val_rdd, DataFrame):
+            return callBigDlFunc(self.bigdl_type, "modelTestDataFrame",
+                                 self.value, val_rdd, features_col, label_col,
+                                 feature_shape, batch_size, val_methods)
         return callBigDlFunc(self.bigdl_type,
                              "modelTest",
                              self.value,
@@ -335,9 +517,21 @@ class Layer(JavaValue):
             print("The layer does not have weight/bias")
             return None
 
-    def save(self, path, over_write = False):
-        callBigDlFunc(self.bigdl_type, "modelSave", self.value, path,
-                      over_write)
+    def save(self, path, over_write = False, mmap = False):
+        """
+        Save this layer.
+
+        :param path: the path to save the layer to
+        :param over_write: whether to overwrite an existing file
+        :param mmap: save as a snapshot directory whose weights file could be memory \
+        mapped, load it by Model.load(path, mmap=True). Only local file system is supported.
+        """
+        if mmap:
+            callBigDlFunc(self.bigdl_type, "modelSaveSnapshot", self.value, path,
+                          over_write)
+        else:
+            callBigDlFunc(self.bigdl_type, "modelSave", self.value, path,
+                          over_write)
 
     def save_caffe(self, prototxt_path, model_path, use_v2 = True, overwrite = False):
         callBigDlFunc(self.bigdl_type, "saveCaffe", self.value, prototxt_path,
@@ -433,14 +627,63 @@ class Model(Container):
 
 
     @staticmethod
-    def load(path, bigdl_type="float"):
+    def load(path, bigdl_type="float", mmap=False):
         """
         Load a pre-trained Bigdl model.
 
         :param path: The path containing the pre-trained model.
+        :param mmap: load a snapshot saved by save(path, mmap=True), the weights are \
+        copied in bulk from the memory mapped weights file, which is shared in the \
+        page cache by all the processes loading it on a host.
         :return: A pre-trained model.
         """
-        jmodel = callBigDlFunc(bigdl_type, "loadBigDL", path)
+        if mmap:
+            jmodel = callBigDlFunc(bigdl_type, "loadSnapshot", path)
+        else:
+            jmodel = callBigDlFunc(bigdl_type, "loadBigDL", path)
+        return Layer.of(jmodel)
+
+    @staticmethod
+    def load_snapshot_weights(path):
+        """
+        Memory map the weights of a snapshot saved by save(path, mmap=True) without JVM.
+        The arrays are read-only views of the page cache, no copy is made.
+
+        :param path: The snapshot directory.
+        :return: list of ndarray, in the order of get_weights
+        """
+        weights = np.memmap(os.path.join(path, "weights"), dtype=np.uint8, mode="r")
+        header = np.frombuffer(weights, dtype="<i4", count=3, offset=8)
+        if weights[:8].tobytes() != b"BIGDLSNP" or header[0] != 1:
+            raise ValueError("%s is not a BigDL snapshot" % path)
+        dtype = np.dtype("<f4" if header[1] == 4 else "<f8")
+        offset = 8 + 4 * 3
+        shapes = []
+        for i in range(header[2]):
+            ndim = int(np.frombuffer(weights, dtype="<i4", count=1, offset=offset)[0])
+            shapes.append(tuple(np.frombuffer(weights, dtype="<i4", count=ndim,
+                                              offset=offset + 4)))
+            offset += 4 * (ndim + 1)
+        offset = (offset + 63) // 64 * 64
+        result = []
+        for shape in shapes:
+            count = int(np.prod(shape))
+            result.append(np.frombuffer(weights, dtype=dtype, count=count,
+                                        offset=offset).reshape(shape))
+            offset += count * dtype.itemsize
+        return result
+
+    @staticmethod
+    def load_checkpoint(checkpoint_path, neval, bigdl_type="float"):
+        """
+        Load the model of a snapshot written by Optimizer.set_checkpoint, which is either \
+        a full model or the parameter rows changed since the previous snapshot.
+
+        :param checkpoint_path: The directory containing the snapshots.
+        :param neval: The iteration number of the snapshot, i.e. the postfix of its files.
+        :return: The model of the snapshot.
+        """
+        jmodel = callBigDlFunc(bigdl_type, "loadCheckpointModel", checkpoint_path, neval)
         return Layer.of(jmodel)
 
     @staticmethod
@@ -492,6 +735,80 @@ class Model(Container):
         return Model.of(jmodel)
 
 
+class ReplicaPredictor(JavaValue):
+    """
+    A thread-safe predictor for online serving. It keeps a pool of replicas of the model
+    sharing the same weights, each predict call borrows a free replica so up to
+    replica_number requests run concurrently.
+
+    Together with LocalContext it runs a model without starting Spark, i.e:
+
+    >>> context = LocalContext(core_number=4)  # doctest: +SKIP
+    >>> init_engine()  # doctest: +SKIP
+    >>> predictor = ReplicaPredictor.load("/tmp/model", replica_number=4)  # doctest: +SKIP
+    >>> output = predictor.predict(np.random.random([8, 10]))  # doctest: +SKIP
+
+    The predict method could be called from any thread, e.g. by
+    loop.run_in_executor of asyncio, or use predict_all to dispatch a list of
+    mini batches to a thread pool of replica_number threads.
+
+    :param model: the model to predict with
+    :param replica_number: number of replicas, i.e. the max number of concurrent requests
+    """
+    def __init__(self, model, replica_number=1, bigdl_type="float"):
+        JavaValue.__init__(self, None, bigdl_type, model, replica_number)
+        self.replica_number = replica_number
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path, replica_number=1, bigdl_type="float"):
+        """
+        Load a BigDL model into a predictor.
+
+        :param path: The path containing the pre-trained model.
+        :param replica_number: number of replicas
+        """
+        return cls(Model.load(path, bigdl_type), replica_number, bigdl_type)
+
+    def predict(self, input):
+        """
+        Forward the input with a free replica, block until one is available.
+
+        :param input: ndarray or list of ndarray, a record or a mini batch
+        :return: ndarray or list of ndarray
+        """
+        jinput, input_is_table = Layer.check_input(input)
+        output = callBigDlFunc(self.bigdl_type,
+                               "replicaPredict",
+                               self.value,
+                               jinput,
+                               input_is_table)
+        return Layer.convert_output(output)
+
+    def predict_all(self, inputs):
+        """
+        Predict a list of inputs concurrently by a pool of replica_number threads.
+
+        :param inputs: a list of input, each one is a ndarray or list of ndarray
+        :return: the outputs in the same order as inputs
+        """
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPool(self.replica_number)
+        return self._pool.map(self.predict, inputs)
+
+    def close(self):
+        """
+        Stop the threads started by predict_all.
+        """
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.close()
+                self._pool.join()
+                self._pool = None
+
+
 class Linear(Layer):
 
     '''
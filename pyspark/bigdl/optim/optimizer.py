@@ -17,6 +17,8 @@
 
 import os
 import sys
+import time
+import numpy as np
 from distutils.dir_util import mkpath
 
 from bigdl.util.common import DOUBLEMAX
@@ -24,15 +26,25 @@ from bigdl.util.common import JTensor
 from bigdl.util.common import JavaValue
 from bigdl.util.common import callBigDlFunc
 from bigdl.util.common import callJavaFunc
-from bigdl.util.common import get_spark_context
+from bigdl.util.common import get_bigdl_context
 from bigdl.util.common import to_list
 from py4j.java_gateway import JavaObject
+from pyspark.sql import DataFrame
 
 
 if sys.version >= '3':
     long = int
     unicode = str
 
+# Layout of the records returned by read_scalar with since_step
+SCALAR_DTYPE = np.dtype([("step", "<i8"), ("value", "<f4"), ("wall_clock_time", "<f8")])
+
+
+def _read_scalar_since(summary, tag, since_step):
+    records = callBigDlFunc(summary.bigdl_type, "summaryReadScalarSince",
+                            summary.value, tag, long(since_step))[0]
+    return np.frombuffer(bytes(records), dtype=SCALAR_DTYPE)
+
 
 class Top1Accuracy(JavaValue):
     """
@@ -216,6 +228,81 @@ class MinLoss(JavaValue):
         JavaValue.__init__(self, None, bigdl_type, min)
 
 
+class TriggerAnd(JavaValue):
+    """
+    A trigger contains other triggers and triggers when all of them trigger (logical AND).
+    All the triggers are evaluated each time.
+
+
+    >>> a = TriggerAnd(MinLoss(0.1), MaxEpoch(5))
+    creating: createMinLoss
+    creating: createMaxEpoch
+    creating: createTriggerAnd
+    """
+    def __init__(self, first, *other, **kwargs):
+        """
+        Create a TriggerAnd trigger.
+
+
+        :param first: first trigger
+        :param other: other triggers
+        :param bigdl_type: keyword only, "float" by default
+        """
+        bigdl_type = kwargs.pop("bigdl_type", "float")
+        if kwargs:
+            raise TypeError("unexpected keyword arguments: %s" % ", ".join(kwargs))
+        JavaValue.__init__(self, None, bigdl_type, first, list(other))
+
+
+class TriggerOr(JavaValue):
+    """
+    A trigger contains other triggers and triggers when any of them triggers (logical OR).
+    All the triggers are evaluated each time.
+
+
+    >>> o = TriggerOr(Patience(3), MaxEpoch(50))
+    creating: createPatience
+    creating: createMaxEpoch
+    creating: createTriggerOr
+    """
+    def __init__(self, first, *other, **kwargs):
+        """
+        Create a TriggerOr trigger.
+
+
+        :param first: first trigger
+        :param other: other triggers
+        :param bigdl_type: keyword only, "float" by default
+        """
+        bigdl_type = kwargs.pop("bigdl_type", "float")
+        if kwargs:
+            raise TypeError("unexpected keyword arguments: %s" % ", ".join(kwargs))
+        JavaValue.__init__(self, None, bigdl_type, first, list(other))
+
+
+class Patience(JavaValue):
+    """
+    A trigger that triggers an action when a validation metric has not improved for
+    "patience" validations. It only counts the validations set by Optimizer.set_validation.
+    Usually used as end_trigger, alone or in a TriggerOr, to stop the training early.
+
+
+    >>> patience = Patience(5, "Loss", 0.01, "min")
+    creating: createPatience
+    """
+    def __init__(self, patience, metric="score", min_delta=0.0, mode="max", bigdl_type="float"):
+        """
+        Create a Patience trigger.
+
+
+        :param patience: number of validations without improvement before triggering
+        :param metric: "score" for the first validation method, or the name of a validation method, e.g. "Top1Accuracy" or "Loss"
+        :param min_delta: minimum change of the metric counted as an improvement
+        :param mode: "max" if a larger metric is better, "min" if a smaller one is better
+        """
+        JavaValue.__init__(self, None, bigdl_type, patience, metric, min_delta, mode)
+
+
 class Poly(JavaValue):
     """
     A learning rate decay policy, where the effective learning rate
@@ -534,22 +621,43 @@ class Optimizer(JavaValue):
                  end_trigger,
                  batch_size,
                  optim_method=None,
-                 bigdl_type="float"):
+                 bigdl_type="float",
+                 features_col="features",
+                 label_col="label",
+                 feature_shape=None):
        """
        Create an optimizer.
 
 
        :param model: the neural net model
-       :param training_rdd: the training dataset
+       :param training_rdd: the training dataset, a RDD of Sample or a DataFrame
        :param criterion: the loss function
        :param optim_method: the algorithm to use for optimization, 
           e.g. SGD, Adagrad, etc. If optim_method is None, the default algorithm is SGD.
        :param end_trigger: when to end the optimization
        :param batch_size: training batch size
+       :param features_col: feature column if training_rdd is a DataFrame,
+          it could be a numeric array, a vector or a number.
+       :param label_col: label column if training_rdd is a DataFrame
+       :param feature_shape: shape of a feature if training_rdd is a DataFrame,
+          None to keep it flat.
        """
-       JavaValue.__init__(self, None, bigdl_type, model.value,
-                           training_rdd, criterion,
-                          optim_method if optim_method else SGD(), end_trigger, batch_size)
+       self.features_col = features_col
+       self.label_col = label_col
+       self.feature_shape = feature_shape
+       if optim_method is None:
+           optim_method = SGD()
+       if isinstance(training_rdd, DataFrame):
+           # records become tensors inside the JVM, skip python serialization
+           jvalue = callBigDlFunc(bigdl_type, "createOptimizerFromDataFrame",
+                                  model.value, training_rdd, features_col,
+                                  label_col, feature_shape, criterion,
+                                  optim_method, end_trigger, batch_size)
+           JavaValue.__init__(self, jvalue, bigdl_type)
+       else:
+           JavaValue.__init__(self, None, bigdl_type, model.value,
+                              training_rdd, criterion,
+                              optim_method, end_trigger, batch_size)
 
     def set_validation(self, batch_size, val_rdd, trigger, val_method=None):
         """
@@ -557,14 +665,20 @@ class Optimizer(JavaValue):
 
 
         :param batch_size: validation batch size
-        :param val_rdd: validation dataset
+        :param val_rdd: validation dataset, a RDD of Sample or a DataFrame with the
+                        same columns as the training DataFrame
         :param trigger: validation interval
         :param val_method: the ValidationMethod to use,e.g. "Top1Accuracy", "Top5Accuracy", "Loss"
         """
         if val_method is None:
             val_method = [Top1Accuracy()]
-        callBigDlFunc(self.bigdl_type, "setValidation", self.value, batch_size,
-                      trigger, val_rdd, to_list(val_method))
+        if isinstance(val_rdd, DataFrame):
+            callBigDlFunc(self.bigdl_type, "setValidationFromDataFrame", self.value,
+                          batch_size, trigger, val_rdd, self.features_col,
+                          self.label_col, self.feature_shape, to_list(val_method))
+        else:
+            callBigDlFunc(self.bigdl_type, "setValidation", self.value, batch_size,
+                          trigger, val_rdd, to_list(val_method))
 
     def set_model(self, model):
         """
@@ -576,29 +690,63 @@ class Optimizer(JavaValue):
         self.value.setModel(model.value)
 
     def set_checkpoint(self, checkpoint_trigger,
-                      checkpoint_path, isOverWrite=True):
+                      checkpoint_path, isOverWrite=True, async_write=False, keep_last=0,
+                      full_every=0):
         """
-        Configure checkpoint settings.
+        Configure checkpoint settings. Snapshots are written to temporary files and
+        renamed, so a crash never leaves a partial snapshot.
 
 
         :param checkpoint_trigger: the interval to write snapshots
         :param checkpoint_path: the path to write snapshots into
         :param isOverWrite: whether to overwrite existing snapshots in path.default is True
+        :param async_write: whether to copy the snapshots in memory and write them in background while the training goes on. default is False
+        :param keep_last: only keep the latest keep_last snapshots, keep all of them if it's not positive. If full_every > 1, it's the number of full snapshots kept with the delta snapshots based on them. default is 0
+        :param full_every: if greater than 1, save the full model every full_every snapshots, and only save the parameter rows changed since the previous snapshot in the others. Use Model.load_checkpoint to load the model of any snapshot. default is 0
         """
         if not os.path.exists(checkpoint_path):
             mkpath(checkpoint_path)
         callBigDlFunc(self.bigdl_type, "setCheckPoint", self.value,
-                      checkpoint_trigger, checkpoint_path, isOverWrite)
+                      checkpoint_trigger, checkpoint_path, isOverWrite,
+                      async_write, keep_last, full_every)
+
+    def resume(self, checkpoint_path, neval=0):
+        """
+        Resume the training from a snapshot written by set_checkpoint. The model weights,
+        the optim method with its learning rate schedule, and the epoch, iteration and
+        position in the epoch are restored, so the training and the triggers continue
+        from the snapshot.
+
+
+        :param checkpoint_path: the snapshot directory, or the path given to set_checkpoint, whose latest timestamped sub directory is used
+        :param neval: the iteration number of the snapshot, the latest one if it's not positive. default is 0
+        :return: the optimizer
+        """
+        callBigDlFunc(self.bigdl_type, "resumeOptimizer", self.value,
+                      checkpoint_path, neval)
+        return self
 
     # return a module
     def optimize(self):
         """
         Do an optimization.
         """
-        jmodel = callJavaFunc(get_spark_context(), self.value.optimize)
+        jmodel = callJavaFunc(get_bigdl_context(), self.value.optimize)
         from bigdl.nn.layer import Layer
         return Layer.of(jmodel)
 
+    def optimize_async(self):
+        """
+        Do an optimization in background, the calling thread is not blocked.
+        The end trigger is wrapped during the optimization.
+
+
+        :return: an OptimizationFuture to cancel the optimization, and get its
+                 progress and result
+        """
+        jfuture = callBigDlFunc(self.bigdl_type, "optimizeAsync", self.value)
+        return OptimizationFuture(jfuture, self.bigdl_type)
+
     def set_train_summary(self, summary):
         """
         Set train summary. A TrainSummary object contains information
@@ -638,6 +786,75 @@ class Optimizer(JavaValue):
         self.value.prepareInput()
 
 
+class OptimizationFuture(JavaValue):
+    """
+    The handle of an optimization running in background, which is returned by
+    Optimizer.optimize_async. Once cancelled, the optimization stops at the
+    next iteration and the model trained so far is the result.
+    """
+    def __init__(self, jvalue, bigdl_type="float"):
+        JavaValue.__init__(self, jvalue, bigdl_type)
+
+    def done(self):
+        """
+        Whether the optimization is finished, cancelled or failed.
+        """
+        return callJavaFunc(get_bigdl_context(), self.value.isDone)
+
+    def cancel(self):
+        """
+        Stop the optimization at the next iteration.
+
+
+        :return: False if the optimization is already finished
+        """
+        return callJavaFunc(get_bigdl_context(), self.value.cancel)
+
+    def cancelled(self):
+        return callJavaFunc(get_bigdl_context(), self.value.isCancelled)
+
+    def result(self, timeout=None):
+        """
+        Wait for the optimization to finish. A Py4JJavaError is raised if the
+        optimization failed or the timeout expired.
+
+
+        :param timeout: max seconds to wait, wait forever if it's None
+        :return: the trained model
+        """
+        timeout_ms = -1 if timeout is None else long(timeout * 1000)
+        jmodel = callBigDlFunc(self.bigdl_type, "optimizationResult",
+                               self.value, timeout_ms)
+        from bigdl.nn.layer import Layer
+        return Layer.of(jmodel)
+
+    def metrics(self):
+        """
+        Take the metrics of the iterations finished since last call.
+
+
+        :return: a list of dicts, one for each iteration, with keys "epoch",
+                 "neval" (the next iteration), "Loss", "Throughput",
+                 "LearningRate" and "score" if validation is set
+        """
+        return callBigDlFunc(self.bigdl_type, "optimizationProgress", self.value)
+
+    def stream_metrics(self, interval=1.0):
+        """
+        Yield the metrics of each iteration until the optimization is finished.
+
+
+        :param interval: seconds to wait between two polls
+        """
+        while True:
+            finished = self.done()
+            for record in self.metrics():
+                yield record
+            if finished:
+                break
+            time.sleep(interval)
+
+
 class TrainSummary(JavaValue, ):
     """
     A logging facility which allows user to trace how indicators (e.g.
@@ -663,14 +880,17 @@ class TrainSummary(JavaValue, ):
         """
         JavaValue.__init__(self, None, bigdl_type, log_dir, app_name)
 
-    def read_scalar(self, tag):
+    def read_scalar(self, tag, since_step=None):
         """
         Retrieve train logs by type. Return an array of records in the format
         (step,value,wallClockTime). - "Step" is the iteration count by default.
 
 
         :param tag: the type of the logs, Supported tags are: "LearningRate","Loss", "Throughput"
+        :param since_step: if set, only the records after this step are returned, as a numpy structured array with fields "step", "value" and "wall_clock_time". The event files are indexed incrementally, so polling with the last step read only parses the new events.
         """
+        if since_step is not None:
+            return _read_scalar_since(self, tag, since_step)
         return callBigDlFunc(self.bigdl_type, "summaryReadScalar", self.value,
                              tag)
 
@@ -679,7 +899,7 @@ class TrainSummary(JavaValue, ):
         Set the interval of recording for each indicator.
 
 
-        :param tag: tag name. Supported tag names are "LearningRate", "Loss","Throughput", "Parameters". "Parameters" is an umbrella tag thatincludes weight, bias, gradWeight, gradBias, and some running status(eg. runningMean and runningVar in BatchNormalization). If youdidn't set any triggers, we will by default record Loss and Throughputin each iteration, while *NOT* recording LearningRate and Parameters,as recording parameters may introduce substantial overhead when themodel is very big, LearningRate is not a public attribute for allOptimMethod.
+        :param tag: tag name. Supported tag names are "LearningRate", "Loss","Throughput", "Parameters", and the seconds spent on each phase of an iteration: "DataFetchTime", "GetWeightsTime", "ComputingTime", "AggregateGradientTime", "UpdateParametersTime" and "ComputingTimeSpread" (the gap between the slowest and the fastest node). "Parameters" is an umbrella tag thatincludes weight, bias, gradWeight, gradBias, and some running status(eg. runningMean and runningVar in BatchNormalization). If youdidn't set any triggers, we will by default record Loss and Throughputin each iteration, while *NOT* recording LearningRate and Parameters,as recording parameters may introduce substantial overhead when themodel is very big, LearningRate is not a public attribute for allOptimMethod.
         :param trigger: trigger
         """
         return callBigDlFunc(self.bigdl_type, "summarySetTrigger", self.value,
@@ -715,7 +935,7 @@ class ValidationSummary(JavaValue):
         """
         JavaValue.__init__(self, None, bigdl_type, log_dir, app_name)
 
-    def read_scalar(self, tag):
+    def read_scalar(self, tag, since_step=None):
         """
         Retrieve validation logs by type. Return an array of records in the
         format (step,value,wallClockTime). - "Step" is the iteration count
@@ -723,7 +943,10 @@ class ValidationSummary(JavaValue):
 
 
         :param tag: the type of the logs. The tag should match the name ofthe ValidationMethod set into the optimizer. e.g."Top1AccuracyLoss","Top1Accuracy" or "Top5Accuracy".
+        :param since_step: if set, only the records after this step are returned, as a numpy structured array, see TrainSummary.read_scalar.
         """
+        if since_step is not None:
+            return _read_scalar_since(self, tag, since_step)
         return callBigDlFunc(self.bigdl_type, "summaryReadScalar", self.value,
                              tag)
 
@@ -64,9 +64,10 @@ class JavaCreator(SingletonMixin):
         with JavaCreator._lock:
             JavaCreator.__creator_class = cclass
             JavaCreator._instance = None
+            _clear_java_methods()
 
     def __init__(self, bigdl_type):
-        sc = get_spark_context()
+        sc = get_bigdl_context()
         jclass = getattr(sc._jvm, JavaCreator.get_creator_class())
         if bigdl_type == "float":
             self.value = getattr(jclass, "ofFloat")()
@@ -114,10 +115,51 @@ class TestResult():
             self.result, self.total_num, self.method)
 
 
+def get_dtype(bigdl_type):
+    """
+    Numpy dtype backing the given bigdl_type.
+
+    >>> get_dtype("float")
+    'float32'
+    >>> get_dtype("double")
+    'float64'
+    """
+    if "float" == bigdl_type:
+        return "float32"
+    else:
+        return "float64"
+
+
+def _wire_dtype(bigdl_type):
+    # Buffers exchanged with the JVM are always little-endian
+    return np.dtype(get_dtype(bigdl_type)).newbyteorder("<")
+
+
+def _shape_of(a_ndarray):
+    return list(a_ndarray.shape) if a_ndarray.shape else [a_ndarray.size]
+
+
+def _to_ndarray(storage, shape, bigdl_type, copy=False):
+    """
+    Wrap a raw little-endian buffer without copying, or convert anything else
+    numpy understands, i.e: ndarray or list, and reshape it to shape. An ndarray
+    is only copied if copy is True or its dtype differs.
+    """
+    if isinstance(storage, (bytes, bytearray)):
+        array = np.frombuffer(storage, dtype=_wire_dtype(bigdl_type))
+    elif copy:
+        array = np.array(storage, dtype=get_dtype(bigdl_type))
+    else:
+        array = np.asarray(storage, dtype=get_dtype(bigdl_type))
+    return array.reshape(shape)
+
+
 class JTensor(object):
     """
     A wrapper to easy our work when need to pass or return Tensor to/from Scala.
 
+    The storage is kept as a flat ndarray and is exchanged with the JVM as a raw
+    little-endian buffer, so no per-element Python float is created on either side.
 
     >>> import numpy as np
     >>> from bigdl.util.common import JTensor
@@ -125,8 +167,16 @@ class JTensor(object):
     >>>
     """
     def __init__(self, storage, shape, bigdl_type="float"):
-        self.storage = storage
-        self.shape = shape
+        """
+
+        :param storage: a bytes buffer in the little-endian layout of bigdl_type,
+                        or anything convertible by numpy, i.e: ndarray or list,
+                        which is copied
+        :param shape: tensor shape
+        :param bigdl_type: "float" or "double"
+        """
+        self.storage = _to_ndarray(storage, [-1], bigdl_type, copy=True)
+        self.shape = [int(i) for i in shape]
         self.bigdl_type = bigdl_type
 
     @classmethod
@@ -148,16 +198,23 @@ class JTensor(object):
         >>> (array_from_tensor == data).all()
         True
         """
-        return cls(*JTensor.flatten_ndarray(a_ndarray),
-                   bigdl_type= bigdl_type) if a_ndarray is not None else None  # noqa
+        if a_ndarray is None:
+            return None
+        a_ndarray = np.asarray(a_ndarray)
+        return cls(a_ndarray, _shape_of(a_ndarray), bigdl_type=bigdl_type)
 
     def to_ndarray(self):
-        def get_dtype():
-            if "float" == self.bigdl_type:
-                return "float32"
-            else:
-                return "float64"
-        return np.array(self.storage, dtype=get_dtype()).reshape(self.shape)  # noqa
+        """
+        Copy the storage to a new writable ndarray of the tensor shape.
+
+        >>> import numpy as np
+        >>> data = np.zeros([3], dtype="float32")
+        >>> data_back = JTensor.from_ndarray(data).to_ndarray()
+        >>> data[0] = 5
+        >>> data_back.tolist(), np.may_share_memory(data, data_back)
+        ([0.0, 0.0, 0.0], False)
+        """
+        return np.array(self.storage, dtype=get_dtype(self.bigdl_type)).reshape(self.shape)
 
     @classmethod
     def flatten_ndarray(cls, a_ndarray):
@@ -176,48 +233,164 @@ class JTensor(object):
         >>> shape
         [1]
         """
-        storage = [float(i) for i in a_ndarray.ravel()]
-        shape = list(a_ndarray.shape) if a_ndarray.shape else [a_ndarray.size]
-        return storage, shape
+        a_ndarray = np.asarray(a_ndarray)
+        storage = a_ndarray.astype("float64").ravel().tolist()
+        return storage, _shape_of(a_ndarray)
 
     def __reduce__(self):
-        return (JTensor, (self.storage, self.shape, self.bigdl_type))
+        storage = self.storage.astype(_wire_dtype(self.bigdl_type), copy=False)
+        return (JTensor, (storage.tobytes(), self.shape, self.bigdl_type))
 
     def __str__(self):
-        return "storage: %s, shape: %s," % (self.storage, self.storage)
+        return "storage: %s, shape: %s," % (self.storage, self.shape)
 
 
 class Sample(object):
+    """
+    A training record of features and label. It is pickled as dtype-tagged raw
+    little-endian buffers, so records sent to or received from the JVM never go
+    through lists of Python floats. Arrays decoded from such buffers are read-only.
+
+    >>> import numpy as np
+    >>> sample = Sample.from_ndarray(np.ones([2, 3]), np.array(1))
+    >>> sample.features.shape, sample.label.shape
+    ((2, 3), (1,))
+    """
+    __slots__ = ("features", "label", "bigdl_type")
+
     def __init__(self, features, label, features_shape, label_shape,
                  bigdl_type="float"):
-        def get_dtype():
-            if "float" == bigdl_type:
-                return "float32"
-            else:
-                return "float64"
-        self.features = np.array(features, dtype=get_dtype()).reshape(features_shape)  # noqa
-        self.label = np.array(label, dtype=get_dtype()).reshape(label_shape)
+        self.features = _to_ndarray(features, features_shape, bigdl_type)
+        self.label = _to_ndarray(label, label_shape, bigdl_type)
         self.bigdl_type = bigdl_type
 
     @classmethod
-    def from_ndarray(cls, features, label, bigdl_type="float"):
+    def from_ndarray(cls, features, label, bigdl_type="float", copy=True):
+        """
+        Create a Sample from ndarrays.
+
+        >>> import numpy as np
+        >>> features = np.zeros([3])
+        >>> sample = Sample.from_ndarray(features, np.array(1))
+        >>> features[1] = 7
+        >>> sample.features.tolist()
+        [0.0, 0.0, 0.0]
+
+        :param features: the features ndarray
+        :param label: the label ndarray
+        :param bigdl_type: "float" or "double"
+        :param copy: copy the ndarrays, so refilling them doesn't change the Sample. With
+                     copy=False, ndarrays already of the bigdl_type dtype are shared.
+        """
+        features = _to_ndarray(features, np.shape(features), bigdl_type, copy)
+        label = _to_ndarray(label, np.shape(label), bigdl_type, copy)
         return cls(
-            features=[float(i) for i in features.ravel()],
-            label=[float(i) for i in label.ravel()],
+            features=features,
+            label=label,
             features_shape=list(features.shape),
-            label_shape=list(label.shape) if label.shape else [label.size],
+            label_shape=_shape_of(label),
             bigdl_type=bigdl_type)
 
     def __reduce__(self):
-        (features_storage, features_shape) = JTensor.flatten_ndarray(self.features)
-        (label_storage, label_shape) = JTensor.flatten_ndarray(self.label)
+        dtype = _wire_dtype(self.bigdl_type)
         return (Sample, (
-            features_storage, label_storage, features_shape, label_shape,
+            self.features.astype(dtype, copy=False).tobytes(),
+            self.label.astype(dtype, copy=False).tobytes(),
+            _shape_of(self.features), _shape_of(self.label),
             self.bigdl_type))
 
     def __str__(self):
         return "features: %s, label: %s," % (self.features, self.label)
 
+
+class SampleBlock(object):
+    """
+    A block of training records whose features and labels are stacked along the
+    first dimension. The block is pickled as one buffer for the features and one
+    for the labels, and the JVM expands it into Samples, so feeding a RDD of
+    SampleBlock to Optimizer, predict or test is the same as feeding its Samples.
+
+    >>> import numpy as np
+    >>> block = SampleBlock.from_ndarray(np.ones([4, 2, 3]), np.arange(4) + 1)
+    >>> len(block)
+    4
+    >>> [sample.label.tolist() for sample in block.to_samples()]
+    [[1.0], [2.0], [3.0], [4.0]]
+    """
+    __slots__ = ("features", "labels", "bigdl_type")
+
+    def __init__(self, features, labels, features_shape, labels_shape,
+                 bigdl_type="float"):
+        self.features = _to_ndarray(features, features_shape, bigdl_type)
+        self.labels = _to_ndarray(labels, labels_shape, bigdl_type)
+        self.bigdl_type = bigdl_type
+        if len(self.features) != len(self.labels):
+            raise ValueError("features and labels should have the same number"
+                             " of records, but got %s and %s"
+                             % (len(self.features), len(self.labels)))
+
+    @classmethod
+    def from_ndarray(cls, features, labels, bigdl_type="float", copy=True):
+        """
+        Create a SampleBlock from ndarrays of stacked records.
+
+        :param features: the features of the records stacked along the first dimension
+        :param labels: the labels of the records stacked along the first dimension
+        :param bigdl_type: "float" or "double"
+        :param copy: copy the ndarrays, so the block owns its buffers. With copy=False,
+                     ndarrays already of the bigdl_type dtype are shared.
+        """
+        features = _to_ndarray(features, np.shape(features), bigdl_type, copy)
+        labels = _to_ndarray(labels, np.shape(labels), bigdl_type, copy)
+        return cls(
+            features=features,
+            labels=labels,
+            features_shape=list(features.shape),
+            labels_shape=list(labels.shape),
+            bigdl_type=bigdl_type)
+
+    def to_samples(self):
+        """
+        Iterate the records of this block as Samples.
+        """
+        for i in range(len(self)):
+            yield Sample.from_ndarray(self.features[i], self.labels[i],
+                                      self.bigdl_type)
+
+    def __len__(self):
+        return len(self.features)
+
+    def __reduce__(self):
+        dtype = _wire_dtype(self.bigdl_type)
+        return (SampleBlock, (
+            self.features.astype(dtype, copy=False).tobytes(),
+            self.labels.astype(dtype, copy=False).tobytes(),
+            list(self.features.shape), list(self.labels.shape),
+            self.bigdl_type))
+
+    def __str__(self):
+        return "features: %s, labels: %s," % (self.features, self.labels)
+
+
+def to_sample_rdd(rdd, bigdl_type="float"):
+    """
+    Convert a RDD of (features_block, labels_block) ndarray pairs into a RDD of
+    SampleBlock, which could be used wherever a RDD of Sample is expected.
+    Each block is converted in one pass and shipped to the JVM as one contiguous
+    buffer instead of one pickled object per record. Note that count() and the
+    like on the returned RDD count blocks rather than records.
+
+    :param rdd: a RDD of (features_block, labels_block), the first dimension of
+                both ndarrays is the number of records in the block
+    :param bigdl_type: "float" or "double"
+    :return: a RDD of SampleBlock
+    """
+    def to_blocks(iterator):
+        for features, labels in iterator:
+            yield SampleBlock.from_ndarray(features, labels, bigdl_type)
+    return rdd.mapPartitions(to_blocks)
+
+
 class RNG():
     """
     generate tensor data with seed
@@ -296,17 +469,121 @@ def get_spark_context(conf = None):
         return SparkContext._active_spark_context
 
 
+def _local_classpath():
+    """
+    The BigDL jar and the Spark jars BigDL depends on, no Spark scheduler is started
+    from them.
+    """
+    bigdl_home = os.path.abspath(__file__ + "/../../")
+    jars = glob.glob(os.path.join(bigdl_home, "share/lib/*.jar"))
+    jars.extend(p for p in os.environ.get("SPARK_CLASSPATH", "").split(":") if p)
+    spark_dirs = [os.path.join(os.path.dirname(os.path.abspath(
+        sys.modules["pyspark"].__file__)), "jars")]
+    spark_home = os.environ.get("SPARK_HOME")
+    if spark_home:
+        spark_dirs += [os.path.join(spark_home, "jars"), os.path.join(spark_home, "lib")]
+    for spark_dir in spark_dirs:
+        spark_jars = glob.glob(os.path.join(spark_dir, "*.jar"))
+        if spark_jars:
+            jars.extend(spark_jars)
+            break
+    return jars
+
+
+class LocalContext(object):
+    """
+    A Spark-free context for BigDL. It launches a bare JVM through py4j with the BigDL
+    jar on the classpath and bigdl.localMode set, so callBigDlFunc works without a
+    SparkContext, i.e. for loading a model and serving it by ReplicaPredictor.
+    Only calls not involving RDD or DataFrame are supported.
+
+    A running SparkContext still takes precedence over the LocalContext.
+
+    :param core_number: core number for the BigDL engine
+    :param classpath: jars to launch the JVM with, default to the BigDL jar and the \
+    Spark jars found from pyspark or SPARK_HOME
+    :param java_opts: extra JVM options
+    """
+    _active_context = None
+
+    def __init__(self, core_number=1, classpath=None, java_opts=None):
+        from py4j.java_gateway import JavaGateway, GatewayClient, launch_gateway
+        with JavaCreator._lock:
+            if LocalContext._active_context is not None:
+                raise Exception("There is already an active LocalContext")
+            jars = classpath if classpath is not None else _local_classpath()
+            py4j_jars = [jar for jar in jars if os.path.basename(jar).startswith("py4j")]
+            javaopts = ["-Dbigdl.localMode=true",
+                        "-Dbigdl.coreNumber=%s" % core_number] + (java_opts or [])
+            port = launch_gateway(jarpath=py4j_jars[0] if py4j_jars else "",
+                                  classpath=":".join(jars),
+                                  javaopts=javaopts,
+                                  die_on_exit=True)
+            self._gateway = JavaGateway(GatewayClient(port=port), auto_convert=True)
+            self._jvm = self._gateway.jvm
+            LocalContext._active_context = self
+
+    def stop(self):
+        """
+        Shutdown the JVM of this context.
+        """
+        with JavaCreator._lock:
+            if LocalContext._active_context is self:
+                LocalContext._active_context = None
+                _clear_java_methods()
+            self._gateway.shutdown()
+
+
+def get_bigdl_context():
+    """
+    Get the context BigDL calls go through: the active SparkContext, otherwise the
+    active LocalContext, otherwise a SparkContext created on demand.
+    """
+    return SparkContext._active_spark_context or LocalContext._active_context \
+        or get_spark_context()
+
+
 def get_spark_sql_context(sc):
     if "getOrCreate" in SQLContext.__dict__:
-        return SQLContext.getOrCreate()
+        return SQLContext.getOrCreate(sc)
     else:
         return SQLContext(sc)  # Compatible with Spark1.5.1
 
+# Resolved PythonBigDL methods keyed by (bigdl_type, name), only valid for the
+# SparkContext they are resolved with.
+_java_methods = {}
+_java_methods_context = [None]
+
+
+def _clear_java_methods():
+    with JavaCreator._lock:
+        _java_methods.clear()
+        _java_methods_context[0] = None
+
+
+def _get_java_method(sc, bigdl_type, name):
+    key = (bigdl_type, name)
+    if _java_methods_context[0] is sc:
+        api = _java_methods.get(key)
+        if api is not None:
+            return api
+    with JavaCreator._lock:
+        if _java_methods_context[0] is not sc:
+            _java_methods.clear()
+            _java_methods_context[0] = sc
+            # the creator instance lives in the JVM of the former context
+            JavaCreator._instance = None
+        jinstance = JavaCreator.instance(bigdl_type=bigdl_type).value
+        api = getattr(jinstance, name)
+        _java_methods[key] = api
+        return api
+
+
 def callBigDlFunc(bigdl_type, name, *args):
     """ Call API in PythonBigDL """
-    jinstance = JavaCreator.instance(bigdl_type=bigdl_type).value
-    sc = get_spark_context()
-    api = getattr(jinstance, name)
+    # Only take SparkContext._lock when there is no live context yet
+    sc = get_bigdl_context()
+    api = _get_java_method(sc, bigdl_type, name)
     return callJavaFunc(sc, api, *args)
 
 
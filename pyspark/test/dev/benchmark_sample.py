@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+
+#
+# Copyright 2016 The BigDL Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+# Measure how many records per second can be turned into Samples and pickled
+# the way PySpark ships them to the JVM. "list" replays the former
+# per-element conversion, "buffer" is the current Sample.from_ndarray path.
+#
+# Usage: python benchmark_sample.py [--records N] [--shape 28,28,1]
+
+import pickle
+import time
+from optparse import OptionParser
+
+import numpy as np
+
+from bigdl.util.common import Sample
+
+
+def list_sample(features, label):
+    # The conversion done by Sample.from_ndarray and Sample.__reduce__ before
+    storage = [float(i) for i in features.ravel()]
+    label_storage = [float(i) for i in label.ravel()]
+    record = np.array(storage, dtype="float32").reshape(features.shape)
+    return ([float(i) for i in record.ravel()], label_storage,
+            list(features.shape), [label.size], "float")
+
+
+def buffer_sample(features, label):
+    return Sample.from_ndarray(features, label)
+
+
+def run(convert, records, labels):
+    start = time.time()
+    for i in range(len(records)):
+        pickle.dumps(convert(records[i], labels[i]), 2)
+    return len(records) / (time.time() - start)
+
+
+if __name__ == "__main__":
+    parser = OptionParser()
+    parser.add_option("--records", type=int, dest="records", default=10000)
+    parser.add_option("--shape", dest="shape", default="28,28,1")
+    (options, args) = parser.parse_args()
+
+    shape = [int(i) for i in options.shape.split(",")]
+    records = np.random.randint(0, 256, [options.records] + shape).astype("uint8")
+    labels = np.random.randint(1, 11, [options.records])
+
+    for name, convert in [("list", list_sample), ("buffer", buffer_sample)]:
+        print("%s: %.1f records/sec" % (name, run(convert, records, labels)))
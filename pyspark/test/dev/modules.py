@@ -70,6 +70,12 @@ bigdl_layer = Module(
         "bigdl.util.common"
     ])
 
+bigdl_transformer = Module(
+    name="bigdl_transformer",
+    python_test_goals=[
+        "bigdl.dataset.transformer"
+    ])
+
 bigdl_optimizer = Module(
     name="bigdl_optimizer",
     python_test_goals=[
@@ -97,3 +103,31 @@ test_tensorflow = Module(
         "test.tensorflow_test"
     ]
 )
+
+test_download = Module(
+    name="download_test",
+    python_test_goals=[
+        "test.download_test"
+    ]
+)
+
+test_news20 = Module(
+    name="news20_test",
+    python_test_goals=[
+        "test.news20_test"
+    ]
+)
+
+test_mnist = Module(
+    name="mnist_test",
+    python_test_goals=[
+        "test.mnist_test"
+    ]
+)
+
+test_transformer = Module(
+    name="transformer_test",
+    python_test_goals=[
+        "test.transformer_test"
+    ]
+)
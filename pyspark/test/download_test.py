@@ -0,0 +1,124 @@
+#
+# Copyright 2016 The BigDL Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from bigdl.dataset import base
+from six.moves import BaseHTTPServer
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+
+class RangeHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    """
+    Serve the server's data, with range requests if the server supports them.
+    """
+    def do_GET(self):
+        data = self.server.data
+        self.server.requests.append(self.headers.get("Range"))
+        byte_range = self.headers.get("Range")
+        if byte_range and self.server.ranged:
+            start, end = [int(i) for i in byte_range.split("=")[1].split("-")]
+            body = data[start:end + 1]
+            self.send_response(206)
+            self.send_header("Content-Range", "bytes %d-%d/%d" % (start, end, len(data)))
+        else:
+            body = data
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestDownload(unittest.TestCase):
+
+    def setUp(self):
+        self.data = os.urandom(100000)
+        self.sha256 = hashlib.sha256(self.data).hexdigest()
+        self.server = BaseHTTPServer.HTTPServer(("127.0.0.1", 0), RangeHandler)
+        self.server.data = self.data
+        self.server.ranged = True
+        self.server.requests = []
+        self.url = "http://127.0.0.1:%d/data" % self.server.server_port
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.work_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.work_dir)
+
+    def read(self, path):
+        with open(path, "rb") as f:
+            return f.read()
+
+    def test_parallel_download(self):
+        path = base.maybe_download("data", self.work_dir, self.url, sha256=self.sha256,
+                                   chunk_size=16384)
+        self.assertEqual(self.read(path), self.data)
+        # the probe and 7 chunks
+        self.assertEqual(len(self.server.requests), 8)
+        self.assertFalse(os.path.exists(path + ".part"))
+        with open(os.path.join(self.work_dir, base.DOWNLOAD_INDEX)) as f:
+            self.assertEqual(json.load(f)["data"]["sha256"], self.sha256)
+
+        # the existing file is checked with the index
+        base.maybe_download("data", self.work_dir, self.url, sha256=self.sha256)
+        self.assertEqual(len(self.server.requests), 8)
+
+    def test_resume(self):
+        chunk_size = 16384
+        part_path = os.path.join(self.work_dir, "data.part")
+        with open(part_path, "wb") as f:
+            f.write(self.data[:chunk_size * 2])
+            f.truncate(len(self.data))
+        with open(part_path + ".done", "w") as f:
+            f.write(json.dumps({"url": self.url, "size": len(self.data),
+                                "chunk_size": chunk_size}) + "\n0\n1\n")
+
+        path = base.maybe_download("data", self.work_dir, self.url, sha256=self.sha256,
+                                   chunk_size=chunk_size)
+        self.assertEqual(self.read(path), self.data)
+        self.assertNotIn("bytes=0-16383", self.server.requests)
+        self.assertEqual(len(self.server.requests), 6)
+        self.assertFalse(os.path.exists(part_path + ".done"))
+
+    def test_download_without_range(self):
+        self.server.ranged = False
+        path = base.maybe_download("data", self.work_dir, self.url, chunk_size=16384)
+        self.assertEqual(self.read(path), self.data)
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_checksum_mismatch(self):
+        with open(os.path.join(self.work_dir, "data"), "wb") as f:
+            f.write(b"corrupted")
+        path = base.maybe_download("data", self.work_dir, self.url, sha256=self.sha256)
+        self.assertEqual(self.read(path), self.data)
+
+        self.assertRaises(IOError, base.maybe_download, "other", self.work_dir, self.url,
+                          sha256="0" * 64)
+        self.assertFalse(os.path.exists(os.path.join(self.work_dir, "other")))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+#
+# Copyright 2016 The BigDL Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from bigdl.dataset import mnist
+import gzip
+import os
+import shutil
+import struct
+import tempfile
+import time
+import unittest
+import numpy as np
+
+
+class TestMnist(unittest.TestCase):
+
+    def setUp(self):
+        self.train_dir = tempfile.mkdtemp()
+        self.images = np.arange(3 * 4 * 4, dtype=np.uint8).reshape([3, 4, 4, 1])
+        self.labels = np.array([7, 0, 3], dtype=np.uint8)
+        self.write_images(self.images)
+        self.write_idx("train-labels-idx1-ubyte.gz", 2049, [3], self.labels)
+
+    def tearDown(self):
+        shutil.rmtree(self.train_dir)
+
+    def write_idx(self, name, magic, shape, data):
+        with gzip.open(os.path.join(self.train_dir, name), "wb") as f:
+            f.write(struct.pack(">%dI" % (len(shape) + 1), magic, *shape))
+            f.write(data.tobytes())
+
+    def write_images(self, images):
+        self.write_idx("train-images-idx3-ubyte.gz", 2051, images.shape[:3], images)
+
+    def cache(self, name):
+        return os.path.join(self.train_dir, name)
+
+    def test_cache(self):
+        images, labels = mnist.read_data_sets(self.train_dir, "train")
+        self.assertTrue(os.path.exists(self.cache("train-images-idx3-ubyte.npy")))
+        self.assertTrue(os.path.exists(self.cache("train-labels-idx1-ubyte.npy")))
+        np.testing.assert_array_equal(images, self.images)
+        np.testing.assert_array_equal(labels, self.labels)
+
+        cache_mtime = os.path.getmtime(self.cache("train-images-idx3-ubyte.npy"))
+        images, labels = mnist.read_data_sets(self.train_dir, "train")
+        self.assertEqual(os.path.getmtime(self.cache("train-images-idx3-ubyte.npy")),
+                         cache_mtime)
+        for data, expected in [(images, self.images), (labels, self.labels)]:
+            self.assertIsInstance(data, np.memmap)
+            self.assertFalse(data.flags.writeable)
+            np.testing.assert_array_equal(data, expected)
+
+    def test_rebuild_stale_cache(self):
+        mnist.read_data_sets(self.train_dir, "train")
+        new_images = self.images[::-1].copy()
+        self.write_images(new_images)
+        cache = self.cache("train-images-idx3-ubyte.npy")
+        # make the cache older than the rewritten .gz
+        stale = time.time() - 10
+        os.utime(cache, (stale, stale))
+        images, _ = mnist.read_data_sets(self.train_dir, "train")
+        np.testing.assert_array_equal(images, new_images)
+
+    def test_normalize(self):
+        images, labels = mnist.read_data_sets(self.train_dir, "train", normalize=True)
+        self.assertTrue(os.path.exists(self.cache("train-images-idx3-ubyte.normalized.npy")))
+        self.assertEqual(images.dtype, np.float32)
+        expected = ((self.images - mnist.TRAIN_MEAN) / mnist.TRAIN_STD).astype(np.float32)
+        np.testing.assert_allclose(images, expected, rtol=1e-6)
+        np.testing.assert_array_equal(labels, self.labels)
+
+if __name__ == "__main__":
+    unittest.main()
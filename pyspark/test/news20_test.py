@@ -0,0 +1,91 @@
+#
+# Copyright 2016 The BigDL Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from bigdl.dataset import news20
+from bigdl.util.common import *
+import os
+import shutil
+import sys
+import pickle
+import tarfile
+import tempfile
+import types
+import unittest
+import zipfile
+import numpy as np
+
+
+class TestNews20(unittest.TestCase):
+
+    def setUp(self):
+        self.source_dir = tempfile.mkdtemp()
+        tree = tempfile.mkdtemp()
+        self.texts = []
+        for label, name in enumerate(["alt.atheism", "comp.graphics"], 1):
+            class_dir = os.path.join(tree, "20_newsgroups", name)
+            os.makedirs(class_dir)
+            # the documents are read with "\n", "\r\n" and "\r" line endings
+            for i, newline in enumerate(["\n", "\r\n", "\r"]):
+                content = "%s document%s%d" % (name, newline, i)
+                with open(os.path.join(class_dir, str(50000 + i)), "wb") as f:
+                    f.write(content.encode("latin-1"))
+                if sys.version_info >= (3,):
+                    content = content.replace(newline, "\n")
+                self.texts.append((content, label))
+        with tarfile.open(os.path.join(self.source_dir, "20news-19997.tar.gz"), "w:gz") as tar:
+            tar.add(os.path.join(tree, "20_newsgroups"), "20_newsgroups")
+        shutil.rmtree(tree)
+
+    def tearDown(self):
+        shutil.rmtree(self.source_dir)
+
+    def test_iter_news20(self):
+        texts = news20.iter_news20(self.source_dir)
+        self.assertIsInstance(texts, types.GeneratorType)
+        self.assertEqual(list(texts), self.texts)
+        self.assertEqual(news20.get_news20(self.source_dir), self.texts)
+
+    def test_read_news20_rdd(self):
+        sc = SparkContext(master="local[2]", appName="test news20", conf=create_spark_conf())
+        try:
+            texts = news20.read_news20_rdd(sc, self.source_dir, 2).collect()
+        finally:
+            sc.stop()
+        self.assertEqual(sorted(texts), self.texts)
+
+    def test_glove_store(self):
+        # a blank line and a line without a vector are skipped
+        glove = u"the 0.5 -1.0 2.0\nof 1 2 3\n\nand\ncaf\xe9 -0.25 0 1e-3\n"
+        with zipfile.ZipFile(os.path.join(self.source_dir, "glove.6B.zip"), "w") as f:
+            f.writestr("glove.6B.3d.txt", glove.encode("latin-1"))
+        store = news20.get_glove_store(self.source_dir, dim=3)
+        self.assertIsInstance(store.vectors, np.memmap)
+        self.assertEqual(len(store), 3)
+        self.assertEqual(store.dim, 3)
+        np.testing.assert_allclose(store.lookup(["of", "##", "the"]),
+                                   [[1, 2, 3], [0, 0, 0], [0.5, -1, 2]])
+
+        w2v = news20.get_glove_w2v(self.source_dir, dim=3)
+        self.assertEqual(sorted(w2v), sorted(store.words))
+        np.testing.assert_allclose(w2v[store.words[2]], [-0.25, 0, 1e-3], rtol=1e-6)
+
+        subset = pickle.loads(pickle.dumps(store.subset(["of", "and"])))
+        self.assertEqual(subset.words, ["of"])
+        self.assertEqual(subset.index, {"of": 0})
+        np.testing.assert_allclose(subset.lookup(["the", "of"]), [[0, 0, 0], [1, 2, 3]])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -71,6 +71,13 @@ class TestWorkFlow(unittest.TestCase):
         fc1_loaded = Model.load(tmp_path)
         self.assertTrue(np.allclose(fc1_loaded.get_weights()[0],
                                     fc1.get_weights()[0]))
+        snapshot_path = tempfile.mkdtemp()
+        fc1.save(snapshot_path, True, mmap=True)
+        fc1_mapped = Model.load(snapshot_path, mmap=True)
+        self.assertTrue(np.allclose(fc1_mapped.get_weights()[0],
+                                    fc1.get_weights()[0]))
+        self.assertTrue(np.allclose(Model.load_snapshot_weights(snapshot_path)[1],
+                                    fc1.get_weights()[1]))
 
     def test_load_optim_method(self):
         FEATURES_DIM = 2
@@ -150,6 +157,15 @@ class TestWorkFlow(unittest.TestCase):
         result = get_bigdl_conf()
         self.assertTrue(result.get("spark.executorEnv.OMP_WAIT_POLICY"), "passive")
 
+    def test_java_method_cache(self):
+        from bigdl.util import common
+        RNG().set_seed(100)
+        self.assertTrue(("float", "setModelSeed") in common._java_methods)
+        JavaCreator.set_creator_class(JavaCreator.get_creator_class())
+        self.assertEqual(len(common._java_methods), 0)
+        RNG().set_seed(100)
+        self.assertTrue(("float", "setModelSeed") in common._java_methods)
+
     def test_set_seed(self):
         w_init = Xavier()
         b_init = Zeros()
@@ -218,6 +234,19 @@ class TestWorkFlow(unittest.TestCase):
         trained_model = optimizer.optimize()
         lr_result = train_summary.read_scalar("LearningRate")
         top1_result = val_summary.read_scalar("Top1Accuracy")
+        loss_result = train_summary.read_scalar("Loss")
+        new_loss = train_summary.read_scalar("Loss", since_step=loss_result[1][0])
+        self.assertEqual(new_loss.dtype.names, ("step", "value", "wall_clock_time"))
+        self.assertEqual(new_loss["step"].tolist(), [r[0] for r in loss_result[2:]])
+        self.assertTrue(np.allclose(new_loss["value"], [r[1] for r in loss_result[2:]]))
+        self.assertEqual(len(val_summary.read_scalar("Top1Accuracy", since_step=1 << 40)), 0)
+
+        resumed_model = Sequential()
+        resumed_model.add(Linear(FEATURES_DIM, 1).set_name("linear1"))
+        Optimizer(model=resumed_model, training_rdd=trainingData, criterion=MSECriterion(),
+                  end_trigger=MaxEpoch(epoch_num), batch_size=batch_size).resume(tmp_dir)
+        self.assertTrue(np.allclose(resumed_model.parameters()["linear1"]["weight"],
+                                    trained_model.parameters()["linear1"]["weight"]))
 
         # TODO: add result validation
         parameters = trained_model.parameters()
@@ -257,6 +286,51 @@ class TestWorkFlow(unittest.TestCase):
         grad_output = mse.backward(output, rng.uniform(0.0, 1.0, [5]))
         l_grad_output = linear.backward(input, grad_output)
 
+    def test_forward_batch(self):
+        linear = Linear(4, 3)
+        inputs = [np.random.random(4) for i in range(10)]
+        outputs = linear.forward_batch(inputs, 4)
+        self.assertEqual(len(outputs), 10)
+        for i in range(10):
+            self.assertTrue(np.allclose(outputs[i], linear.forward(inputs[i]),
+                                        atol=1e-6, rtol=0))
+        grad_outputs = [np.ones(3) for i in range(10)]
+        grad_inputs = linear.backward_batch(inputs, grad_outputs, 4)
+        self.assertTrue(np.allclose(grad_inputs[0],
+                                    linear.backward(inputs[0], grad_outputs[0]),
+                                    atol=1e-6, rtol=0))
+
+    def test_get_times(self):
+        model = Sequential().add(Linear(4, 3).set_name("fc1")) \
+            .add(ReLU().set_name("relu")).add(Linear(3, 2).set_name("fc2"))
+        model.forward(np.random.random(4))
+        self.assertEqual(model.get_times()["fc1"][2:], (0, 0))
+        model.enable_profiling().reset_times()
+        for i in range(3):
+            model.forward(np.random.random(4))
+        model.backward(np.random.random(4), np.ones(2))
+        times = model.get_times()
+        self.assertEqual(sorted(times.keys()), ["fc1", "fc2", "relu"])
+        forward_time, backward_time, forward_calls, backward_calls = times["fc1"]
+        self.assertTrue(forward_time > 0 and backward_time > 0)
+        self.assertEqual((forward_calls, backward_calls), (3, 1))
+        model.reset_times()
+        self.assertEqual(model.get_times()["fc2"], (0.0, 0.0, 0, 0))
+
+    def test_replica_predictor(self):
+        linear = Linear(4, 3)
+        predictor = ReplicaPredictor(linear, replica_number=2)
+        input = np.random.random([5, 4])
+        self.assertTrue(np.allclose(predictor.predict(input), linear.forward(input),
+                                    atol=1e-6, rtol=0))
+        inputs = [np.random.random([5, 4]) for i in range(8)]
+        threaded_predictor = linear.predictor(num_threads=4)
+        outputs = threaded_predictor.predict_all(inputs)
+        threaded_predictor.close()
+        for i in range(8):
+            self.assertTrue(np.allclose(outputs[i], linear.forward(inputs[i]),
+                                        atol=1e-6, rtol=0))
+
     def test_forward_multiple(self):
         from bigdl.nn.layer import Linear
         rng = RNG()
@@ -355,6 +429,76 @@ class TestWorkFlow(unittest.TestCase):
         predict_labels = predict_class.take(6)
         for i in range(0, total_length):
             self.assertTrue(predict_labels[i] == 1)
+        batches = list(model.predict_iterator(predict_data, batch_size=4))
+        self.assertTrue(all(len(batch) <= 4 for batch in batches))
+        self.assertTrue(np.allclose(np.concatenate(batches), ground_label,
+                                    atol=1e-6, rtol=0))
+
+    def test_dataframe(self):
+        np.random.seed(100)
+        features = np.random.uniform(0, 1, (100, 2))
+        rows = [(features[i].tolist(), float((2 * features[i]).sum() + 0.4))
+                for i in range(100)]
+        df = get_spark_sql_context(self.sc).createDataFrame(rows, ["features", "label"])
+        model = Linear(2, 1)
+        optimizer = Optimizer(
+            model=model,
+            training_rdd=df,
+            criterion=MSECriterion(),
+            optim_method=SGD(learningrate=0.01),
+            end_trigger=MaxEpoch(2),
+            batch_size=32)
+        optimizer.set_validation(batch_size=32, val_rdd=df,
+                                 trigger=EveryEpoch(), val_method=[Loss()])
+        trained_model = optimizer.optimize()
+        predict_result = trained_model.predict(df).collect()
+        self.assertEqual(len(predict_result), 100)
+        self.assertTrue(np.allclose(predict_result[0],
+                                    trained_model.forward(features[0]),
+                                    atol=1e-6, rtol=0))
+        test_results = trained_model.test(df, 32, [Loss()])
+        self.assertEqual(test_results[0].total_num, 100)
+
+    def test_dataframe_ml_vector(self):
+        try:
+            from pyspark.ml.linalg import Vectors
+        except ImportError:
+            self.skipTest("pyspark.ml.linalg needs spark 2.0")
+        np.random.seed(100)
+        features = np.random.uniform(0, 1, (10, 2))
+        rows = [(Vectors.dense(features[i].tolist()), float(features[i].sum()))
+                for i in range(10)]
+        df = get_spark_sql_context(self.sc).createDataFrame(rows, ["features", "label"])
+        model = Linear(2, 1)
+        predict_result = model.predict(df).collect()
+        self.assertEqual(len(predict_result), 10)
+        self.assertTrue(np.allclose(predict_result[0], model.forward(features[0]),
+                                    atol=1e-6, rtol=0))
+        test_results = model.test(df, 5, [Loss()])
+        self.assertEqual(test_results[0].total_num, 10)
+
+    def test_optimize_async(self):
+        samples = self.sc.parallelize(range(0, 100)).map(
+            lambda i: Sample.from_ndarray(np.random.uniform(0, 1, (2)), 1.0))
+        optimizer = Optimizer(
+            model=Linear(2, 1),
+            training_rdd=samples,
+            criterion=MSECriterion(),
+            optim_method=SGD(learningrate=0.01),
+            end_trigger=MaxIteration(1000000),
+            batch_size=32)
+        future = optimizer.optimize_async()
+        records = []
+        for record in future.stream_metrics(interval=0.1):
+            records.append(record)
+            if len(records) == 3:
+                self.assertTrue(future.cancel())
+        self.assertTrue(future.done())
+        self.assertTrue(future.cancelled())
+        self.assertEqual([r["neval"] for r in records[:3]], [2, 3, 4])
+        self.assertTrue(all("Loss" in r and "Throughput" in r for r in records))
+        trained_model = future.result(timeout=60)
+        self.assertEqual(trained_model.forward(np.ones(2)).shape, (1,))
 
     def test_rng(self):
         rng = RNG()
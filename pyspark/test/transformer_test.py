@@ -0,0 +1,66 @@
+#
+# Copyright 2016 The BigDL Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from bigdl.dataset.transformer import *
+from bigdl.util.common import *
+import unittest
+import numpy as np
+
+
+class TestTransformer(unittest.TestCase):
+
+    def setUp(self):
+        self.sc = SparkContext(master="local[2]", appName="test transformer",
+                               conf=create_spark_conf())
+        # the same block in two partitions, each record has distinct pixels
+        self.features = np.arange(64 * 8 * 8, dtype=np.float32).reshape([64, 1, 8, 8])
+        self.labels = np.ones([64, 1])
+        self.rdd = self.sc.parallelize([(self.features, self.labels)] * 2, 2)
+
+    def tearDown(self):
+        self.sc.stop()
+
+    def transform(self, transformer):
+        return [block.features for block in transformer.apply(self.rdd).collect()]
+
+    def test_partitions_get_different_random_choices(self):
+        for transformer in [HorizontalFlip(0.5), Crop(4, 4, random=True),
+                            HorizontalFlip(0.5, seed=1) + Crop(4, 4, random=True, seed=1)]:
+            first, second = self.transform(transformer)
+            self.assertFalse(np.array_equal(first, second))
+
+    def test_seeded_partitions_are_reproducible(self):
+        transformer = HorizontalFlip(0.5, seed=1) + Crop(4, 4, random=True, seed=2)
+        self.assertEqual(len(self.transform(transformer)), 2)
+        for run, rerun in zip(self.transform(transformer), self.transform(transformer)):
+            np.testing.assert_array_equal(run, rerun)
+
+    def test_flip(self):
+        flipped, _ = self.transform(HorizontalFlip(1.0))
+        np.testing.assert_array_equal(flipped, self.features[..., ::-1])
+
+    def test_input_unchanged(self):
+        features = self.features.copy()
+        labels = self.labels.copy()
+        pipeline = Normalize(1.0, 2.0) + ChannelNormalize([1.0], [2.0]) + \
+            HorizontalFlip(1.0) + OneHot(2)
+        block = pipeline(SampleBlock.from_ndarray(features, labels))
+        np.testing.assert_array_equal(features, self.features)
+        np.testing.assert_array_equal(labels, self.labels)
+        self.assertFalse(np.may_share_memory(block.features, features))
+
+if __name__ == "__main__":
+    unittest.main()
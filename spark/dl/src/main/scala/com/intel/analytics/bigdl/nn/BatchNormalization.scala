@@ -334,6 +334,7 @@ class BatchNormalization[@specialized(Float, Double) T: ClassTag](
     val before = System.nanoTime()
     val result = backward(input, gradOutput, gradInput, gradWeight, gradBias)
     backwardTime += System.nanoTime() - before
+    if (profiling) backwardCount += 1
     result
   }
 
@@ -237,6 +237,7 @@ class Concat[T: ClassTag](val dimension: Int)(
       offset += currentOutput.size(dimension)
       backwardTime += System.nanoTime() - before
     }
+    if (profiling) backwardCount += 1
 
     this.gradInput
   }
@@ -321,9 +322,20 @@ class Concat[T: ClassTag](val dimension: Int)(
   }
 
   override def resetTimes(): Unit = {
+    super.resetTimes()
     forwardTimeOverhead = 0
     forwardTime = 0
     backwardTime = 0
+    forwardCount = 0
+    backwardCount = 0
+  }
+
+  override private[nn] def addTimes(forward: Long, backward: Long, forwardCalls: Long,
+    backwardCalls: Long): Unit = {
+    forwardTimeOverhead += forward
+    backwardTime += backward
+    forwardCount += forwardCalls
+    backwardCount += backwardCalls
   }
 }
 
@@ -85,6 +85,12 @@ abstract class Container[A <: Activity : ClassTag,
     this
   }
 
+  override def setProfiling(enabled: Boolean): this.type = {
+    profiling = enabled
+    modules.foreach(_.setProfiling(enabled))
+    this
+  }
+
   override def getTimes():
     Array[(AbstractModule[_ <: Activity, _ <: Activity, T], Long, Long)] = {
     this.modules.flatMap(_.getTimes()).toArray
@@ -22,7 +22,7 @@ import com.intel.analytics.bigdl.nn.abstractnn.Activity
 import com.intel.analytics.bigdl.nn.abstractnn.AbstractModule
 import com.intel.analytics.bigdl.tensor.Tensor
 import com.intel.analytics.bigdl.tensor.TensorNumericMath.TensorNumeric
-import com.intel.analytics.bigdl.utils.File
+import com.intel.analytics.bigdl.utils.{File, Snapshot}
 import com.intel.analytics.bigdl.utils.caffe.CaffeLoader
 import com.intel.analytics.bigdl.utils.tf.{TensorflowDataFormat, TensorflowLoader}
 
@@ -42,6 +42,20 @@ object Module {
     File.load[AbstractModule[Activity, Activity, T]](path)
   }
 
+  /**
+   * Load model from a snapshot saved by saveSnapshot. The weights are copied in bulk from
+   * the memory mapped weights file, so processes on one host loading the same snapshot
+   * read it from the shared page cache.
+   *
+   * @param path snapshot directory, only local file system is supported
+   * @tparam T numeric type
+   * @return model loaded from path
+   */
+  def loadSnapshot[T: ClassTag](path : String)
+    (implicit ev: TensorNumeric[T]) : AbstractModule[Activity, Activity, T] = {
+    Snapshot.load[T](path)
+  }
+
   def loadTorch[T: ClassTag](path : String) : AbstractModule[Activity, Activity, T] = {
     File.loadTorch[AbstractModule[Activity, Activity, T]](path)
   }
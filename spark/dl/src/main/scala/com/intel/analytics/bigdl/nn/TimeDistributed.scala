@@ -156,6 +156,11 @@ class TimeDistributed[T : ClassTag] (layer: TensorModule[T])
 
   override def resetTimes(): Unit = layer.resetTimes()
 
+  override def setProfiling(enabled: Boolean): TimeDistributed.this.type = {
+    layer.setProfiling(enabled)
+    super.setProfiling(enabled)
+  }
+
   override def getTimes(): Array[(AbstractModule[_ <: Activity, _ <: Activity, T], Long, Long)] = {
     layer.getTimes()
   }
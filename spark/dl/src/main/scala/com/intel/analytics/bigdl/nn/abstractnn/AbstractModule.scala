@@ -194,6 +194,30 @@ abstract class AbstractModule[A <: Activity: ClassTag, B <: Activity: ClassTag,
 
   protected var backwardTime = 0L
 
+  protected var forwardCount = 0L
+
+  protected var backwardCount = 0L
+
+  /**
+   * Whether the forward and backward calls are counted, see setProfiling
+   */
+  protected var profiling = false
+
+  /**
+   * Enable or disable profiling of this module and its sub modules, it's disabled by
+   * default. When it's enabled, the modules count their forward and backward calls, and
+   * Optimizer adds the time and calls spent on its replicas to the model when optimize()
+   * finishes. The forward and backward time is recorded either way.
+   *
+   * @param enabled enable or disable profiling
+   */
+  def setProfiling(enabled: Boolean): this.type = {
+    profiling = enabled
+    this
+  }
+
+  final def isProfiling(): Boolean = profiling
+
   def getTimes(): Array[(AbstractModule[_ <: Activity, _ <: Activity, T], Long, Long)] = {
     Array((this, forwardTime, backwardTime))
   }
@@ -201,6 +225,47 @@ abstract class AbstractModule[A <: Activity: ClassTag, B <: Activity: ClassTag,
   def resetTimes(): Unit = {
     forwardTime = 0
     backwardTime = 0
+    forwardCount = 0
+    backwardCount = 0
+  }
+
+  /**
+   * Get the number of forward and backward calls of this module.
+   */
+  def getCounts(): (Long, Long) = (forwardCount, backwardCount)
+
+  /**
+   * Get the forward time, backward time, forward calls and backward calls of each module
+   * in getTimes().
+   */
+  private[bigdl] def getProfile(): Array[(Long, Long, Long, Long)] = {
+    getTimes().map { case (module, forward, backward) =>
+      val (forwardCalls, backwardCalls) = module.getCounts()
+      (forward, backward, forwardCalls, backwardCalls)
+    }
+  }
+
+  /**
+   * Add the profile of a copy of this module, e.g. a replica trained on a worker, to the
+   * modules in getTimes().
+   *
+   * @param profile the profile of the copy, see getProfile()
+   */
+  private[bigdl] def addProfile(profile: Array[(Long, Long, Long, Long)]): Unit = {
+    val times = getTimes()
+    require(times.length == profile.length,
+      s"The profile has ${profile.length} modules while this module has ${times.length}")
+    times.zip(profile).foreach { case ((module, _, _), (forward, backward, fCalls, bCalls)) =>
+      module.addTimes(forward, backward, fCalls, bCalls)
+    }
+  }
+
+  private[nn] def addTimes(forward: Long, backward: Long, forwardCalls: Long,
+    backwardCalls: Long): Unit = {
+    forwardTime += forward
+    backwardTime += backward
+    forwardCount += forwardCalls
+    backwardCount += backwardCalls
   }
 
   /**
@@ -214,6 +279,7 @@ abstract class AbstractModule[A <: Activity: ClassTag, B <: Activity: ClassTag,
     val before = System.nanoTime()
     updateOutput(input)
     forwardTime += System.nanoTime() - before
+    if (profiling) forwardCount += 1
 
     output
   }
@@ -233,6 +299,7 @@ abstract class AbstractModule[A <: Activity: ClassTag, B <: Activity: ClassTag,
     updateGradInput(input, gradOutput)
     accGradParameters(input, gradOutput)
     backwardTime += System.nanoTime() - before
+    if (profiling) backwardCount += 1
 
     gradInput
   }
@@ -386,6 +453,18 @@ abstract class AbstractModule[A <: Activity: ClassTag, B <: Activity: ClassTag,
     this
   }
 
+  /**
+   * Save the module as a snapshot, whose weights file could be memory mapped by
+   * Module.loadSnapshot. See [[Snapshot]] for the format.
+   *
+   * @param path snapshot directory, only local file system is supported
+   * @param overWrite if overwrite
+   */
+  def saveSnapshot(path : String, overWrite: Boolean = false) : this.type = {
+    Snapshot.save(this.asInstanceOf[AbstractModule[Activity, Activity, T]], path, overWrite)
+    this
+  }
+
   def saveTorch(path : String, overWrite: Boolean = false) : this.type = {
     this.clearState()
     File.saveTorch(this, path, TYPE_MODULE, overWrite)
@@ -0,0 +1,181 @@
+/*
+ * Copyright 2016 The BigDL Authors.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+package com.intel.analytics.bigdl.optim
+
+import com.intel.analytics.bigdl.Module
+import com.intel.analytics.bigdl.tensor.Tensor
+import com.intel.analytics.bigdl.tensor.TensorNumericMath.TensorNumeric
+import com.intel.analytics.bigdl.utils.File
+import org.apache.hadoop.fs.Path
+import org.apache.log4j.Logger
+
+import scala.collection.mutable
+import scala.collection.mutable.ArrayBuffer
+import scala.reflect.ClassTag
+
+/**
+ * Write the checkpoint files of an optimizer. Each file is written to a hidden temporary
+ * file first and then renamed, so a crash never leaves a partial checkpoint file.
+ *
+ * In async mode, the files are written in a background thread while the training goes on,
+ * so the objects given to [[write]] should be snapshots which are not changed by the
+ * training. At most one checkpoint is in flight, a new checkpoint waits for the last one.
+ *
+ * @param path the checkpoint directory, a local/HDFS/S3 path
+ * @param overWrite if overwrite the existing checkpoint files
+ * @param async if write the checkpoint files in a background thread
+ * @param keepLast only keep the latest keepLast checkpoints written by this writer, keep
+ *                 all of them if it's not positive. A delta checkpoint is kept as long as
+ *                 the full checkpoint it's based on, so keepLast counts the full ones
+ * @param fullEvery if greater than 1, [[writeModel]] saves the full model every fullEvery
+ *                  checkpoints, and a [[ModelDelta]] against the previous checkpoint for
+ *                  the others
+ */
+private[optim] class CheckpointWriter(
+  val path: String,
+  overWrite: Boolean,
+  async: Boolean = false,
+  keepLast: Int = 0,
+  fullEvery: Int = 0) {
+
+  private var pending: Thread = null
+  @volatile private var error: Throwable = null
+  // the postfixes and file names of the checkpoints written, grouped by the full checkpoint
+  // they are based on, the oldest first
+  private val written = new mutable.Queue[ArrayBuffer[(String, Seq[String])]]()
+
+  // the parameters and postfix of the previous model checkpoint, the base of the next delta
+  private var lastParameters: Array[Tensor[_]] = null
+  private var lastPostfix: String = null
+  private var deltaCount = 0
+
+  /**
+   * Write a checkpoint with a model, which is saved in full as "model" or as a [[ModelDelta]]
+   * named "delta". The model should be a snapshot not changed by the training.
+   *
+   * @param postfix the postfix of the file names, e.g. ".100"
+   * @param model the model
+   * @param files name and object of the other files in the checkpoint
+   */
+  def writeModel[T: ClassTag](postfix: String, model: Module[T], files: (String, Serializable)*)(
+    implicit ev: TensorNumeric[T]): Unit = {
+    val parameters = model.parameters()
+    if (fullEvery <= 1 || parameters == null) {
+      write(postfix, ("model" -> model) +: files: _*)
+      return
+    }
+
+    // the previous checkpoint may have failed, the next one has to be full
+    await()
+    val current = parameters._1
+    if (lastParameters == null || deltaCount + 1 >= fullEvery) {
+      write(postfix, ("model" -> model) +: files: _*)
+      lastParameters = current.map(_.clone())
+      deltaCount = 0
+    } else {
+      val last = lastParameters.asInstanceOf[Array[Tensor[T]]]
+      val delta = ModelDelta[T](lastPostfix, last, current)
+      delta.applyTo(last)
+      writeFiles(postfix, false, ("delta" -> delta) +: files: _*)
+      deltaCount += 1
+    }
+    lastPostfix = postfix
+  }
+
+  /**
+   * Write a checkpoint.
+   *
+   * @param postfix the postfix of the file names, e.g. ".100"
+   * @param files name and object of each file in the checkpoint, e.g. "model" -> model
+   */
+  def write(postfix: String, files: (String, Serializable)*): Unit = {
+    writeFiles(postfix, true, files: _*)
+  }
+
+  private def writeFiles(postfix: String, full: Boolean, files: (String, Serializable)*): Unit = {
+    val task = new Runnable {
+      override def run(): Unit = {
+        files.foreach { case (name, obj) => save(obj, s"$name$postfix") }
+        if (full || written.isEmpty) written.enqueue(new ArrayBuffer[(String, Seq[String])]())
+        written.last.append((postfix, files.map(_._1)))
+        retain()
+      }
+    }
+    if (async) {
+      await()
+      pending = new Thread(new Runnable {
+        override def run(): Unit = {
+          try {
+            task.run()
+          } catch {
+            case t: Throwable => error = t
+          }
+        }
+      }, "bigdl-checkpoint")
+      pending.setDaemon(true)
+      pending.start()
+    } else {
+      task.run()
+    }
+  }
+
+  /**
+   * Wait for the checkpoint in flight, throw the exception if it failed.
+   */
+  def await(): Unit = {
+    if (pending != null) {
+      pending.join()
+      pending = null
+    }
+    if (error != null) {
+      val t = error
+      error = null
+      lastParameters = null
+      throw t
+    }
+  }
+
+  private def save(obj: Serializable, fileName: String): Unit = {
+    val target = new Path(path, fileName)
+    val tmp = new Path(path, s".$fileName.tmp")
+    File.save(obj, tmp.toString, true)
+    val fs = target.getFileSystem(File.getConfiguration(path))
+    if (fs.exists(target)) {
+      require(overWrite, s"$target already exists")
+      fs.delete(target, false)
+    }
+    require(fs.rename(tmp, target), s"Failed to rename $tmp to $target")
+  }
+
+  private def retain(): Unit = {
+    while (keepLast > 0 && written.length > keepLast) {
+      written.dequeue().foreach { case (postfix, names) =>
+        names.foreach { name =>
+          val file = new Path(path, s"$name$postfix")
+          val fs = file.getFileSystem(File.getConfiguration(path))
+          if (!fs.delete(file, false)) {
+            CheckpointWriter.logger.warn(s"Failed to delete the old checkpoint $file")
+          }
+        }
+      }
+    }
+  }
+}
+
+object CheckpointWriter {
+  private val logger = Logger.getLogger(getClass)
+}
@@ -81,10 +81,9 @@ object DistriOptimizer {
    * @param validationDataSet validation dataset
    * @param validationMethods validation methods
    * @param cacheTrigger cache trigger
-   * @param cachePath cache path
+   * @param checkpointWriter checkpoint writer
    * @param trainSummary train summary
    * @param validationSummary validation summary
-   * @param isOverWrite  if overwrite the checkpoint
    */
   private[optim] def optimize[T: ClassTag](
     dataset: DistributedDataSet[MiniBatch[T]],
@@ -99,10 +98,9 @@ object DistriOptimizer {
     validationDataSet: Option[DataSet[MiniBatch[T]]],
     validationMethods: Option[Array[ValidationMethod[T]]],
     cacheTrigger: Option[Trigger],
-    cachePath: Option[String],
+    checkpointWriter: Option[CheckpointWriter],
     trainSummary: Option[TrainSummary],
-    validationSummary: Option[ValidationSummary],
-    isOverWrite: Boolean
+    validationSummary: Option[ValidationSummary]
   )(implicit ev: TensorNumeric[T]) = {
     val sc = dataset.originRDD().sparkContext
     val partitionNum = dataset.originRDD().partitions.length
@@ -111,12 +109,15 @@ object DistriOptimizer {
     val driverState = T("epoch" -> optimMethod.state.get[Int]("epoch").getOrElse(1),
       "neval" -> optimMethod.state.get[Int]("neval").getOrElse(1),
       "Loss" -> optimMethod.state.get[Float]("Loss").getOrElse(Float.PositiveInfinity),
-      "score" -> optimMethod.state.get[Float]("score").getOrElse(0f))
+      "score" -> optimMethod.state.get[Float]("score").getOrElse(0f),
+      "recordsProcessedThisEpoch" ->
+        optimMethod.state.get[Int]("recordsProcessedThisEpoch").getOrElse(0))
+    Trigger.copyState(optimMethod.state, driverState)
     val _subModelNumber = Engine.getEngineType match {
       case MklBlas => coresPerNode
       case _ => throw new IllegalArgumentException()
     }
-    var accumulateCount = 0
+    var accumulateCount = driverState[Int]("recordsProcessedThisEpoch")
     val shuffleBefore = System.nanoTime()
     logger.info(s"config $state")
     logger.info(s"Shuffle data")
@@ -148,6 +149,7 @@ object DistriOptimizer {
       metrics.set("aggregate gradient time", 0.0, sc, partitionNum)
       metrics.set("get weights average", 0.0, sc, partitionNum)
       metrics.set("get weights for each node", mutable.ArrayBuffer[Double](), sc)
+      metrics.set("data fetch average", 0.0, sc, partitionNum)
 
       val driverMetrics = metrics
       val start = System.nanoTime()
@@ -163,7 +165,9 @@ object DistriOptimizer {
            */
           val weightsResult = parameters.getWeights(cached.modelWeights.head)
           val miniBatchBuffer = new Array[MiniBatch[T]](_subModelNumber)
+          val fetchStart = System.nanoTime()
           val batch = data.next()
+          driverMetrics.add("data fetch average", System.nanoTime() - fetchStart)
           val stackSize = batch.size() / _subModelNumber
           tasks += Engine.default.invoke(() => {
             var b = 0
@@ -262,6 +266,7 @@ object DistriOptimizer {
       dropModelNumBatch += (driverSubModelNum - finishedModelNum)
       if (dropPercentage == 0 || finishedModelNum >= driverSubModelNum * (1-maxDropPercentage)) {
         val value = lossSum.value / finishedModelNum
+        val updateStart = System.nanoTime()
         models.mapPartitions(modelIter => {
           val modelCache = modelIter.next()
           parameters.aggregateGradientPartition()
@@ -278,6 +283,7 @@ object DistriOptimizer {
           parameters.sendWeightPartition()
           Iterator.empty
         }).count()
+        val updateTime = System.nanoTime() - updateStart
 
         accumulateCount += recordsNum.value
         val end = System.nanoTime()
@@ -292,6 +298,7 @@ object DistriOptimizer {
         optimMethod.updateHyperParameter()
         driverState("Throughput") = recordsNum.value.toFloat / ((end - start) / 1e9f)
         driverState("LearningRate") = -optimMethod.getLearningRate().toFloat
+        updatePhaseTimes(driverState, metrics, updateTime)
         logger.info(s"${_header} Train ${recordsNum.value} in ${(end - start) / 1e9}seconds. " +
           s"Throughput is ${driverState("Throughput")} records/second. Loss is ${
             driverState("Loss")}. ${optimMethod.getHyperParameter()}")
@@ -342,6 +349,7 @@ object DistriOptimizer {
           dataRDD = dataset.data(train = true)
           accumulateCount = 0
         }
+        driverState("recordsProcessedThisEpoch") = accumulateCount
         validate(
           validationTrigger,
           validationDataSet,
@@ -364,8 +372,7 @@ object DistriOptimizer {
 
         checkpoint(
           cacheTrigger,
-          cachePath,
-          isOverWrite,
+          checkpointWriter,
           wallClockTime,
           models,
           driverState,
@@ -384,8 +391,7 @@ object DistriOptimizer {
    * Create checkpoint.
    *
    * @param cacheTrigger cache trigger
-   * @param cachePath cache path
-   * @param isOverWrite whether over write
+   * @param checkpointWriter checkpoint writer
    * @param wallClockTime wall clock time
    * @param models cached models
    * @param state state table
@@ -393,8 +399,7 @@ object DistriOptimizer {
    */
   private def checkpoint[T: ClassTag](
     cacheTrigger: Option[Trigger],
-    cachePath: Option[String],
-    isOverWrite: Boolean,
+    checkpointWriter: Option[CheckpointWriter],
     wallClockTime: Long,
     models: RDD[Cache[T]],
     state: Table,
@@ -403,18 +408,61 @@ object DistriOptimizer {
   : Unit = {
     if (cacheTrigger.isDefined) {
       val trigger = cacheTrigger.get
-      if (trigger(state) && cachePath.isDefined) {
-        println(s"[Wall Clock ${wallClockTime / 1e9}s] Save model to ${cachePath.get}")
-        saveModel(getModel(models, parameters), cachePath, isOverWrite,
-          s".${state[Int]("neval")}")
+      if (trigger(state) && checkpointWriter.isDefined) {
+        println(s"[Wall Clock ${wallClockTime / 1e9}s] Save model to " +
+          checkpointWriter.get.path)
+        // getModel returns a new copy of the model, which is not changed by the training
+        val model = getModel(models, parameters).clearState()
         optimMethod.state.update("epoch", state[Int]("epoch"))
         optimMethod.state.update("neval", state[Int]("neval"))
-        saveOptimMethod(optimMethod, cachePath, isOverWrite, s".${state[Int]("neval")}")
-
+        optimMethod.state.update("recordsProcessedThisEpoch",
+          state[Int]("recordsProcessedThisEpoch"))
+        Trigger.copyState(state, optimMethod.state)
+        val method = optimMethod.clone()
+        method.clearHistory()
+        checkpointWriter.get.writeModel(s".${state[Int]("neval")}", model,
+          "optimMethod" -> method)
       }
     }
   }
 
+  /**
+   * Sum up the forward/backward time and calls of the models cached on all the nodes.
+   *
+   * @param models cached models
+   * @return the profile in the order of getTimes() of the model
+   */
+  private def getProfile[T](models: RDD[Cache[T]]): Array[(Long, Long, Long, Long)] = {
+    def sum(a: Array[(Long, Long, Long, Long)], b: Array[(Long, Long, Long, Long)]) = {
+      a.zip(b).map { case (x, y) => (x._1 + y._1, x._2 + y._2, x._3 + y._3, x._4 + y._4) }
+    }
+    models.map(_.localModels.map(_.getProfile()).reduce(sum)).reduce(sum)
+  }
+
+  /**
+   * Put the time of each phase in last iteration into the driver state, in seconds, so they
+   * can be saved by the train summary. ComputingTimeSpread is the gap between the slowest
+   * and the fastest node, which shows the stragglers.
+   *
+   * @param driverState driver state
+   * @param metrics metrics of last iteration
+   * @param updateTime nanoseconds spent on updating and sending the weights
+   */
+  private def updatePhaseTimes(driverState: Table, metrics: Metrics, updateTime: Long): Unit = {
+    def average(name: String): Float = {
+      val (value, parallel) = metrics.get(name)
+      (value / parallel / 1e9).toFloat
+    }
+    driverState("DataFetchTime") = average("data fetch average")
+    driverState("GetWeightsTime") = average("get weights average")
+    driverState("ComputingTime") = average("computing time average")
+    driverState("AggregateGradientTime") = average("aggregate gradient time")
+    driverState("UpdateParametersTime") = (updateTime / 1e9).toFloat
+    val nodeTimes = metrics.get("computing time for each node", 0)
+    driverState("ComputingTimeSpread") =
+      if (nodeTimes.isEmpty) 0f else ((nodeTimes.max - nodeTimes.min) / 1e9).toFloat
+  }
+
   /**
    * Save train summaries.
    *
@@ -515,6 +563,8 @@ object DistriOptimizer {
       Engine.setNodeAndCore(nExecutor, executorCores)
       val cached = (0 until _subModelNumber).map { _ =>
         val localModel = broadcastModel.cloneModule()
+        // only profile the time spent on this replica
+        localModel.resetTimes()
         val localCriterion = broadcastCriterion.cloneCriterion()
         val localState = broadcastState.clone()
         val localMethod =
@@ -629,6 +679,9 @@ object DistriOptimizer {
       logger.info(s"${r._2} is ${r._1}")
     })
     state("score") = results(0)._1.result._1
+    val scores = T()
+    results.foreach(r => scores(r._2.toString()) = r._1.result._1)
+    state("validationScores") = scores
     if(validationSummary.isDefined) {
       results.foreach { r =>
         val result = r._1.result
@@ -746,6 +799,9 @@ class DistriOptimizer[T: ClassTag] (
       new File(file).mkdir()
       checkpointPath = Some(file)
     }
+    val checkpointWriter = checkpointPath.map(
+      new CheckpointWriter(_, isOverWrite, isAsyncCheckpoint, checkpointKeepLast,
+        checkpointFullEvery))
 
     var retryNum = 0
     val maxRetry = System.getProperty("bigdl.failure.retryTimes", "5").toInt
@@ -766,10 +822,9 @@ class DistriOptimizer[T: ClassTag] (
           validationDataSet,
           validationMethods,
           checkpointTrigger,
-          checkpointPath,
+          checkpointWriter,
           trainSummary,
-          validationSummary,
-          isOverWrite
+          validationSummary
         )
         retryNum = Int.MaxValue
       } catch {
@@ -792,14 +847,17 @@ class DistriOptimizer[T: ClassTag] (
             }
             DistriOptimizer.logger.info(s"Retrying $retryNum times")
             lastFailureTimestamp = System.nanoTime()
+            // the checkpoint in flight may be the one to recover from
+            checkpointWriter.foreach(_.await())
+            // the optim method is the last file of a checkpoint, so its model is complete
             val methodFile = getLatestFile(checkpointPath.get, "optimMethod")
-            val modelFile = getLatestFile(checkpointPath.get, "model")
             clearState()
             models.unpersist()
 
             var newModel: Module[T] = null
-            if (methodFile != null && modelFile != null) {
-              newModel = Module.load[T](modelFile)
+            if (methodFile != null) {
+              val postfix = new File(methodFile).getName.stripPrefix("optimMethod")
+              newModel = ModelDelta.loadModel[T](checkpointPath.get, postfix)
               optimMethod = OptimMethod.load[T](methodFile)
               DistriOptimizer.logger.info("Recover from last snapshot")
             } else {
@@ -815,9 +873,13 @@ class DistriOptimizer[T: ClassTag] (
       }
     }
 
+    checkpointWriter.foreach(_.await())
     val trainedModel = DistriOptimizer.getModel(models, parameters)
 
     nn.Utils.copyModule(trainedModel, model)
+    if (model.isProfiling()) {
+      model.addProfile(DistriOptimizer.getProfile(models))
+    }
 
     // Reset some internal states, so this or other optimizers can run optimize again
     clearState()
@@ -77,12 +77,16 @@ class LocalOptimizer[T: ClassTag] private[optim](
 
   override def optimize(): Module[T] = {
     var wallClockTime = 0L
-    var count = 0
+    var count = state.get[Int]("recordsProcessedThisEpoch").getOrElse(0)
     optimMethod.clearHistory()
     optimMethod.loadFromTable(state)
     state("epoch") = state.get[Int]("epoch").getOrElse(1)
     state("neval") = state.get[Int]("neval").getOrElse(1)
     state("isLayerwiseScaled") = Utils.isLayerwiseScaled(model)
+    workingModels.foreach(_.setProfiling(model.isProfiling()).resetTimes())
+    val checkpointWriter = checkpointPath.map(
+      new CheckpointWriter(_, isOverWrite, isAsyncCheckpoint, checkpointKeepLast,
+        checkpointFullEvery))
     dataset.shuffle()
     var iter = dataset.data(train = true)
     logger.info("model thread pool size is " + Engine.model.getPoolSize)
@@ -158,6 +162,9 @@ class LocalOptimizer[T: ClassTag] private[optim](
         s"Throughput is ${batch.size().toDouble / (end - start) * 1e9} record / second. " +
         optimMethod.getHyperParameter()
         )
+      state("Loss") = loss.toFloat
+      state("Throughput") = batch.size().toFloat / ((end - start) / 1e9f)
+      state("LearningRate") = -optimMethod.getLearningRate().toFloat
       state("neval") = state[Int]("neval") + 1
 
       if (count >= dataset.size()) {
@@ -166,30 +173,46 @@ class LocalOptimizer[T: ClassTag] private[optim](
         iter = dataset.toLocal().data(train = true)
         count = 0
       }
+      state("recordsProcessedThisEpoch") = count
 
       validate(wallClockTime)
-      checkpoint(wallClockTime)
+      checkpoint(wallClockTime, checkpointWriter)
     }
+    checkpointWriter.foreach(_.await())
 
     // copy running status from workingModels to model
     model.copyStatus(workingModels.head)
+    if (model.isProfiling()) {
+      workingModels.foreach(m => model.addProfile(m.getProfile()))
+    }
 
     model
   }
 
-  private def checkpoint(wallClockTime: Long): Unit = {
-    if (checkpointTrigger.isEmpty || checkpointPath.isEmpty) {
+  private def checkpoint(wallClockTime: Long, writer: Option[CheckpointWriter]): Unit = {
+    if (checkpointTrigger.isEmpty || writer.isEmpty) {
       return
     }
 
     val trigger = checkpointTrigger.get
-    if (trigger(state) && checkpointPath.isDefined) {
+    if (trigger(state)) {
       logger.info(s"[Wall Clock ${wallClockTime / 1e9}s] Save model to path")
-      saveModel(workingModels.head, checkpointPath, isOverWrite, s".${state[Int]("neval")}")
-      saveState(state, checkpointPath, isOverWrite, s".${state[Int]("neval")}")
+      val model = workingModels.head.clearState()
+      // the working model is changed by the next iteration, copy it for the background writer
+      val snapshot = if (isAsyncCheckpoint) model.cloneModule() else model
+      val method = optimMethod.clone()
+      method.clearHistory()
+      writer.get.writeModel(s".${state[Int]("neval")}", snapshot, "optimMethod" -> method,
+        "state" -> state.clone())
     }
   }
 
+  override def resume(path: String, neval: Int): this.type = {
+    super.resume(path, neval)
+    workingModels.foreach(_.copyStatus(model))
+    this
+  }
+
   private def validate(wallClockTime: Long): Unit = {
     if (validationTrigger.isEmpty || validationDataSet.isEmpty) {
       return
@@ -206,7 +229,7 @@ class LocalOptimizer[T: ClassTag] private[optim](
     workingModels.foreach(_.evaluate())
 
     var count = 0
-    dataIter.map(batch => {
+    val results = dataIter.map(batch => {
       val stackSize = batch.size() / subModelNumber
       val extraSize = batch.size() % subModelNumber
       val parallelism = if (stackSize == 0) extraSize else subModelNumber
@@ -240,9 +263,14 @@ class LocalOptimizer[T: ClassTag] private[optim](
       left.zip(right).map { case (l, r) =>
         l + r
       }
-    }).zip(vMethods).foreach(r => {
+    }).zip(vMethods)
+    results.foreach(r => {
       logger.info(s"${r._2} is ${r._1}")
     })
+    state("score") = results(0)._1.result._1
+    val scores = T()
+    results.foreach(r => scores(r._2.toString()) = r._1.result._1)
+    state("validationScores") = scores
   }
 }
 
@@ -0,0 +1,143 @@
+/*
+ * Copyright 2016 The BigDL Authors.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+package com.intel.analytics.bigdl.optim
+
+import com.intel.analytics.bigdl.Module
+import com.intel.analytics.bigdl.tensor.Tensor
+import com.intel.analytics.bigdl.tensor.TensorNumericMath.TensorNumeric
+import com.intel.analytics.bigdl.utils.File
+import org.apache.hadoop.fs.Path
+
+import scala.collection.mutable.ArrayBuffer
+import scala.reflect.ClassTag
+
+/**
+ * The parameter rows of a model changed since the previous checkpoint. A row is a slice
+ * along the first dimension of a parameter, e.g. a row of the weight of a LookupTable.
+ *
+ * @param previous postfix of the previous checkpoint, which is a full model or a delta
+ * @param indices the changed row indices (1-based) of each parameter
+ * @param rows the changed rows of each parameter, a (indices.length x rowSize) tensor
+ */
+class ModelDelta[T: ClassTag](
+  val previous: String,
+  val indices: Array[Array[Int]],
+  val rows: Array[Tensor[T]]) extends Serializable {
+
+  /**
+   * Write the changed rows into the parameters.
+   *
+   * @param parameters the parameters of the model of the previous checkpoint
+   */
+  def applyTo(parameters: Array[Tensor[T]]): Unit = {
+    require(parameters.length == indices.length,
+      s"ModelDelta: expect ${indices.length} parameters, but got ${parameters.length}")
+    var i = 0
+    while (i < parameters.length) {
+      val rowSize = ModelDelta.rowSize(parameters(i))
+      val target = parameters(i).storage().array()
+      val targetOffset = parameters(i).storageOffset() - 1
+      val source = rows(i).storage()
+      val sourceOffset = rows(i).storageOffset() - 1
+      var k = 0
+      while (k < indices(i).length) {
+        System.arraycopy(source.array(), sourceOffset + k * rowSize, target,
+          targetOffset + (indices(i)(k) - 1) * rowSize, rowSize)
+        k += 1
+      }
+      i += 1
+    }
+  }
+}
+
+object ModelDelta {
+  /**
+   * Find the parameter rows changed from last to current.
+   *
+   * @param previous postfix of the checkpoint saving last
+   * @param last the parameters of the previous checkpoint
+   * @param current the parameters of the model
+   * @return the delta
+   */
+  def apply[T: ClassTag](previous: String, last: Array[Tensor[T]], current: Array[Tensor[T]])(
+    implicit ev: TensorNumeric[T]): ModelDelta[T] = {
+    require(last.length == current.length,
+      s"ModelDelta: expect ${last.length} parameters, but got ${current.length}")
+    val indices = new Array[Array[Int]](current.length)
+    val rows = new Array[Tensor[T]](current.length)
+    var i = 0
+    while (i < current.length) {
+      require(last(i).nElement() == current(i).nElement(),
+        s"ModelDelta: the size of parameter ${i + 1} is changed")
+      val rowSize = this.rowSize(current(i))
+      val rowNum = if (rowSize == 0) 0 else current(i).nElement() / rowSize
+      val a = last(i).storage().array()
+      val aOffset = last(i).storageOffset() - 1
+      val b = current(i).storage().array()
+      val bOffset = current(i).storageOffset() - 1
+      val changed = new ArrayBuffer[Int]()
+      var r = 0
+      while (r < rowNum) {
+        var j = 0
+        while (j < rowSize && a(aOffset + r * rowSize + j) == b(bOffset + r * rowSize + j)) {
+          j += 1
+        }
+        if (j < rowSize) changed.append(r + 1)
+        r += 1
+      }
+
+      indices(i) = changed.toArray
+      rows(i) = Tensor[T](math.max(changed.length, 1), math.max(rowSize, 1))
+      var k = 0
+      while (k < changed.length) {
+        System.arraycopy(b, bOffset + (changed(k) - 1) * rowSize, rows(i).storage().array(),
+          k * rowSize, rowSize)
+        k += 1
+      }
+      i += 1
+    }
+    new ModelDelta[T](previous, indices, rows)
+  }
+
+  /**
+   * Load the model of a checkpoint written by an optimizer, which is either a full model or
+   * a delta. The delta is applied to the model of the checkpoint it's based on.
+   *
+   * @param path the checkpoint directory
+   * @param postfix postfix of the checkpoint files, e.g. ".100"
+   * @tparam T numeric type
+   * @return the model of the checkpoint
+   */
+  def loadModel[T: ClassTag](path: String, postfix: String)(
+    implicit ev: TensorNumeric[T]): Module[T] = {
+    val full = new Path(path, s"model$postfix")
+    val fs = full.getFileSystem(File.getConfiguration(path))
+    if (fs.exists(full)) {
+      Module.load[T](full.toString)
+    } else {
+      val delta = File.load[ModelDelta[T]](new Path(path, s"delta$postfix").toString)
+      val model = loadModel[T](path, delta.previous)
+      delta.applyTo(model.parameters()._1)
+      model
+    }
+  }
+
+  private def rowSize[T](parameter: Tensor[T]): Int = {
+    require(parameter.isContiguous(), "ModelDelta: parameter should be contiguous")
+    if (parameter.dim() == 0) 0 else parameter.nElement() / parameter.size(1)
+  }
+}
@@ -0,0 +1,127 @@
+/*
+ * Copyright 2016 The BigDL Authors.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+package com.intel.analytics.bigdl.optim
+
+import java.util.concurrent.atomic.AtomicBoolean
+import java.util.concurrent.{CountDownLatch, LinkedBlockingQueue, TimeUnit, TimeoutException}
+
+import com.intel.analytics.bigdl._
+import com.intel.analytics.bigdl.utils.{T, Table}
+import org.apache.log4j.Logger
+
+import scala.collection.JavaConverters._
+
+/**
+ * The handle of an optimization running in its own thread, returned by
+ * [[Optimizer.optimizeAsync]].
+ *
+ * The end trigger of the optimizer is wrapped, so the optimization stops at the next
+ * iteration once it's cancelled, and the driver state of each iteration is recorded
+ * as the progress of the optimization.
+ *
+ * @param optimizer the optimizer to run
+ * @param endWhen the end trigger of the optimizer
+ */
+class OptimizationFuture[T] private[optim](
+  optimizer: Optimizer[T, _],
+  endWhen: Trigger) {
+
+  private val cancelled = new AtomicBoolean(false)
+  private val finished = new CountDownLatch(1)
+  private val progress = new LinkedBlockingQueue[Table]()
+  @volatile private var result: Module[T] = null
+  @volatile private var error: Throwable = null
+
+  private val thread = new Thread(new Runnable {
+    override def run(): Unit = {
+      try {
+        result = optimizer.optimize()
+      } catch {
+        case t: Throwable =>
+          OptimizationFuture.logger.error("Optimization failed", t)
+          error = t
+      } finally {
+        optimizer.setEndWhen(endWhen)
+        finished.countDown()
+      }
+    }
+  }, "bigdl-optimize")
+
+  optimizer.setEndWhen(new Trigger {
+    override def apply(state: Table): Boolean = {
+      // Throughput is only there once an iteration is finished
+      if (state.contains("Throughput")) {
+        val record = T()
+        OptimizationFuture.progressKeys.foreach { key =>
+          if (state.contains(key)) record(key) = state(key)
+        }
+        progress.offer(record)
+      }
+      cancelled.get() || endWhen(state)
+    }
+  })
+  thread.setDaemon(true)
+  thread.start()
+
+  /**
+   * Stop the optimization at the next iteration.
+   *
+   * @return false if the optimization has already finished
+   */
+  def cancel(): Boolean = {
+    cancelled.set(true)
+    !isDone()
+  }
+
+  def isCancelled(): Boolean = cancelled.get()
+
+  def isDone(): Boolean = finished.getCount == 0
+
+  /**
+   * Wait for the optimization to finish.
+   *
+   * @param timeoutMs max milliseconds to wait, wait forever if it's negative
+   * @return the trained model
+   */
+  def get(timeoutMs: Long = -1): Module[T] = {
+    if (timeoutMs < 0) {
+      finished.await()
+    } else if (!finished.await(timeoutMs, TimeUnit.MILLISECONDS)) {
+      throw new TimeoutException(s"Optimization is not finished in $timeoutMs ms")
+    }
+    if (error != null) {
+      throw new RuntimeException("Optimization failed", error)
+    }
+    result
+  }
+
+  /**
+   * Take the progress recorded since last call, one table per iteration holding the
+   * epoch, neval (the next iteration), Loss, Throughput, LearningRate and score.
+   */
+  def pollProgress(): Array[Table] = {
+    val records = new java.util.ArrayList[Table]()
+    progress.drainTo(records)
+    records.asScala.toArray
+  }
+}
+
+object OptimizationFuture {
+  private val logger = Logger.getLogger(getClass)
+
+  private val progressKeys = Array("epoch", "neval", "Loss", "Throughput", "LearningRate", "score")
+}
@@ -24,6 +24,7 @@ import com.intel.analytics.bigdl.tensor.Tensor
 import com.intel.analytics.bigdl.tensor.TensorNumericMath.TensorNumeric
 import com.intel.analytics.bigdl.utils._
 import com.intel.analytics.bigdl.visualization.{TrainSummary, ValidationSummary}
+import org.apache.hadoop.fs.Path
 import org.apache.spark.rdd.RDD
 
 import scala.reflect.ClassTag
@@ -51,6 +52,9 @@ abstract class Optimizer[T: ClassTag, D](
   protected var checkpointTrigger: Option[Trigger] = None
   protected var checkpointPath: Option[String] = None
   protected var isOverWrite: Boolean = false
+  protected var isAsyncCheckpoint: Boolean = false
+  protected var checkpointKeepLast: Int = 0
+  protected var checkpointFullEvery: Int = 0
 
   protected var validationTrigger: Option[Trigger] = None
   protected var validationMethods: Option[Array[ValidationMethod[T]]] = None
@@ -72,6 +76,15 @@ abstract class Optimizer[T: ClassTag, D](
    */
   def optimize(): Module[T]
 
+  /**
+   * Trigger the optimization process in a new thread. The end trigger should not be
+   * changed before the optimization is finished.
+   * @return the handle to cancel the optimization, and get its progress and result
+   */
+  def optimizeAsync(): OptimizationFuture[T] = {
+    new OptimizationFuture[T](this, endWhen)
+  }
+
   /**
    * make optimizer not check the singleton model on a node
    * @return
@@ -170,6 +183,60 @@ abstract class Optimizer[T: ClassTag, D](
     this
   }
 
+  /**
+   * Set a check point saved at `path` triggered by `trigger`. Each checkpoint file is written
+   * to a temporary file and renamed, so a crash never leaves a partial checkpoint file.
+   *
+   * @param path the directory to save
+   * @param trigger how often to save the check point
+   * @param async if true, the model and the optim method are copied in memory and written
+   *              in a background thread while the training goes on
+   * @param keepLast only keep the latest keepLast checkpoints, keep all if it's not positive.
+   *                 If fullEvery > 1, it's the number of full checkpoints kept together
+   *                 with the delta checkpoints based on them
+   * @param fullEvery if greater than 1, the model is saved in full every fullEvery
+   *                  checkpoints, and the other checkpoints only save the parameter rows
+   *                  changed since the previous checkpoint. Use [[ModelDelta.loadModel]]
+   *                  to load the model of any checkpoint
+   * @return the optimizer
+   */
+  def setCheckpoint(path: String, trigger: Trigger, async: Boolean, keepLast: Int,
+    fullEvery: Int = 0): this.type = {
+    setCheckpoint(path, trigger)
+    this.isAsyncCheckpoint = async
+    this.checkpointKeepLast = keepLast
+    this.checkpointFullEvery = fullEvery
+    this
+  }
+
+  /**
+   * Resume the training from a checkpoint written by an optimizer. The parameters and running
+   * status of the model, the optim method with its state and learning rate schedule, and the
+   * epoch, iteration and records processed in the epoch are restored, so the learning rate
+   * and the triggers continue from where the checkpoint was written.
+   *
+   * The model given to the optimizer should have the same structure as the checkpoint model.
+   *
+   * @param path the checkpoint directory, or the directory given to setCheckpoint, whose
+   *             latest timestamped sub directory is used
+   * @param neval the iteration number of the checkpoint, the latest one if it's not positive
+   * @return the optimizer
+   */
+  def resume(path: String, neval: Int = 0): this.type = {
+    val (folder, postfix) = Optimizer.findCheckpoint(path, neval)
+    nn.Utils.copyModule(ModelDelta.loadModel[T](folder, postfix), model)
+    val fs = new Path(folder).getFileSystem(File.getConfiguration(folder))
+    val stateFile = new Path(folder, s"state$postfix")
+    if (fs.exists(stateFile)) {
+      state = T.load(stateFile.toString)
+    }
+    val methodFile = new Path(folder, s"optimMethod$postfix")
+    if (fs.exists(methodFile)) {
+      optimMethod = OptimMethod.load[T](methodFile.toString)
+    }
+    this
+  }
+
   /**
    * Get the directory of saving checkpoint
    */
@@ -271,6 +338,36 @@ object Optimizer {
     s"[Epoch $epoch $count/$total][Iteration $iter][Wall Clock ${wallClockTime / 1e9}s]"
   }
 
+  /**
+   * Find a checkpoint in path, or in the latest timestamped sub directory of path.
+   *
+   * @param path the checkpoint directory
+   * @param neval the iteration number of the checkpoint, the latest one if it's not positive
+   * @return the directory and the file name postfix of the checkpoint
+   */
+  private[optim] def findCheckpoint(path: String, neval: Int): (String, String) = {
+    val fs = new Path(path).getFileSystem(File.getConfiguration(path))
+    // the optim method or the state is the last file written in a checkpoint
+    def iterations(folder: Path): Array[Int] = fs.listStatus(folder).map(_.getPath.getName)
+      .filter(name => name.startsWith("optimMethod.") || name.startsWith("state."))
+      .map(name => name.substring(name.indexOf('.') + 1))
+      .filter(n => n.nonEmpty && n.forall(_.isDigit))
+      .map(_.toInt)
+
+    var folder = new Path(path)
+    if (iterations(folder).isEmpty) {
+      val subFolders = fs.listStatus(folder).filter(_.isDirectory).map(_.getPath)
+        .filter(iterations(_).nonEmpty)
+      require(subFolders.nonEmpty, s"Optimizer.resume: can't find any checkpoint in $path")
+      folder = subFolders.maxBy(_.getName)
+    }
+    val found = iterations(folder)
+    val iteration = if (neval > 0) neval else found.max
+    require(found.contains(iteration),
+      s"Optimizer.resume: can't find the checkpoint of iteration $iteration in $folder")
+    (folder.toString, s".$iteration")
+  }
+
   /**
    * Save a model to a directory as a checkpoint
    *
@@ -20,6 +20,7 @@ import com.intel.analytics.bigdl._
 import com.intel.analytics.bigdl.dataset.{MiniBatch, Sample, SampleToMiniBatch, Utils, DataSet => _}
 import com.intel.analytics.bigdl.models.utils.ModelBroadcast
 import com.intel.analytics.bigdl.nn.abstractnn.Activity
+import com.intel.analytics.bigdl.tensor.Tensor
 import com.intel.analytics.bigdl.tensor.TensorNumericMath.TensorNumeric
 import org.apache.spark.rdd.RDD
 
@@ -63,4 +64,26 @@ class Predictor[T: ClassTag] private[optim](
       })
     }
   }
+
+  /**
+   * Model inference in mini batches. Instead of being split into records, the output
+   * of each mini batch is kept stacked along the first dimension.
+   * @param dataSet dataset for prediction
+   * @param batchSize number of records in each mini batch, a mini batch never spans
+   *                  two partitions
+   * @return the stacked output of each mini batch
+   */
+  def predictMiniBatch(dataSet: RDD[Sample[T]], batchSize: Int): RDD[Tensor[T]] = {
+    val modelBroad = ModelBroadcast[T].broadcast(dataSet.sparkContext, model.evaluate())
+    val partitionNum = dataSet.partitions.length
+    val otherBroad = dataSet.sparkContext.broadcast(SampleToMiniBatch(
+      batchSize = batchSize * partitionNum, partitionNum = Some(partitionNum)))
+    dataSet.mapPartitions { partition =>
+      val localModel = modelBroad.value()
+      val localTransformer = otherBroad.value.cloneTransformer()
+      val miniBatch = localTransformer(partition)
+      // the output buffer is reused by the next forward
+      miniBatch.map(batch => localModel.forward(batch.getInput).toTensor[T].clone())
+    }
+  }
 }
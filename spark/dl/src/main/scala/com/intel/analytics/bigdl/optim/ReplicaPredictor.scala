@@ -0,0 +1,102 @@
+/*
+ * Copyright 2016 The BigDL Authors.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+package com.intel.analytics.bigdl.optim
+
+import java.util.concurrent.LinkedBlockingQueue
+
+import com.intel.analytics.bigdl._
+import com.intel.analytics.bigdl.nn.abstractnn.Activity
+import com.intel.analytics.bigdl.tensor.Tensor
+import com.intel.analytics.bigdl.tensor.TensorNumericMath.TensorNumeric
+import com.intel.analytics.bigdl.utils.T
+
+import scala.reflect.ClassTag
+
+object ReplicaPredictor {
+  def apply[T: ClassTag](model: Module[T], replicaNumber: Int)
+                        (implicit ev: TensorNumeric[T]): ReplicaPredictor[T] = {
+    new ReplicaPredictor[T](model, replicaNumber)
+  }
+}
+
+/**
+ * A thread-safe predictor for online serving. It holds a pool of replicas of the model,
+ * all sharing the weights of the given model. Each call to predict borrows a replica, so
+ * up to replicaNumber requests run concurrently and the others wait for a free replica.
+ *
+ * @param model the model to predict with, its weights are shared rather than copied
+ * @param replicaNumber number of replicas, i.e. the max number of concurrent requests
+ */
+class ReplicaPredictor[T: ClassTag] private[optim](model: Module[T], replicaNumber: Int)
+  (implicit ev: TensorNumeric[T]) extends Serializable {
+
+  require(replicaNumber > 0, s"replicaNumber should be larger than 0, but got $replicaNumber")
+
+  private val replicas = {
+    val pool = new LinkedBlockingQueue[Module[T]]()
+    val weights = if (model.parameters() == null) Array[Tensor[T]]() else model.parameters()._1
+    val sharedWeights = weights.map(w => if (w == null) null else Tensor[T]().set(w))
+    // Clear the weights so they are not serialized into every replica
+    weights.foreach(w => if (w != null) w.set())
+    try {
+      (1 to replicaNumber).foreach { _ =>
+        val replica = model.cloneModule().evaluate()
+        if (replica.parameters() != null) {
+          val (replicaWeights, replicaGrads) = replica.parameters()
+          var i = 0
+          while (i < replicaWeights.length) {
+            if (replicaWeights(i) != null) replicaWeights(i).set(sharedWeights(i))
+            if (replicaGrads(i) != null) replicaGrads(i).set()
+            i += 1
+          }
+        }
+        pool.put(replica)
+      }
+    } finally {
+      weights.zip(sharedWeights).foreach { case (w, shared) =>
+        if (w != null) w.set(shared)
+      }
+    }
+    pool
+  }
+
+  /**
+   * Forward the input with a free replica, block until one is available.
+   * @param input a record or a mini batch
+   * @return a copy of the model output, which is not changed by later requests
+   */
+  def predict(input: Activity): Activity = {
+    val replica = replicas.take()
+    try {
+      copyOutput(replica.forward(input))
+    } finally {
+      replicas.put(replica)
+    }
+  }
+
+  private def copyOutput(output: Activity): Activity = {
+    if (output.isTensor) {
+      output.toTensor[T].clone()
+    } else {
+      val result = T()
+      output.toTable.foreach { case (key, value) =>
+        result(key) = copyOutput(value.asInstanceOf[Activity])
+      }
+      result
+    }
+  }
+}
@@ -123,5 +123,109 @@ object Trigger {
       }
     }
   }
-}
 
+  /**
+   * A trigger contains other triggers and triggers when all of them trigger (logical AND).
+   * All the triggers are evaluated each time, so the state kept by them is up to date.
+   *
+   * For example, Trigger.and(Trigger.minLoss(0.1f), Trigger.maxEpoch(5)) stops the training
+   * once the loss is less than 0.1 and at least 5 epochs are finished.
+   *
+   * @param first first trigger
+   * @param others other triggers
+   */
+  def and(first: Trigger, others: Trigger*): Trigger = {
+    new Trigger() {
+      override def apply(state: Table): Boolean = {
+        (first +: others).map(_(state)).forall(identity)
+      }
+    }
+  }
+
+  /**
+   * A trigger contains other triggers and triggers when any of them triggers (logical OR).
+   * All the triggers are evaluated each time, so the state kept by them is up to date.
+   *
+   * For example, Trigger.or(Trigger.patience(3), Trigger.maxEpoch(50)) stops the training
+   * after 50 epochs, or earlier when the validation score stops improving.
+   *
+   * @param first first trigger
+   * @param others other triggers
+   */
+  def or(first: Trigger, others: Trigger*): Trigger = {
+    new Trigger() {
+      override def apply(state: Table): Boolean = {
+        (first +: others).map(_(state)).exists(identity)
+      }
+    }
+  }
+
+  /**
+   * The prefix of the keys that the triggers keep their state under in the optimizer state,
+   * so the state is saved in the checkpoints and restored by Optimizer.resume.
+   */
+  private[optim] val statePrefix = "trigger."
+
+  /**
+   * Copy the state kept by the triggers from one state table to another.
+   */
+  private[optim] def copyState(from: Table, to: Table): Unit = {
+    from.keySet.foreach {
+      case key: String if key.startsWith(statePrefix) => to(key) = from(key)
+      case _ =>
+    }
+  }
+
+  /**
+   * A trigger that triggers an action when a validation metric has not improved for
+   * "patience" validations. It only counts the validations set by Optimizer.setValidation,
+   * and is usually used in Optimizer.setEndWhen to stop the training early.
+   *
+   * The best metric and the count of validations without improvement are kept in the
+   * optimizer state under keys derived from the metric, so a training resumed from a
+   * checkpoint goes on counting from where it stopped.
+   *
+   * @param patience number of validations without improvement before triggering
+   * @param metric "score" for the first validation method, or the name of a validation
+   *               method, e.g. "Top1Accuracy" or "Loss"
+   * @param minDelta minimum change of the metric counted as an improvement
+   * @param mode "max" if a larger metric is better, "min" if a smaller one is better
+   */
+  def patience(patience: Int, metric: String = "score", minDelta: Float = 0f,
+    mode: String = "max"): Trigger = {
+    require(patience > 0, s"Patience: patience should be positive, but got $patience")
+    require(mode == "max" || mode == "min", s"Patience: unknown mode $mode")
+    val prefix = s"${statePrefix}patience.$metric"
+    new Trigger() {
+      override def apply(state: Table): Boolean = {
+        // each validation sets a new table of scores, the last one counted is kept in the
+        // state too, so it isn't counted again after the state is restored
+        val scores = state.get[Table]("validationScores")
+        if (scores.isEmpty || state.get[Table](s"$prefix.scores").exists(_ eq scores.get)) {
+          return false
+        }
+        val lastScores = scores.get
+        state(s"$prefix.scores") = lastScores
+        val value = if (metric == "score") {
+          state[Float]("score")
+        } else {
+          require(lastScores.contains(metric),
+            s"Patience: unknown metric $metric, the validation methods are " +
+              lastScores.keySet.mkString(", "))
+          lastScores[Float](metric)
+        }
+        val best = state.get[Float](s"$prefix.best").getOrElse(
+          if (mode == "max") Float.NegativeInfinity else Float.PositiveInfinity)
+        val improved = if (mode == "max") value > best + minDelta else value < best - minDelta
+        val wait = if (improved) {
+          state(s"$prefix.best") = value
+          0
+        } else {
+          state.get[Int](s"$prefix.wait").getOrElse(0) + 1
+        }
+        state(s"$prefix.wait") = wait
+        wait >= patience
+      }
+    }
+  }
+}
@@ -19,9 +19,10 @@
 package org.apache.spark.bigdl.api.python
 
 import java.io.OutputStream
+import java.nio.{ByteBuffer, ByteOrder}
 import java.util.{ArrayList => JArrayList, HashMap => JHashMap, List => JList, Map => JMap}
 
-import com.intel.analytics.bigdl.python.api.{JTensor, Sample, TestResult}
+import com.intel.analytics.bigdl.python.api.{JTensor, Sample, SampleBlock, TestResult}
 import net.razorvine.pickle._
 import org.apache.spark.api.java.JavaRDD
 import org.apache.spark.api.python.SerDeUtil
@@ -85,6 +86,10 @@ private[spark] abstract class BigDLSerDeBase {
         } else {
           Seq(obj)
         }
+      }.flatMap {
+        // a block of records is shipped as a whole and expanded here
+        case block: SampleBlock => block.toSamples()
+        case obj => Iterator.single(obj)
       }
     }.toJavaRDD()
   }
@@ -153,28 +158,120 @@ object BigDLSerDe extends BigDLSerDeBase with Serializable {
       }
     }
 
+    /**
+     * Write `bytes` as a python byte string, so python side could wrap it
+     * by numpy.frombuffer without unpickling every element.
+     */
+    protected def saveBytes(out: OutputStream, bytes: Array[Byte]): Unit = {
+      out.write(Opcodes.BINSTRING)
+      out.write(PickleUtils.integer_to_bytes(bytes.length))
+      out.write(bytes)
+    }
+
+    /**
+     * Convert an unpickled storage, either a raw buffer or a list of numbers
+     * from older python clients, into a primitive array of `bigdlType`.
+     */
+    protected def objToStorage(obj: Object, bigdlType: String): Array[_] = {
+      // Only allow float and double for now same as Tensor
+      obj match {
+        case list: JArrayList[_] =>
+          val rawStorage = list.asInstanceOf[JArrayList[Double]].asScala
+          bigdlType match {
+            case "float" => rawStorage.map(_.toFloat).toArray
+            case "double" => rawStorage.toArray
+            case _ => throw new IllegalArgumentException("Only support float and double for now")
+          }
+        case raw => bytesToStorage(getBytes(raw), bigdlType)
+      }
+    }
+
     private[python] def saveState(obj: Object, out: OutputStream, pickler: Pickler)
   }
 
+  /**
+   * Encode a primitive storage array into a little-endian byte buffer.
+   */
+  private[python] def storageToBytes(storage: Array[_]): Array[Byte] = {
+    storage match {
+      case floats: Array[Float] =>
+        val bytes = new Array[Byte](4 * floats.length)
+        ByteBuffer.wrap(bytes).order(ByteOrder.LITTLE_ENDIAN).asFloatBuffer().put(floats)
+        bytes
+      case doubles: Array[Double] =>
+        val bytes = new Array[Byte](8 * doubles.length)
+        ByteBuffer.wrap(bytes).order(ByteOrder.LITTLE_ENDIAN).asDoubleBuffer().put(doubles)
+        bytes
+      case _ => throw new IllegalArgumentException("Only support float and double for now")
+    }
+  }
+
+  /**
+   * Decode a little-endian byte buffer into a primitive storage array of `bigdlType`.
+   */
+  private[python] def bytesToStorage(bytes: Array[Byte], bigdlType: String): Array[_] = {
+    bigdlType match {
+      case "float" =>
+        val floats = new Array[Float](bytes.length / 4)
+        ByteBuffer.wrap(bytes).order(ByteOrder.LITTLE_ENDIAN).asFloatBuffer().get(floats)
+        floats
+      case "double" =>
+        val doubles = new Array[Double](bytes.length / 8)
+        ByteBuffer.wrap(bytes).order(ByteOrder.LITTLE_ENDIAN).asDoubleBuffer().get(doubles)
+        doubles
+      case _ => throw new IllegalArgumentException("Only support float and double for now")
+    }
+  }
+
   private[python] class SamplePickler extends BigDLBasePickler[Sample] {
 
     def saveState(obj: Object, out: OutputStream, pickler: Pickler): Unit = {
       val record = obj.asInstanceOf[Sample]
-      saveObjects(out,
-        pickler,
-        record.features,
-        record.label, record.featuresShape, record.labelShape)
+      out.write(Opcodes.MARK)
+      saveBytes(out, storageToBytes(record.features))
+      saveBytes(out, storageToBytes(record.label))
+      pickler.save(record.featuresShape)
+      pickler.save(record.labelShape)
+      pickler.save(record.bigdlType)
+      out.write(Opcodes.TUPLE)
+    }
+
+    def construct(args: Array[Object]): Object = {
+      if (args.length != 5) {
+        throw new PickleException("should be 5, not : " + args.length)
+      }
+      val bigdlType = args(4).asInstanceOf[String]
+      new Sample(objToStorage(args(0), bigdlType),
+        objToStorage(args(1), bigdlType),
+        args(2).asInstanceOf[JArrayList[Int]],
+        args(3).asInstanceOf[JArrayList[Int]],
+        bigdlType)
+    }
+  }
+
+  private[python] class SampleBlockPickler extends BigDLBasePickler[SampleBlock] {
+
+    def saveState(obj: Object, out: OutputStream, pickler: Pickler): Unit = {
+      val block = obj.asInstanceOf[SampleBlock]
+      out.write(Opcodes.MARK)
+      saveBytes(out, storageToBytes(block.features))
+      saveBytes(out, storageToBytes(block.labels))
+      pickler.save(block.featuresShape)
+      pickler.save(block.labelsShape)
+      pickler.save(block.bigdlType)
+      out.write(Opcodes.TUPLE)
     }
 
     def construct(args: Array[Object]): Object = {
       if (args.length != 5) {
         throw new PickleException("should be 5, not : " + args.length)
       }
-      new Sample(args(0).asInstanceOf[JArrayList[Any]],
-        args(1).asInstanceOf[JArrayList[Any]],
+      val bigdlType = args(4).asInstanceOf[String]
+      new SampleBlock(objToStorage(args(0), bigdlType),
+        objToStorage(args(1), bigdlType),
         args(2).asInstanceOf[JArrayList[Int]],
         args(3).asInstanceOf[JArrayList[Int]],
-        args(4).asInstanceOf[String])
+        bigdlType)
     }
   }
 
@@ -201,11 +298,11 @@ object BigDLSerDe extends BigDLSerDeBase with Serializable {
   private[python] class JTensorPickler extends BigDLBasePickler[JTensor] {
 
     def saveState(obj: Object, out: OutputStream, pickler: Pickler): Unit = {
-      val testResult = obj.asInstanceOf[JTensor]
-      saveObjects(out,
-        pickler,
-        testResult.storage,
-        testResult.shape, testResult.bigdlType)
+      val jTensor = obj.asInstanceOf[JTensor]
+      saveBytes(out, storageToBytes(jTensor.storage))
+      pickler.save(jTensor.shape)
+      pickler.save(jTensor.bigdlType)
+      out.write(Opcodes.TUPLE3)
     }
 
     def construct(args: Array[Object]): Object = {
@@ -213,16 +310,7 @@ object BigDLSerDe extends BigDLSerDeBase with Serializable {
         throw new PickleException("should be 3, not : " + args.length)
       }
       val bigdl_type = args(2).asInstanceOf[String]
-      // Only allow float and double for now same as Tensor
-      val rawStorage = args(0).asInstanceOf[JArrayList[Double]].asScala
-      val storage = bigdl_type match {
-        case "float" =>
-          rawStorage.map(_.toFloat).toList.asJava
-        case "double" =>
-          rawStorage.toList.asJava
-        case _ => throw new IllegalArgumentException("Only support float and double for now")
-      }
-      new JTensor(storage.asInstanceOf[JList[Any]],
+      new JTensor(objToStorage(args(0), bigdl_type),
         args(1).asInstanceOf[JArrayList[Int]],
         bigdl_type)
     }
@@ -235,6 +323,7 @@ object BigDLSerDe extends BigDLSerDeBase with Serializable {
       if (!initialized) {
         SerDe.initialize()
         new SamplePickler().register()
+        new SampleBlockPickler().register()
         new TestResultPickler().register()
         new JTensorPickler().register()
         initialized = true
@@ -30,7 +30,10 @@ import com.intel.analytics.bigdl.utils.{Table, _}
 import com.intel.analytics.bigdl.visualization.{Summary, TrainSummary, ValidationSummary}
 import com.intel.analytics.bigdl.nn.Zeros
 import org.apache.spark.api.java.JavaRDD
+import org.apache.spark.ml.MLVector
+import org.apache.spark.mllib.linalg.Vector
 import org.apache.spark.rdd.RDD
+import org.apache.spark.sql.DataFrame
 import java.lang.{Integer, Boolean => JBoolean}
 import java.nio.ByteOrder
 
@@ -43,20 +46,78 @@ import scala.language.existentials
 import scala.reflect.ClassTag
 
 /**
- * [[com.intel.analytics.bigdl.dataset.Sample]] for python.
+ * [[com.intel.analytics.bigdl.dataset.Sample]] for python. Same as [[JTensor]],
+ * features and label are primitive arrays exchanged as raw little-endian buffers.
  * @param features features
  * @param label labels
  * @param featuresShape feature size
  * @param labelShape label size
  * @param bigdlType bigdl numeric type
  */
-case class Sample(features: JList[Any],
-                  label: JList[Any],
+case class Sample(features: Array[_],
+                  label: Array[_],
                   featuresShape: JList[Int],
                   labelShape: JList[Int],
                   bigdlType: String)
 
-case class JTensor(storage: JList[Any], shape: JList[Int], bigdlType: String)
+/**
+ * A block of [[Sample]]s for python, the leading dimension of both shapes is the
+ * number of records. The whole block is shipped as one buffer for the features and
+ * one for the labels, and is expanded into records when it reaches the JVM.
+ * @param features features of all the records
+ * @param labels labels of all the records
+ * @param featuresShape features block size, i.e. (records, feature size...)
+ * @param labelsShape labels block size, i.e. (records, label size...)
+ * @param bigdlType bigdl numeric type
+ */
+case class SampleBlock(features: Array[_],
+                       labels: Array[_],
+                       featuresShape: JList[Int],
+                       labelsShape: JList[Int],
+                       bigdlType: String) {
+
+  def toSamples(): Iterator[Sample] = {
+    val records = featuresShape.get(0)
+    require(labelsShape.get(0) == records,
+      s"features and labels should have the same number of records, " +
+        s"but got ${records} and ${labelsShape.get(0)}")
+    val featureShape = recordShape(featuresShape)
+    val labelShape = recordShape(labelsShape)
+    val featureSize = if (records == 0) 0 else features.length / records
+    val labelSize = if (records == 0) 0 else labels.length / records
+    (0 until records).iterator.map { i =>
+      Sample(slice(features, i * featureSize, featureSize),
+        slice(labels, i * labelSize, labelSize),
+        featureShape, labelShape, bigdlType)
+    }
+  }
+
+  private def recordShape(blockShape: JList[Int]): JList[Int] = {
+    if (blockShape.size() > 1) {
+      new JArrayList[Int](blockShape.subList(1, blockShape.size()))
+    } else {
+      java.util.Arrays.asList(1)
+    }
+  }
+
+  private def slice(storage: Array[_], offset: Int, length: Int): Array[_] = {
+    storage match {
+      case floats: Array[Float] => java.util.Arrays.copyOfRange(floats, offset, offset + length)
+      case doubles: Array[Double] => java.util.Arrays.copyOfRange(doubles, offset, offset + length)
+      case _ => throw new IllegalArgumentException("Only support float and double for now")
+    }
+  }
+}
+
+/**
+ * [[Tensor]] for python. The storage is a primitive array, i.e. Array[Float] for "float"
+ * and Array[Double] for "double", which is exchanged with python as a raw
+ * little-endian buffer rather than a list of boxed numbers.
+ * @param storage flat primitive array holding the tensor elements
+ * @param shape tensor shape
+ * @param bigdlType bigdl numeric type
+ */
+case class JTensor(storage: Array[_], shape: JList[Int], bigdlType: String)
 
 /**
  * [[ValidationResult]] for python
@@ -109,20 +170,33 @@ class PythonBigDL[T: ClassTag](implicit ev: TensorNumeric[T]) extends Serializab
   }
 
   def toPySample(sample: JSample[T]): Sample = {
-    val featureList = sample.feature().contiguous().storage().toArray[T].toList.asJava
-    val labelList = sample.label().contiguous().storage().toArray[T].toList.asJava
-    val cls = implicitly[ClassTag[T]].runtimeClass
-    Sample(featureList.asInstanceOf[JList[Any]],
-      labelList.asInstanceOf[JList[Any]],
-      sample.feature().size().toList.asJava,
-      sample.label().size().toList.asJava,
-      cls.getSimpleName)
+    // clone to get a compact storage holding only the feature or the label
+    val feature = sample.feature().clone()
+    val label = sample.label().clone()
+    Sample(feature.storage().array(),
+      label.storage().array(),
+      feature.size().toList.asJava,
+      label.size().toList.asJava,
+      typeName)
+  }
+
+  private def toStorageArray(jTensor: JTensor): Array[T] = {
+    if (jTensor.bigdlType == typeName) {
+      jTensor.storage.asInstanceOf[Array[T]]
+    } else {
+      jTensor.storage match {
+        case floats: Array[Float] => floats.map(ev.fromType[Float](_))
+        case doubles: Array[Double] => doubles.map(ev.fromType[Double](_))
+        case _ => throw new IllegalArgumentException(
+          s"Not supported type: ${jTensor.bigdlType}")
+      }
+    }
   }
 
   def toTensor(jTensor: JTensor): Tensor[T] = {
     if (jTensor == null) null else {
-      Tensor(jTensor.storage.asScala.map(_.asInstanceOf[T]).toArray,
-        jTensor.shape.asScala.toArray)
+      // wrap the decoded buffer directly, no element-wise copy
+      Tensor(toStorageArray(jTensor), jTensor.shape.asScala.toArray)
     }
   }
 
@@ -130,8 +204,12 @@ class PythonBigDL[T: ClassTag](implicit ev: TensorNumeric[T]) extends Serializab
     // clone here in case the the size of storage larger then the size of tensor.
     require(tensor != null, "tensor cannot be null")
     val cloneTensor = tensor.clone()
-    JTensor(cloneTensor.storage().toList.map(_.asInstanceOf[Any]).asJava,
-      cloneTensor.size().toList.asJava, typeName)
+    val storage = if (cloneTensor.nElement() == 0) {
+      new Array[T](0)
+    } else {
+      cloneTensor.storage().array()
+    }
+    JTensor(storage, cloneTensor.size().toList.asJava, typeName)
   }
 
   def testTensor(jTensor: JTensor): JTensor = {
@@ -142,40 +220,74 @@ class PythonBigDL[T: ClassTag](implicit ev: TensorNumeric[T]) extends Serializab
   def toSample(record: Sample): JSample[T] = {
     require(record.bigdlType == this.typeName,
       s"record.bigdlType: ${record.bigdlType} == this.typeName: ${this.typeName}")
-    val sample = this.typeName match {
-      case "float" =>
-        val feature = Tensor[Float](Storage[Float](
-          record.features.asInstanceOf[JList[Double]].asScala.map(_.toFloat).toArray[Float]),
-          1,
-          record.featuresShape.asScala.toArray[Int])
-        val label = Tensor[Float](
-          Storage(record.label.asInstanceOf[JList[Double]].asScala.map(_.toFloat).toArray[Float]),
-          1,
-          record.labelShape.asScala.toArray[Int])
-        JSample[Float](feature, label)
-      case "double" =>
-        val feature = Tensor[Double](Storage[Double](
-          record.features.asInstanceOf[JList[Double]].asScala.toArray[Double]),
-          1,
-          record.featuresShape.asScala.toArray[Int])
-        val label = Tensor[Double](
-          Storage(record.label.asInstanceOf[JList[Double]].asScala.toArray[Double]),
-          1,
-          record.labelShape.asScala.toArray[Int])
-        JSample[Double](feature, label)
-      case t: String =>
-        throw new IllegalArgumentException(s"Not supported type: ${t}")
-    }
-    sample.asInstanceOf[JSample[T]]
+    val feature = Tensor[T](record.features.asInstanceOf[Array[T]],
+      record.featuresShape.asScala.toArray[Int])
+    val label = Tensor[T](record.label.asInstanceOf[Array[T]],
+      record.labelShape.asScala.toArray[Int])
+    JSample[T](feature, label)
   }
 
   private def batching(rdd: RDD[Sample], batchSize: Int)
   : DistributedDataSet[MiniBatch[T]] = {
-    val recordRDD = rdd.map(toSample(_))
+    samplesBatching(rdd.map(toSample(_)), batchSize)
+  }
+
+  private def samplesBatching(recordRDD: RDD[JSample[T]], batchSize: Int)
+  : DistributedDataSet[MiniBatch[T]] = {
     (DataSet.rdd(recordRDD) -> SampleToMiniBatch[T](batchSize))
       .asInstanceOf[DistributedDataSet[MiniBatch[T]]]
   }
 
+  private def columnIndex(df: DataFrame, column: String): Int = {
+    val index = df.schema.fieldNames.indexOf(column)
+    require(index >= 0, s"Column $column is not in ${df.schema.fieldNames.mkString(", ")}")
+    index
+  }
+
+  private def columnToArray(value: Any, column: String): Array[T] = {
+    value match {
+      case seq: Seq[_] => seq.map(v => ev.fromType[Double](v.asInstanceOf[Number].doubleValue()))
+        .toArray
+      case vector: Vector => vector.toArray.map(ev.fromType[Double](_))
+      case MLVector(values) => values.map(ev.fromType[Double](_))
+      case number: Number => Array(ev.fromType[Double](number.doubleValue()))
+      case _ => throw new IllegalArgumentException(
+        s"Column $column should be a numeric array, a vector or a number, but got $value")
+    }
+  }
+
+  /**
+   * Convert the rows of a DataFrame into Samples inside the JVM, without going through
+   * python. The feature and label columns could be numeric arrays,
+   * mllib or ml vectors or numbers.
+   * @param df the DataFrame
+   * @param featuresCol name of the feature column
+   * @param labelCol name of the label column, null if there is no label i.e. for prediction
+   * @param featureShape shape of a feature, null or empty to keep it flat
+   */
+  private def dataFrameToSample(df: DataFrame,
+                                featuresCol: String,
+                                labelCol: String,
+                                featureShape: JList[Int]): RDD[JSample[T]] = {
+    val featureIndex = columnIndex(df, featuresCol)
+    val labelIndex = if (labelCol == null) -1 else columnIndex(df, labelCol)
+    val shape = if (featureShape == null || featureShape.isEmpty) {
+      null
+    } else {
+      featureShape.asScala.toArray
+    }
+    df.rdd.map { row =>
+      val features = columnToArray(row.get(featureIndex), featuresCol)
+      val label = if (labelIndex < 0) {
+        Array(ev.zero)
+      } else {
+        columnToArray(row.get(labelIndex), labelCol)
+      }
+      JSample[T](Tensor(features, if (shape == null) Array(features.length) else shape),
+        Tensor(label, Array(label.length)))
+    }
+  }
+
   def createSequential(): Sequential[T] = {
     Sequential[T]()
   }
@@ -1419,10 +1531,34 @@ class PythonBigDL[T: ClassTag](implicit ev: TensorNumeric[T]) extends Serializab
     testResultArray.toList.asJava
   }
 
+  def modelTestDataFrame(model: AbstractModule[Activity, Activity, T],
+                         df: DataFrame,
+                         featuresCol: String,
+                         labelCol: String,
+                         featureShape: JList[Int],
+                         batchSize: Int,
+                         valMethods: JList[ValidationMethod[T]])
+  : JList[TestResult] = {
+    val resultArray = model.evaluate(dataFrameToSample(df, featuresCol, labelCol, featureShape),
+      valMethods.asScala.toArray, Some(batchSize))
+    resultArray.map { result =>
+      TestResult(result._1.result()._1, result._1.result()._2,
+        result._2.toString())
+    }.toList.asJava
+  }
+
   def loadBigDL(path: String): AbstractModule[Activity, Activity, T] = {
     Module.load[T](path)
   }
 
+  def loadSnapshot(path: String): AbstractModule[Activity, Activity, T] = {
+    Module.loadSnapshot[T](path)
+  }
+
+  def loadCheckpointModel(path: String, neval: Int): AbstractModule[Activity, Activity, T] = {
+    ModelDelta.loadModel[T](path, s".$neval")
+  }
+
   def loadTorch(path: String): AbstractModule[Activity, Activity, T] = {
     Module.loadTorch[T](path)
   }
@@ -1485,12 +1621,48 @@ class PythonBigDL[T: ClassTag](implicit ev: TensorNumeric[T]) extends Serializab
     new JavaRDD[JTensor](listRDD)
   }
 
+  def modelPredictDataFrame(model: AbstractModule[Activity, Activity, T],
+                            df: DataFrame,
+                            featuresCol: String,
+                            featureShape: JList[Int]): JavaRDD[JTensor] = {
+    val tensorRDD = model.predict(dataFrameToSample(df, featuresCol, null, featureShape))
+    new JavaRDD[JTensor](tensorRDD.map(res => toJTensor(res.asInstanceOf[Tensor[T]])))
+  }
+
+  def modelPredictBatches(model: AbstractModule[Activity, Activity, T],
+                          dataRdd: JavaRDD[Sample],
+                          batchSize: Int): JavaRDD[JTensor] = {
+    val tensorRDD = Predictor(model).predictMiniBatch(dataRdd.rdd.map(toSample(_)), batchSize)
+    new JavaRDD[JTensor](tensorRDD.map(toJTensor(_)))
+  }
+
+  def modelPredictBatchesDataFrame(model: AbstractModule[Activity, Activity, T],
+                                   df: DataFrame,
+                                   featuresCol: String,
+                                   featureShape: JList[Int],
+                                   batchSize: Int): JavaRDD[JTensor] = {
+    val tensorRDD = Predictor(model).predictMiniBatch(
+      dataFrameToSample(df, featuresCol, null, featureShape), batchSize)
+    new JavaRDD[JTensor](tensorRDD.map(toJTensor(_)))
+  }
+
   def modelPredictClass(model: AbstractModule[Activity, Activity, T],
                       dataRdd: JavaRDD[Sample]): JavaRDD[Int] = {
     val tensorRDD = model.predictClass(dataRdd.rdd.map(toSample(_)))
     new JavaRDD[Int](tensorRDD)
   }
 
+  def createReplicaPredictor(model: AbstractModule[Activity, Activity, T],
+                             replicaNumber: Int): ReplicaPredictor[T] = {
+    ReplicaPredictor[T](model, replicaNumber)
+  }
+
+  def replicaPredict(predictor: ReplicaPredictor[T],
+                     input: JList[JTensor],
+                     inputIsTable: Boolean): JList[JTensor] = {
+    activityToJTensors(predictor.predict(jTensorsToActivity(input, inputIsTable)))
+  }
+
   def modelForward(model: AbstractModule[Activity, Activity, T],
                    input: JList[JTensor],
                    inputIsTable: Boolean): JList[JTensor] = {
@@ -1510,12 +1682,75 @@ class PythonBigDL[T: ClassTag](implicit ev: TensorNumeric[T]) extends Serializab
     activityToJTensors(outputActivity)
   }
 
+  /**
+   * Run `body` on every mini-batch of at most `batchSize` records along the first
+   * dimension of `input`, and stack the per mini-batch results into one tensor.
+   */
+  private def mapMiniBatches(input: Tensor[T], batchSize: Int)
+    (body: (Tensor[T], Int, Int) => Tensor[T]): Tensor[T] = {
+    require(batchSize > 0, s"batchSize should be positive, but got $batchSize")
+    val total = input.size(1)
+    var result: Tensor[T] = null
+    var offset = 1
+    while (offset <= total) {
+      val length = math.min(batchSize, total - offset + 1)
+      val batchResult = body(input.narrow(1, offset, length), offset, length)
+      if (result == null) {
+        val size = batchResult.size()
+        size(0) = total
+        result = Tensor[T](size)
+      }
+      result.narrow(1, offset, length).copy(batchResult)
+      offset += length
+    }
+    result
+  }
+
+  private def stackedToJTensor(tensor: Tensor[T]): JTensor = {
+    // the stacked tensor is freshly allocated and compact, no need to clone it
+    JTensor(tensor.storage().array(), tensor.size().toList.asJava, typeName)
+  }
+
+  /**
+   * Forward a stacked batch of records in mini-batches of `batchSize`.
+   * The whole batch is transferred in and out as one JTensor.
+   */
+  def modelForwardBatch(model: AbstractModule[Activity, Activity, T],
+                        input: JTensor,
+                        batchSize: Int): JTensor = {
+    val output = mapMiniBatches(toTensor(input), batchSize) { (batch, _, _) =>
+      model.forward(batch).toTensor[T]
+    }
+    stackedToJTensor(output)
+  }
+
+  /**
+   * Forward and backward a stacked batch of records in mini-batches of `batchSize`.
+   * Gradients of the parameters are accumulated over the whole batch.
+   */
+  def modelBackwardBatch(model: AbstractModule[Activity, Activity, T],
+                         input: JTensor,
+                         gradOutput: JTensor,
+                         batchSize: Int): JTensor = {
+    val gradOutputTensor = toTensor(gradOutput)
+    val gradInput = mapMiniBatches(toTensor(input), batchSize) { (batch, offset, length) =>
+      model.forward(batch)
+      model.backward(batch, gradOutputTensor.narrow(1, offset, length)).toTensor[T]
+    }
+    stackedToJTensor(gradInput)
+  }
+
 
   def modelSave(module: AbstractModule[Activity, Activity, T],
                 path: String, overWrite: Boolean): Unit = {
     module.save(path, overWrite)
   }
 
+  def modelSaveSnapshot(module: AbstractModule[Activity, Activity, T],
+                        path: String, overWrite: Boolean): Unit = {
+    module.saveSnapshot(path, overWrite)
+  }
+
   def saveCaffe(module: AbstractModule[Activity, Activity, T],
     prototxtPath: String, modelPath: String,
     useV2 : Boolean = true, overwrite : Boolean = false): Unit = {
@@ -1544,19 +1779,69 @@ class PythonBigDL[T: ClassTag](implicit ev: TensorNumeric[T]) extends Serializab
   }
 
   def modelGetParameters(model: AbstractModule[Activity, Activity, T])
-  : JMap[Any, JMap[Any, JList[JList[Any]]]] = {
+  : JMap[Any, JMap[Any, JTensor]] = {
     model.getParametersTable().getState().mapValues {
       case name2Values: Table =>
         name2Values.getState().mapValues {
-          case t: Tensor[T] =>
-            val tensorClone = t.clone()
-            val item = List(tensorClone.storage().toList.asJava.asInstanceOf[JList[Any]],
-              tensorClone.size().toList.asJava.asInstanceOf[JList[Any]]).asJava
-            item
+          case t: Tensor[T] => toJTensor(t)
         }.asJava
     }.asJava
   }
 
+  /**
+   * Copy all the weights and biases of the model into one flat tensor, in the order of
+   * model.parameters(). The second element is the shape of each weight or bias.
+   */
+  def modelGetFlatWeights(model: AbstractModule[Activity, Activity, T]): JList[Any] = {
+    val weights = if (model.parameters() == null) Array[Tensor[T]]() else model.parameters()._1
+    val flat = new Array[T](weights.map(_.nElement()).sum)
+    val flatTensor = Tensor[T](flat, Array(flat.length))
+    var offset = 0
+    weights.foreach { w =>
+      if (w.nElement() > 0) {
+        flatTensor.narrow(1, offset + 1, w.nElement()).copy(w.contiguous().view(w.nElement()))
+      }
+      offset += w.nElement()
+    }
+    List[Any](JTensor(flat, List(flat.length).asJava, typeName),
+      weights.map(_.size().toList.asJava).toList.asJava).asJava
+  }
+
+  /**
+   * Set all the weights and biases of the model from one flat tensor in the layout of
+   * modelGetFlatWeights.
+   */
+  def modelSetFlatWeights(model: AbstractModule[Activity, Activity, T],
+                          flatWeights: JTensor): Unit = {
+    val weights = if (model.parameters() == null) Array[Tensor[T]]() else model.parameters()._1
+    val flatTensor = toTensor(flatWeights)
+    val total = weights.map(_.nElement()).sum
+    require(flatTensor.nElement() == total,
+      s"the model has $total weights, but got ${flatTensor.nElement()}")
+    var offset = 0
+    weights.foreach { w =>
+      if (w.nElement() > 0) {
+        w.copy(flatTensor.narrow(1, offset + 1, w.nElement()).view(w.size()))
+      }
+      offset += w.nElement()
+    }
+  }
+
+  /**
+   * The forward time and backward time in seconds, forward calls and backward calls of
+   * each module in getTimes(), keyed by the module name.
+   */
+  def modelGetTimes(model: AbstractModule[Activity, Activity, T]): JMap[String, JList[Any]] = {
+    val times = new scala.collection.mutable.LinkedHashMap[String, (Long, Long, Long, Long)]()
+    model.getTimes().zip(model.getProfile()).foreach { case ((module, _, _), (f, b, fc, bc)) =>
+      val (f0, b0, fc0, bc0) = times.getOrElse(module.getName(), (0L, 0L, 0L, 0L))
+      times(module.getName()) = (f0 + f, b0 + b, fc0 + fc, bc0 + bc)
+    }
+    times.map { case (name, (f, b, fc, bc)) =>
+      name -> List[Any](f / 1e9, b / 1e9, fc, bc).asJava
+    }.asJava
+  }
+
   def createMaxEpoch(max: Int): Trigger = {
     Trigger.maxEpoch(max)
   }
@@ -1581,6 +1866,18 @@ class PythonBigDL[T: ClassTag](implicit ev: TensorNumeric[T]) extends Serializab
     Trigger.minLoss(min)
   }
 
+  def createTriggerAnd(first: Trigger, others: JList[Trigger]): Trigger = {
+    Trigger.and(first, others.asScala: _*)
+  }
+
+  def createTriggerOr(first: Trigger, others: JList[Trigger]): Trigger = {
+    Trigger.or(first, others.asScala: _*)
+  }
+
+  def createPatience(patience: Int, metric: String, minDelta: Float, mode: String): Trigger = {
+    Trigger.patience(patience, metric, minDelta, mode)
+  }
+
   def createTop1Accuracy(): ValidationMethod[T] = {
     new Top1Accuracy()
   }
@@ -1681,9 +1978,32 @@ class PythonBigDL[T: ClassTag](implicit ev: TensorNumeric[T]) extends Serializab
                       optimMethod: OptimMethod[T],
                       endTrigger: Trigger,
                       batchSize: Int): Optimizer[T, MiniBatch[T]] = {
+    createDistriOptimizer(model, batching(trainingRdd, batchSize), criterion,
+      optimMethod, endTrigger)
+  }
+
+  def createOptimizerFromDataFrame(model: AbstractModule[Activity, Activity, T],
+                                   trainingDF: DataFrame,
+                                   featuresCol: String,
+                                   labelCol: String,
+                                   featureShape: JList[Int],
+                                   criterion: Criterion[T],
+                                   optimMethod: OptimMethod[T],
+                                   endTrigger: Trigger,
+                                   batchSize: Int): Optimizer[T, MiniBatch[T]] = {
+    val dataset = samplesBatching(
+      dataFrameToSample(trainingDF, featuresCol, labelCol, featureShape), batchSize)
+    createDistriOptimizer(model, dataset, criterion, optimMethod, endTrigger)
+  }
+
+  private def createDistriOptimizer(model: AbstractModule[Activity, Activity, T],
+                                    dataset: DistributedDataSet[MiniBatch[T]],
+                                    criterion: Criterion[T],
+                                    optimMethod: OptimMethod[T],
+                                    endTrigger: Trigger): Optimizer[T, MiniBatch[T]] = {
     val optimizer = new DistriOptimizer(
       _model = model,
-      dataset = batching(trainingRdd, batchSize),
+      dataset = dataset,
       criterion = criterion
     ).asInstanceOf[Optimizer[T, MiniBatch[T]]]
     // TODO: we should provide a more convenient way to create Table
@@ -1718,11 +2038,33 @@ class PythonBigDL[T: ClassTag](implicit ev: TensorNumeric[T]) extends Serializab
     optimizer.setValidation(trigger, batching(valRdd, batchSize.toInt), vMethods.asScala.toArray)
   }
 
+  def setValidationFromDataFrame(optimizer: Optimizer[T, MiniBatch[T]],
+                                 batchSize: Int,
+                                 trigger: Trigger,
+                                 valDF: DataFrame,
+                                 featuresCol: String,
+                                 labelCol: String,
+                                 featureShape: JList[Int],
+                                 vMethods: JList[ValidationMethod[T]]): Unit = {
+    val dataset = samplesBatching(
+      dataFrameToSample(valDF, featuresCol, labelCol, featureShape), batchSize)
+    optimizer.setValidation(trigger, dataset, vMethods.asScala.toArray)
+  }
+
+  def resumeOptimizer(optimizer: Optimizer[T, MiniBatch[T]],
+                      checkpointPath: String,
+                      neval: Int): Optimizer[T, MiniBatch[T]] = {
+    optimizer.resume(checkpointPath, neval)
+  }
+
   def setCheckPoint(optimizer: Optimizer[T, MiniBatch[T]],
                     trigger: Trigger,
                     checkPointPath: String,
-                    isOverwrite: Boolean): Unit = {
-    optimizer.setCheckpoint(checkPointPath, trigger)
+                    isOverwrite: Boolean,
+                    async: Boolean = false,
+                    keepLast: Int = 0,
+                    fullEvery: Int = 0): Unit = {
+    optimizer.setCheckpoint(checkPointPath, trigger, async, keepLast, fullEvery)
     if (isOverwrite) {
       optimizer.overWriteCheckpoint()
     }
@@ -1736,6 +2078,19 @@ class PythonBigDL[T: ClassTag](implicit ev: TensorNumeric[T]) extends Serializab
     optimizer.setValidationSummary(summary)
   }
 
+  def optimizeAsync(optimizer: Optimizer[T, MiniBatch[T]]): OptimizationFuture[T] = {
+    optimizer.optimizeAsync()
+  }
+
+  def optimizationProgress(future: OptimizationFuture[T]): JList[JMap[Any, Any]] = {
+    future.pollProgress().map(_.getState().asJava).toList.asJava
+  }
+
+  def optimizationResult(future: OptimizationFuture[T],
+                         timeoutMs: Long): AbstractModule[Activity, Activity, T] = {
+    future.get(timeoutMs)
+  }
+
   def summaryReadScalar(summary: Summary, tag: String): JList[JList[Any]] = {
     val result = summary.readScalar(tag)
     result.toList.map { item =>
@@ -1743,6 +2098,19 @@ class PythonBigDL[T: ClassTag](implicit ev: TensorNumeric[T]) extends Serializab
     }.asJava
   }
 
+  /**
+   * Read the scalars after sinceStep, packed as little-endian records of
+   * (int64 step, float32 value, float64 wallClockTime).
+   */
+  def summaryReadScalarSince(summary: Summary, tag: String, sinceStep: Long): JList[Any] = {
+    val result = summary.readScalar(tag, sinceStep)
+    val buffer = java.nio.ByteBuffer.allocate(20 * result.length).order(ByteOrder.LITTLE_ENDIAN)
+    result.foreach { case (step, value, wallClockTime) =>
+      buffer.putLong(step).putFloat(value).putDouble(wallClockTime)
+    }
+    List[Any](buffer.array()).asJava
+  }
+
   def summarySetTrigger(
                          summary: TrainSummary,
                          summaryName: String,
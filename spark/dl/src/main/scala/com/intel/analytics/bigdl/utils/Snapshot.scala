@@ -0,0 +1,198 @@
+/*
+ * Copyright 2016 The BigDL Authors.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+package com.intel.analytics.bigdl.utils
+
+import java.io.{RandomAccessFile, File => JFile}
+import java.nio.channels.FileChannel
+import java.nio.channels.FileChannel.MapMode
+import java.nio.{ByteBuffer, ByteOrder}
+
+import com.intel.analytics.bigdl.Module
+import com.intel.analytics.bigdl.tensor.{DoubleType, FloatType, Tensor}
+import com.intel.analytics.bigdl.tensor.TensorNumericMath.TensorNumeric
+
+import scala.reflect.ClassTag
+
+/**
+ * A model snapshot is a directory holding the topology of the model, serialized without
+ * its weights, and a weights file which could be memory mapped. The weights file is
+ *
+ *   - magic "BIGDLSNP", version, element size (4 for float and 8 for double),
+ *     number of tensors, and the ndim and sizes of each tensor, all int32
+ *   - padding to a multiple of 64 bytes
+ *   - the elements of all the weights and biases, in the order of model.parameters(),
+ *     row major and little endian
+ *
+ * so the weights are read by bulk copies from the page cache, which is shared by all the
+ * processes loading the same snapshot on a host.
+ */
+object Snapshot {
+  val topologyFile = "model"
+  val weightsFile = "weights"
+
+  private val magic = "BIGDLSNP".getBytes("US-ASCII")
+  private val version = 1
+  private val alignment = 64
+  // elements transferred in one mapped region, keep it under the 2GB limit of a buffer
+  private val chunkElements = 1 << 27
+
+  /**
+   * Save a model as a snapshot, only local file system is supported.
+   *
+   * @param model model to save
+   * @param path the snapshot directory
+   * @param overWrite if overwrite
+   */
+  def save[T: ClassTag](model: Module[T], path: String, overWrite: Boolean = false)
+    (implicit ev: TensorNumeric[T]): Unit = {
+    val dir = new JFile(path)
+    require(!dir.exists() || overWrite, s"$path already exists")
+    dir.mkdirs()
+    model.clearState()
+    val (weights, grads) = getParameters(model)
+    val shared = weights.map(w => Tensor[T]().set(w))
+    val sharedGrads = grads.map(g => if (g == null) null else Tensor[T]().set(g))
+    // Keep the weights and gradients out of the serialized topology
+    weights.foreach(_.set())
+    grads.foreach(g => if (g != null) g.set())
+    try {
+      File.save(model, new JFile(dir, topologyFile).getPath, overWrite)
+    } finally {
+      weights.zip(shared).foreach { case (w, s) => w.set(s) }
+      grads.zip(sharedGrads).foreach { case (g, s) => if (g != null) g.set(s) }
+    }
+
+    val header = encodeHeader(shared.map(_.size()), elementSize(ev))
+    val file = new JFile(dir, weightsFile)
+    file.delete()
+    val raf = new RandomAccessFile(file, "rw")
+    try {
+      val channel = raf.getChannel
+      channel.write(ByteBuffer.wrap(header))
+      var position = header.length.toLong
+      shared.foreach { w =>
+        val contiguous = w.contiguous()
+        transfer(channel, MapMode.READ_WRITE, position, contiguous.storage().array(),
+          contiguous.storageOffset() - 1, contiguous.nElement())
+        position += contiguous.nElement().toLong * elementSize(ev)
+      }
+    } finally {
+      raf.close()
+    }
+  }
+
+  /**
+   * Load a model from a snapshot, the weights are copied from the memory mapped weights file.
+   *
+   * @param path the snapshot directory
+   * @return the model
+   */
+  def load[T: ClassTag](path: String)(implicit ev: TensorNumeric[T]): Module[T] = {
+    val model = File.load[Module[T]](new JFile(path, topologyFile).getPath)
+    val (weights, grads) = getParameters(model)
+    val raf = new RandomAccessFile(new JFile(path, weightsFile), "r")
+    try {
+      val channel = raf.getChannel
+      val (sizes, dataOffset) = decodeHeader(channel, elementSize(ev))
+      require(sizes.length == weights.length, s"The snapshot has ${sizes.length} weights " +
+        s"while the model has ${weights.length}")
+      var position = dataOffset
+      var i = 0
+      while (i < weights.length) {
+        val w = weights(i).resize(sizes(i))
+        transfer(channel, MapMode.READ_ONLY, position, w.storage().array(),
+          w.storageOffset() - 1, w.nElement())
+        position += w.nElement().toLong * elementSize(ev)
+        if (grads(i) != null) grads(i).resize(sizes(i)).zero()
+        i += 1
+      }
+    } finally {
+      raf.close()
+    }
+    model
+  }
+
+  private def getParameters[T](model: Module[T]): (Array[Tensor[T]], Array[Tensor[T]]) = {
+    if (model.parameters() == null) (Array(), Array()) else model.parameters()
+  }
+
+  private def elementSize[T](ev: TensorNumeric[T]): Int = {
+    ev.getType() match {
+      case FloatType => 4
+      case DoubleType => 8
+      case t => throw new IllegalArgumentException(s"Not supported type $t")
+    }
+  }
+
+  private def encodeHeader(sizes: Array[Array[Int]], elementSize: Int): Array[Byte] = {
+    val length = magic.length + 4 * (3 + sizes.map(_.length + 1).sum)
+    val aligned = (length + alignment - 1) / alignment * alignment
+    val buffer = ByteBuffer.allocate(aligned).order(ByteOrder.LITTLE_ENDIAN)
+    buffer.put(magic).putInt(version).putInt(elementSize).putInt(sizes.length)
+    sizes.foreach { size =>
+      buffer.putInt(size.length)
+      size.foreach(buffer.putInt)
+    }
+    buffer.array()
+  }
+
+  private def decodeHeader(channel: FileChannel, elementSize: Int): (Array[Array[Int]], Long) = {
+    val buffer = channel.map(MapMode.READ_ONLY, 0, math.min(channel.size(), Int.MaxValue))
+      .order(ByteOrder.LITTLE_ENDIAN)
+    val fileMagic = new Array[Byte](magic.length)
+    buffer.get(fileMagic)
+    require(fileMagic.sameElements(magic), "Not a BigDL snapshot weights file")
+    val fileVersion = buffer.getInt()
+    require(fileVersion == version, s"Not supported snapshot version $fileVersion")
+    val fileElementSize = buffer.getInt()
+    require(fileElementSize == elementSize,
+      s"The snapshot element size is $fileElementSize, but the model needs $elementSize")
+    val sizes = Array.fill(buffer.getInt()) {
+      Array.fill(buffer.getInt())(buffer.getInt())
+    }
+    val dataOffset = (buffer.position() + alignment - 1) / alignment * alignment
+    (sizes, dataOffset.toLong)
+  }
+
+  private def transfer(channel: FileChannel, mode: MapMode, position: Long,
+    array: Array[_], offset: Int, length: Int): Unit = {
+    var done = 0
+    while (done < length) {
+      val n = math.min(chunkElements, length - done)
+      array match {
+        case floats: Array[Float] =>
+          val buffer = channel.map(mode, position + 4L * done, 4L * n)
+            .order(ByteOrder.LITTLE_ENDIAN).asFloatBuffer()
+          if (mode == MapMode.READ_ONLY) {
+            buffer.get(floats, offset + done, n)
+          } else {
+            buffer.put(floats, offset + done, n)
+          }
+        case doubles: Array[Double] =>
+          val buffer = channel.map(mode, position + 8L * done, 8L * n)
+            .order(ByteOrder.LITTLE_ENDIAN).asDoubleBuffer()
+          if (mode == MapMode.READ_ONLY) {
+            buffer.get(doubles, offset + done, n)
+          } else {
+            buffer.put(doubles, offset + done, n)
+          }
+        case _ => throw new IllegalArgumentException("Only support float and double for now")
+      }
+      done += n
+    }
+  }
+}
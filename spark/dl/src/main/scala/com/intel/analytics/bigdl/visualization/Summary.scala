@@ -18,7 +18,7 @@ package com.intel.analytics.bigdl.visualization
 
 import com.intel.analytics.bigdl.tensor.Tensor
 import com.intel.analytics.bigdl.tensor.TensorNumericMath.TensorNumeric
-import com.intel.analytics.bigdl.visualization.tensorboard.{FileWriter}
+import com.intel.analytics.bigdl.visualization.tensorboard.{FileWriter, ScalarIndex}
 import org.tensorflow
 
 import scala.reflect.ClassTag
@@ -32,7 +32,9 @@ import scala.reflect.ClassTag
 abstract class Summary(
                         logDir: String,
                         appName: String) {
+  protected val folder: String
   protected val writer: FileWriter
+  private lazy val scalarIndex = new ScalarIndex(folder)
 
   /**
    * Add a scalar summary.
@@ -76,6 +78,17 @@ abstract class Summary(
    */
   def readScalar(tag: String): Array[(Long, Float, Double)]
 
+  /**
+   * Read the scalar values logged after a step. The event files are indexed incrementally,
+   * so polling with the last step read only parses the new events.
+   * @param tag tag name.
+   * @param sinceStep only the values with a larger step are returned.
+   * @return an array of triple sorted by step.
+   */
+  def readScalar(tag: String, sinceStep: Long): Array[(Long, Float, Double)] = {
+    scalarIndex.read(tag, sinceStep)
+  }
+
   /**
    * Close this logger.
    */
@@ -17,7 +17,7 @@
 package com.intel.analytics.bigdl.visualization
 
 import com.intel.analytics.bigdl.optim.Trigger
-import com.intel.analytics.bigdl.visualization.tensorboard.{FileReader, FileWriter}
+import com.intel.analytics.bigdl.visualization.tensorboard.FileWriter
 
 import scala.collection.mutable
 
@@ -45,11 +45,14 @@ class TrainSummary(
    * @return an array of triple.
    */
   override def readScalar(tag: String): Array[(Long, Float, Double)] = {
-    FileReader.readScalar(folder, tag)
+    readScalar(tag, Long.MinValue)
   }
 
   /**
-   * Supported tag name are LearningRate, Loss, Throughput, Parameters.
+   * Supported tag name are LearningRate, Loss, Throughput, Parameters, and the time in
+   * seconds of each phase of an iteration in DistriOptimizer: DataFetchTime, GetWeightsTime,
+   * ComputingTime, AggregateGradientTime, UpdateParametersTime and ComputingTimeSpread(the
+   * gap between the slowest and the fastest node).
    * Parameters contains weight, bias, gradWeight, gradBias, and some running status(eg.
    * runningMean and runningVar in BatchNormalization).
    *
@@ -62,9 +65,8 @@ class TrainSummary(
    * @return
    */
   def setSummaryTrigger(tag: String, trigger: Trigger): this.type = {
-    require(tag.equals("LearningRate") || tag.equals("Loss") ||
-      tag.equals("Throughput") | tag.equals("Parameters"),
-      s"TrainSummary: only support LearningRate, Loss, Parameters and Throughput")
+    require(TrainSummary.supportedTags.contains(tag),
+      s"TrainSummary: only support ${TrainSummary.supportedTags.mkString(", ")}")
     triggers(tag) = trigger
     this
   }
@@ -88,6 +90,10 @@ class TrainSummary(
 }
 
 object TrainSummary{
+  private val supportedTags = Seq("LearningRate", "Loss", "Throughput", "Parameters",
+    "DataFetchTime", "GetWeightsTime", "ComputingTime", "AggregateGradientTime",
+    "UpdateParametersTime", "ComputingTimeSpread")
+
   def apply(logDir: String,
             appName: String): TrainSummary = {
     new TrainSummary(logDir, appName)
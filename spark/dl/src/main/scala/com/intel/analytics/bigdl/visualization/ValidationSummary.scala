@@ -16,7 +16,7 @@
 
 package com.intel.analytics.bigdl.visualization
 
-import com.intel.analytics.bigdl.visualization.tensorboard.{FileReader, FileWriter}
+import com.intel.analytics.bigdl.visualization.tensorboard.FileWriter
 
 /**
  * Validation logger for tensorboard.
@@ -39,7 +39,7 @@ class ValidationSummary(
    * @return an array of triple.
    */
   override def readScalar(tag: String): Array[(Long, Float, Double)] = {
-    FileReader.readScalar(folder, tag)
+    readScalar(tag, Long.MinValue)
   }
 }
 
@@ -0,0 +1,120 @@
+/*
+ * Copyright 2016 The BigDL Authors.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+package com.intel.analytics.bigdl.visualization.tensorboard
+
+import java.io.{BufferedInputStream, DataInputStream}
+import java.nio.{ByteBuffer, ByteOrder}
+
+import org.apache.hadoop.conf.Configuration
+import org.apache.hadoop.fs.Path
+import org.tensorflow.util.Event
+
+import scala.collection.mutable
+import scala.collection.mutable.ArrayBuffer
+
+/**
+ * An incremental index of the scalar events in a folder. Each event file is only parsed
+ * from where the last read stopped, and the scalars of all the tags are kept sorted by
+ * step, so reading the records after a step doesn't rescan the event files.
+ *
+ * @param path should be a local/HDFS folder.
+ */
+private[bigdl] class ScalarIndex(path: String) {
+  private val logPath = new Path(path)
+  private val fs = logPath.getFileSystem(new Configuration(false))
+  // bytes indexed of each event file, always at the boundary of a record
+  private val offsets = new mutable.HashMap[Path, Long]()
+  private val scalars = new mutable.HashMap[String, ArrayBuffer[(Long, Float, Double)]]()
+  private val unsorted = new mutable.HashSet[String]()
+
+  /**
+   * Read the scalar events named tag with a step larger than sinceStep.
+   * @param tag tag name.
+   * @param sinceStep only the records after this step are returned.
+   * @return an array of triple (step, value, wallClockTime) sorted by step.
+   */
+  def read(tag: String, sinceStep: Long = Long.MinValue): Array[(Long, Float, Double)] = {
+    synchronized {
+      update()
+      scalars.get(tag) match {
+        case Some(records) =>
+          if (unsorted.remove(tag)) {
+            val sorted = records.sortBy(_._1)
+            records.clear()
+            records ++= sorted
+          }
+          var low = 0
+          var high = records.length
+          while (low < high) {
+            val mid = (low + high) >>> 1
+            if (records(mid)._1 <= sinceStep) low = mid + 1 else high = mid
+          }
+          records.slice(low, records.length).toArray
+        case None => Array()
+      }
+    }
+  }
+
+  private def update(): Unit = {
+    FileReader.listFiles(path).foreach { file =>
+      val length = fs.getFileStatus(file).getLen
+      val offset = offsets.getOrElse(file, 0L)
+      if (length > offset) {
+        offsets(file) = index(file, offset, length)
+      }
+    }
+  }
+
+  /**
+   * Parse the records of file between offset and length, a record partially written is
+   * left to the next update.
+   * @return the offset after the last complete record.
+   */
+  private def index(file: Path, offset: Long, length: Long): Long = {
+    val in = fs.open(file)
+    in.seek(offset)
+    val dis = new DataInputStream(new BufferedInputStream(in))
+    val header = new Array[Byte](12)
+    val crcBuffer = new Array[Byte](4)
+    var position = offset
+    var complete = true
+    try {
+      while (complete && position + header.length <= length) {
+        dis.readFully(header)
+        val l = ByteBuffer.wrap(header, 0, 8).order(ByteOrder.LITTLE_ENDIAN).getLong()
+        if (position + header.length + l + crcBuffer.length > length) {
+          complete = false
+        } else {
+          val eventBuffer = new Array[Byte](l.toInt)
+          dis.readFully(eventBuffer)
+          dis.readFully(crcBuffer)
+          val e = Event.parseFrom(eventBuffer)
+          if (e.getSummary.getValueCount == 1) {
+            val value = e.getSummary.getValue(0)
+            val records = scalars.getOrElseUpdate(value.getTag, new ArrayBuffer())
+            if (records.nonEmpty && records.last._1 > e.getStep) unsorted.add(value.getTag)
+            records.append((e.getStep, value.getSimpleValue, e.getWallTime))
+          }
+          position += header.length + l + crcBuffer.length
+        }
+      }
+    } finally {
+      dis.close()
+    }
+    position
+  }
+}
@@ -325,6 +325,33 @@ class DistriOptimizerSpec extends FlatSpec with Matchers with BeforeAndAfter {
     optimMethod.state.get[Int]("neval").get should be (33)
   }
 
+  "DistriOptimizer async checkpoint" should "only keep the latest checkpoints" in {
+    val filePath = java.io.File.createTempFile("OptimizerSpec", "model").getAbsolutePath
+    Files.delete(Paths.get(filePath))
+    Files.createDirectory(Paths.get(filePath))
+
+    import com.intel.analytics.bigdl._
+    plusOne = 1.0
+    RandomGenerator.RNG.setSeed(10)
+    val optimizer = new DistriOptimizer[Double](
+      cre,
+      dataSet,
+      new ClassNLLCriterion[Double]()
+    )
+    optimizer.setState(T("learningRate" -> 20.0))
+      .setCheckpoint(filePath, Trigger.everyEpoch, async = true, keepLast = 2)
+      .setEndWhen(Trigger.maxEpoch(3))
+      .optimize()
+
+    // the hidden files are the checksums written by the Hadoop local file system
+    val files = new java.io.File(optimizer.getCheckpointPath().get).list()
+      .filterNot(_.startsWith("."))
+    files.sorted should be (Array("model.65", "model.97", "optimMethod.65", "optimMethod.97"))
+    val optimMethod =
+      OptimMethod.load[Double](optimizer.getCheckpointPath().get + "/optimMethod.97")
+    optimMethod.state.get[Int]("epoch").get should be (4)
+  }
+
   "TrainSummary with MSE and LBFGS" should "work correctly" in {
     TestUtils.cancelOnWindows()
     RandomGenerator.RNG.setSeed(10)
@@ -369,6 +396,31 @@ class DistriOptimizerSpec extends FlatSpec with Matchers with BeforeAndAfter {
     trainSummary.close()
   }
 
+  "TrainSummary" should "record the phase times" in {
+    TestUtils.cancelOnWindows()
+    RandomGenerator.RNG.setSeed(10)
+    val logdir = com.google.common.io.Files.createTempDir()
+    val phases = Array("DataFetchTime", "GetWeightsTime", "ComputingTime",
+      "AggregateGradientTime", "UpdateParametersTime", "ComputingTimeSpread")
+    val trainSummary = TrainSummary(logdir.getPath, "phases")
+    phases.foreach(trainSummary.setSummaryTrigger(_, Trigger.severalIteration(1)))
+    val optimizer = new DistriOptimizer[Double](mse, dataSet, new MSECriterion[Double]())
+      .setEndWhen(Trigger.maxIteration(10))
+      .setTrainSummary(trainSummary)
+    optimizer.optimize()
+
+    phases.foreach { phase =>
+      val result = trainSummary.readScalar(phase)
+      result.map(_._1) should be ((1 to 10).toArray)
+      result.foreach(_._2 should be >= 0f)
+    }
+    trainSummary.readScalar("ComputingTime").map(_._2).sum should be > 0f
+    intercept[IllegalArgumentException] {
+      trainSummary.setSummaryTrigger("ForwardTime", Trigger.severalIteration(1))
+    }
+    trainSummary.close()
+  }
+
   "TrainSummary with MSE and Adagrad" should "work correctly" in {
     TestUtils.cancelOnWindows()
     RandomGenerator.RNG.setSeed(10)
@@ -20,7 +20,7 @@ import com.intel.analytics.bigdl.dataset.{DataSet, LocalDataSet, MiniBatch}
 import com.intel.analytics.bigdl.nn._
 import com.intel.analytics.bigdl._
 import com.intel.analytics.bigdl.tensor.{Storage, Tensor}
-import com.intel.analytics.bigdl.utils.{Engine, RandomGenerator, T}
+import com.intel.analytics.bigdl.utils.{Engine, RandomGenerator, T, Table}
 import org.scalatest.{BeforeAndAfter, FlatSpec, Matchers}
 
 object DummyDataSet extends LocalDataSet[MiniBatch[Float]] {
@@ -169,6 +169,102 @@ class LocalOptimizerSpec extends FlatSpec with Matchers with BeforeAndAfter{
 
   }
 
+  "Train model asynchronously" should "report progress and be cancelled" in {
+    RandomGenerator.RNG.setSeed(1000)
+    val optimizer = new LocalOptimizer[Float](
+      creModel,
+      creDataSet,
+      new ClassNLLCriterion[Float].asInstanceOf[Criterion[Float]]
+    ).setEndWhen(Trigger.maxIteration(Int.MaxValue))
+
+    val future = optimizer.optimizeAsync()
+    var progress = future.pollProgress()
+    while (progress.isEmpty) {
+      Thread.sleep(10)
+      progress = future.pollProgress()
+    }
+    progress.head[Int]("neval") should be(2)
+    progress.head.contains("Loss") should be(true)
+    progress.head.contains("Throughput") should be(true)
+    future.isDone() should be(false)
+
+    future.cancel() should be(true)
+    future.get(60000) should not be(null)
+    future.isDone() should be(true)
+    future.isCancelled() should be(true)
+  }
+
+  "Train model" should "resume from the latest checkpoint" in {
+    val path = java.nio.file.Files.createTempDirectory("LocalOptimizerSpec").toString
+    RandomGenerator.RNG.setSeed(1000)
+    val model = creModel
+    new LocalOptimizer[Float](
+      model,
+      creDataSet,
+      new ClassNLLCriterion[Float].asInstanceOf[Criterion[Float]]
+    ).setCheckpoint(path, Trigger.severalIteration(5))
+      .setEndWhen(Trigger.maxIteration(9))
+      .optimize()
+
+    val resumed = creModel
+    var firstIteration = 0
+    new LocalOptimizer[Float](
+      resumed,
+      creDataSet,
+      new ClassNLLCriterion[Float].asInstanceOf[Criterion[Float]]
+    ).resume(path)
+      .setEndWhen(new Trigger {
+        override def apply(state: Table): Boolean = {
+          if (firstIteration == 0) {
+            firstIteration = state[Int]("neval")
+            resumed.getParameters()._1 should be (model.getParameters()._1)
+          }
+          state[Int]("neval") > 12
+        }
+      })
+      .optimize()
+
+    firstIteration should be (10)
+  }
+
+  it should "add the time spent on the working models" in {
+    RandomGenerator.RNG.setSeed(1000)
+    val model = creModel
+    model.setProfiling(true).resetTimes()
+    val optimizer = new LocalOptimizer[Float](
+      model,
+      creDataSet,
+      new ClassNLLCriterion[Float].asInstanceOf[Criterion[Float]]
+    ).setEndWhen(Trigger.maxIteration(10))
+    optimizer.optimize()
+
+    val times = model.getTimes()
+    times.length should be (model.getProfile().length)
+    times.foreach { case (module, forward, backward) =>
+      forward should be > 0L
+      val (forwardCalls, backwardCalls) = module.getCounts()
+      forwardCalls should be > 0L
+      backwardCalls should be (forwardCalls)
+    }
+  }
+
+  it should "not count the calls when profiling is disabled" in {
+    RandomGenerator.RNG.setSeed(1000)
+    val model = creModel
+    model.resetTimes()
+    val optimizer = new LocalOptimizer[Float](
+      model,
+      creDataSet,
+      new ClassNLLCriterion[Float].asInstanceOf[Criterion[Float]]
+    ).setEndWhen(Trigger.maxIteration(10))
+    optimizer.optimize()
+
+    model.isProfiling() should be (false)
+    model.getTimes().foreach { case (module, _, _) =>
+      module.getCounts() should be ((0L, 0L))
+    }
+  }
+
   "Train model with MSE and SGD" should "be good" in {
     RandomGenerator.RNG.setSeed(1000)
 
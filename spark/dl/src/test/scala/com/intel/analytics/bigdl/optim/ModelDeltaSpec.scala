@@ -0,0 +1,76 @@
+/*
+ * Copyright 2016 The BigDL Authors.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+package com.intel.analytics.bigdl.optim
+
+import com.google.common.io.Files
+import com.intel.analytics.bigdl.nn.{Linear, LookupTable, Sequential}
+import com.intel.analytics.bigdl.utils.T
+import org.scalatest.{FlatSpec, Matchers}
+
+@com.intel.analytics.bigdl.tags.Parallel
+class ModelDeltaSpec extends FlatSpec with Matchers {
+  private def model = Sequential[Float]()
+    .add(LookupTable[Float](100, 8))
+    .add(Linear[Float](8, 2))
+
+  "ModelDelta" should "only keep the changed rows" in {
+    val m = model
+    val last = m.parameters()._1.map(_.clone())
+    m.parameters()._1(0).select(1, 3).fill(1.0f)
+    m.parameters()._1(0).select(1, 42).fill(2.0f)
+
+    val delta = ModelDelta[Float](".1", last, m.parameters()._1)
+    delta.previous should be (".1")
+    delta.indices.map(_.toSeq).toSeq should be (Seq(Seq(3, 42), Seq(), Seq()))
+    delta.rows(0).size() should be (Array(2, 8))
+
+    delta.applyTo(last)
+    last should be (m.parameters()._1)
+  }
+
+  "CheckpointWriter with fullEvery" should "write deltas which can be loaded" in {
+    val path = Files.createTempDir().getAbsolutePath
+    val writer = new CheckpointWriter(path, false, fullEvery = 3)
+    val m = model
+    val expected = (1 to 4).map { i =>
+      m.parameters()._1(0).select(1, i).fill(i.toFloat)
+      writer.writeModel(s".$i", m, "state" -> T("neval" -> i))
+      m.parameters()._1.map(_.clone())
+    }
+    writer.await()
+
+    // the hidden files are the checksums written by the Hadoop local file system
+    new java.io.File(path).list().filterNot(_.startsWith(".")).sorted should be (Array(
+      "delta.2", "delta.3", "model.1", "model.4", "state.1", "state.2", "state.3", "state.4"))
+    (1 to 4).foreach { i =>
+      ModelDelta.loadModel[Float](path, s".$i").parameters()._1 should be (expected(i - 1))
+    }
+  }
+
+  it should "keep the deltas of the latest full checkpoints" in {
+    val path = Files.createTempDir().getAbsolutePath
+    val writer = new CheckpointWriter(path, false, async = true, keepLast = 1, fullEvery = 2)
+    val m = model
+    (1 to 3).foreach { i =>
+      m.parameters()._1(0).select(1, i).fill(i.toFloat)
+      writer.writeModel(s".$i", m.cloneModule())
+    }
+    writer.await()
+
+    new java.io.File(path).list().filterNot(_.startsWith(".")) should be (Array("model.3"))
+  }
+}
@@ -100,4 +100,26 @@ class PredictorSpec extends FlatSpec with Matchers with BeforeAndAfter{
     (model.forward(data(91).feature
     ).toTensor[Float].max(1)._2.valueAt(1).toInt)
   }
+
+  "predictMiniBatch" should "keep the output of each mini batch stacked" in {
+    RNG.setSeed(100)
+    val data = new Array[Sample[Float]](97)
+    var i = 0
+    while (i < data.length) {
+      val input = Tensor[Float](28, 28).apply1(_ =>
+        RNG.uniform(0.130660 + i, 0.3081078).toFloat)
+      val label = Tensor[Float](1).fill(1.0f)
+      data(i) = Sample(input, label)
+      i += 1
+    }
+    val model = LeNet5(classNum = 10)
+    val dataSet = sc.parallelize(data, 2)
+    val result = Predictor(model).predictMiniBatch(dataSet, 16).collect()
+
+    result.map(_.size(1)).sum should be (97)
+    result.foreach(_.size(1) should be <= 16)
+    result(0).size(2) should be (10)
+    result(0).select(1, 1) should be (model.forward(data(0).feature))
+    result(0).select(1, 12) should be (model.forward(data(11).feature))
+  }
 }
@@ -0,0 +1,58 @@
+/*
+ * Copyright 2016 The BigDL Authors.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+package com.intel.analytics.bigdl.optim
+
+import java.util.concurrent.{Callable, Executors}
+
+import com.intel.analytics.bigdl.nn.Linear
+import com.intel.analytics.bigdl.tensor.Tensor
+import com.intel.analytics.bigdl.utils.RandomGenerator._
+import org.scalatest.{FlatSpec, Matchers}
+
+class ReplicaPredictorSpec extends FlatSpec with Matchers {
+
+  "ReplicaPredictor" should "share the weights of the model" in {
+    RNG.setSeed(100)
+    val model = Linear[Float](4, 3)
+    val weight = model.weight.clone()
+    val predictor = ReplicaPredictor(model, 2)
+    model.weight should be (weight)
+
+    val input = Tensor[Float](5, 4).rand()
+    predictor.predict(input) should be (model.forward(input))
+    model.weight.fill(1.0f)
+    predictor.predict(input) should be (model.forward(input))
+  }
+
+  "ReplicaPredictor" should "serve concurrent requests" in {
+    RNG.setSeed(100)
+    val model = Linear[Float](4, 3)
+    val predictor = ReplicaPredictor(model, 2)
+    val inputs = (1 to 8).map(_ => Tensor[Float](5, 4).rand())
+    val pool = Executors.newFixedThreadPool(4)
+    try {
+      val outputs = inputs.map(input => pool.submit(new Callable[Tensor[Float]] {
+        override def call(): Tensor[Float] = predictor.predict(input).toTensor[Float]
+      })).map(_.get())
+      inputs.zip(outputs).foreach { case (input, output) =>
+        output should be (model.forward(input))
+      }
+    } finally {
+      pool.shutdown()
+    }
+  }
+}
@@ -0,0 +1,93 @@
+/*
+ * Copyright 2016 The BigDL Authors.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+package com.intel.analytics.bigdl.optim
+
+import com.intel.analytics.bigdl.utils.{T, Table}
+import org.scalatest.{FlatSpec, Matchers}
+
+@com.intel.analytics.bigdl.tags.Parallel
+class TriggerSpec extends FlatSpec with Matchers {
+  "Trigger.and" should "trigger when all the triggers trigger" in {
+    val trigger = Trigger.and(Trigger.minLoss(0.1f), Trigger.maxEpoch(2))
+    trigger(T("Loss" -> 0.05f, "epoch" -> 2)) should be (false)
+    trigger(T("Loss" -> 0.5f, "epoch" -> 3)) should be (false)
+    trigger(T("Loss" -> 0.05f, "epoch" -> 3)) should be (true)
+  }
+
+  "Trigger.or" should "trigger when any trigger triggers" in {
+    val trigger = Trigger.or(Trigger.minLoss(0.1f), Trigger.maxEpoch(2))
+    trigger(T("Loss" -> 0.5f, "epoch" -> 2)) should be (false)
+    trigger(T("Loss" -> 0.5f, "epoch" -> 3)) should be (true)
+    trigger(T("Loss" -> 0.05f, "epoch" -> 1)) should be (true)
+  }
+
+  "Trigger.and and Trigger.or" should "evaluate all the triggers" in {
+    var calls = 0
+    val counter = new Trigger {
+      override def apply(state: Table): Boolean = {
+        calls += 1
+        false
+      }
+    }
+    Trigger.or(Trigger.maxEpoch(0), counter)(T("epoch" -> 1)) should be (true)
+    Trigger.and(Trigger.maxEpoch(5), counter)(T("epoch" -> 1)) should be (false)
+    calls should be (2)
+  }
+
+  "Trigger.patience" should "trigger when the score stops improving" in {
+    val trigger = Trigger.patience(2, minDelta = 0.01f)
+    def validate(score: Float): Boolean = {
+      trigger(T("score" -> score, "validationScores" -> T("Top1Accuracy" -> score)))
+    }
+    trigger(T("score" -> 0f)) should be (false)
+    validate(0.5f) should be (false)
+    validate(0.6f) should be (false)
+    validate(0.605f) should be (false)
+    validate(0.62f) should be (false)
+    validate(0.6f) should be (false)
+    validate(0.61f) should be (true)
+  }
+
+  it should "only count each validation once" in {
+    val trigger = Trigger.patience(1, "Loss", mode = "min")
+    val state = T("score" -> 0.5f, "validationScores" -> T("Loss" -> 1.0f))
+    trigger(state) should be (false)
+    trigger(state) should be (false)
+    state("validationScores") = T("Loss" -> 1.5f)
+    trigger(state) should be (true)
+  }
+
+  it should "go on counting from the state it keeps in the optimizer state" in {
+    val state = T("score" -> 0.5f, "validationScores" -> T("Top1Accuracy" -> 0.5f))
+    Trigger.patience(2)(state) should be (false)
+    state("score") = 0.4f
+    state("validationScores") = T("Top1Accuracy" -> 0.4f)
+    Trigger.patience(2)(state) should be (false)
+    state[Float]("trigger.patience.score.best") should be (0.5f)
+    state[Int]("trigger.patience.score.wait") should be (1)
+
+    // a new trigger with a copy of the state, like an optimizer resumed from a checkpoint
+    val resumed = Trigger.patience(2)
+    val restored = T()
+    Trigger.copyState(state, restored)
+    restored("score") = 0.4f
+    restored("validationScores") = restored("trigger.patience.score.scores")
+    resumed(restored) should be (false)
+    restored("validationScores") = T("Top1Accuracy" -> 0.45f)
+    resumed(restored) should be (true)
+  }
+}
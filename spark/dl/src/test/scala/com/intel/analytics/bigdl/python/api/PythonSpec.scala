@@ -118,6 +118,37 @@ class PythonSpec extends FlatSpec with Matchers with BeforeAndAfter {
 
   }
 
+  "model forward batch" should "be same with forward on each record" in {
+    val pythonBigDL = PythonBigDL.ofFloat()
+    val linear = Linear[Float](4, 3)
+    val input = Tensor[Float](10, 4).rand()
+    val output = pythonBigDL.toTensor(
+      pythonBigDL.modelForwardBatch(linear, pythonBigDL.toJTensor(input), 4))
+    output.size() should be (Array(10, 3))
+    (1 to 10).foreach { i =>
+      output(i).almostEqual(linear.forward(input(i)).toTensor[Float], 1e-5) should be (true)
+    }
+  }
+
+  "flat weights" should "round trip all the weights and biases" in {
+    val pythonBigDL = PythonBigDL.ofFloat()
+    val model = Sequential[Float]().add(Linear[Float](4, 3)).add(Linear[Float](3, 2))
+    val result = pythonBigDL.modelGetFlatWeights(model)
+    val flat = result.get(0).asInstanceOf[JTensor]
+    flat.shape.asScala.toArray should be (Array(23))
+    result.get(1).asInstanceOf[JList[JList[Int]]].asScala.map(_.asScala.toArray).toArray should
+      be (Array(Array(3, 4), Array(3), Array(2, 3), Array(2)))
+    flat.storage.asInstanceOf[Array[Float]].slice(12, 15) should
+      be (model.parameters()._1(1).storage().array())
+
+    val newWeights = Array.tabulate(23)(_.toFloat)
+    pythonBigDL.modelSetFlatWeights(model,
+      JTensor(newWeights, util.Arrays.asList(23), "float"))
+    model.parameters()._1(2) should be (Tensor[Float](newWeights.slice(15, 21), Array(2, 3)))
+    pythonBigDL.modelGetFlatWeights(model).get(0).asInstanceOf[JTensor].storage should
+      be (newWeights)
+  }
+
   "to jtensor" should "be test" in {
     val pythonBigDL = PythonBigDL.ofFloat()
     val tensor: Tensor[Float] = Tensor.ones[Float](10)
@@ -138,6 +169,46 @@ class PythonSpec extends FlatSpec with Matchers with BeforeAndAfter {
     require(output == expectedResult)
   }
 
+  "JTensor" should "be pickled as a binary buffer" in {
+    val pythonBigDL = PythonBigDL.ofFloat()
+    val tensor = Tensor[Float](2, 3).rand()
+    val jTensor = pythonBigDL.toJTensor(tensor)
+    val jTensorBack = BigDLSerDe.loads(BigDLSerDe.dumps(jTensor)).asInstanceOf[JTensor]
+    jTensorBack.bigdlType should be ("float")
+    jTensorBack.shape.asScala.toArray should be (Array(2, 3))
+    pythonBigDL.toTensor(jTensorBack) should be (tensor)
+
+    val pythonBigDLDouble = PythonBigDL.ofDouble()
+    val doubleTensor = Tensor[Double](4).rand()
+    val doubleBack = BigDLSerDe.loads(BigDLSerDe.dumps(pythonBigDLDouble.toJTensor(doubleTensor)))
+      .asInstanceOf[JTensor]
+    pythonBigDLDouble.toTensor(doubleBack) should be (doubleTensor)
+  }
+
+  "Sample" should "be pickled as binary buffers" in {
+    val pythonBigDL = PythonBigDL.ofFloat()
+    val record = Sample(Array.fill(6)(Random.nextFloat()), Array(2.0f),
+      util.Arrays.asList(2, 3), util.Arrays.asList(1), "float")
+    val recordBack = BigDLSerDe.loads(BigDLSerDe.dumps(record)).asInstanceOf[Sample]
+    recordBack.bigdlType should be ("float")
+    val sample = pythonBigDL.toSample(recordBack)
+    sample.feature() should be (Tensor[Float](record.features.asInstanceOf[Array[Float]],
+      Array(2, 3)))
+    sample.label() should be (Tensor[Float](Array(2.0f), Array(1)))
+    pythonBigDL.toPySample(sample).features should be (record.features)
+  }
+
+  "SampleBlock" should "be expanded into samples" in {
+    val pythonBigDL = PythonBigDL.ofFloat()
+    val block = SampleBlock(Array.tabulate(12)(_.toFloat), Array(1.0f, 2.0f),
+      util.Arrays.asList(2, 2, 3), util.Arrays.asList(2), "float")
+    val blockBack = BigDLSerDe.loads(BigDLSerDe.dumps(block)).asInstanceOf[SampleBlock]
+    val samples = blockBack.toSamples().map(pythonBigDL.toSample(_)).toArray
+    samples.length should be (2)
+    samples(1).feature() should be (Tensor[Float](Array.tabulate(6)(_ + 6.0f), Array(2, 3)))
+    samples(1).label() should be (Tensor[Float](Array(2.0f), Array(1)))
+  }
+
   "Double prototype" should "be test" in {
     TestUtils.cancelOnWindows()
 
@@ -151,8 +222,8 @@ class PythonSpec extends FlatSpec with Matchers with BeforeAndAfter {
 
     val data = sc.parallelize(0 to 100).map {i =>
       Sample(
-        Range(0, 100).toList.map(_ => Random.nextDouble()).asJava.asInstanceOf[JList[Any]],
-        util.Arrays.asList(i % 2 + 1.0d),
+        Array.fill(100)(Random.nextDouble()),
+        Array(i % 2 + 1.0d),
         featuresShape,
         labelShape,
         "double"
@@ -0,0 +1,52 @@
+/*
+ * Copyright 2016 The BigDL Authors.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+package com.intel.analytics.bigdl.utils
+
+import java.nio.file.Files
+
+import com.intel.analytics.bigdl.nn._
+import com.intel.analytics.bigdl.tensor.Tensor
+import org.scalatest.{FlatSpec, Matchers}
+
+class SnapshotSpec extends FlatSpec with Matchers {
+
+  "save/load snapshot" should "keep the model and its weights" in {
+    val path = Files.createTempDirectory("snapshot").toString
+    val module = new Sequential[Float]()
+    module.add(new SpatialConvolution(1, 6, 5, 5))
+    module.add(new Tanh())
+    module.add(new Reshape(Array(6 * 4 * 4)))
+    module.add(new Linear(6 * 4 * 4, 10))
+    module.add(new LogSoftMax())
+    val input = Tensor[Float](2, 1, 8, 8).rand()
+    val output = module.forward(input).toTensor[Float].clone()
+
+    module.saveSnapshot(path, true)
+    module.parameters()._1.foreach(_.nElement() should be > 0)
+    val loaded = Module.loadSnapshot[Float](path)
+    loaded.getParameters() should be (module.getParameters())
+    loaded.forward(input) should be (output)
+    loaded.backward(input, output)
+  }
+
+  "load snapshot" should "check the numeric type" in {
+    val path = Files.createTempDirectory("snapshot").toString
+    new Linear[Float](3, 2).saveSnapshot(path, true)
+    intercept[IllegalArgumentException] {
+      Module.loadSnapshot[Double](path)
+    }
+  }
+}
@@ -20,7 +20,7 @@ import com.intel.analytics.bigdl.example.loadmodel.AlexNet
 import com.intel.analytics.bigdl.tensor.Tensor
 import com.intel.analytics.bigdl.utils.{Engine, RandomGenerator, TestUtils}
 import Summary._
-import com.intel.analytics.bigdl.visualization.tensorboard.{FileReader, FileWriter}
+import com.intel.analytics.bigdl.visualization.tensorboard.{FileReader, FileWriter, ScalarIndex}
 import org.scalatest.{BeforeAndAfter, FlatSpec, Matchers}
 import org.tensorflow.framework
 
@@ -117,6 +117,38 @@ class SummarySpec extends FlatSpec with Matchers with BeforeAndAfter {
     }
   }
 
+  "ScalarIndex" should "only return the new records" in {
+    TestUtils.cancelOnWindows()
+    val logdir = com.google.common.io.Files.createTempDir()
+    val index = new ScalarIndex(logdir.getPath)
+    val writer1 = new FileWriter(logdir.getPath, 100)
+    for (i <- 10 to 19) {
+      writer1.addSummary(scalar("lr", i), i + 1)
+    }
+    writer1.close()
+    Thread.sleep(1000) // Waiting for writer.
+    index.read("lr").map(_._1) should be ((11 to 20).toArray)
+    index.read("lr", 15).map(_._1) should be ((16 to 20).toArray)
+    index.read("lr", 20).length should be (0)
+
+    val writer2 = new FileWriter(logdir.getPath, 100)
+    for (i <- 0 to 9) {
+      writer2.addSummary(scalar("lr", i), i + 1)
+      writer2.addSummary(scalar("scalar", i), i + 1)
+    }
+    writer2.close()
+    Thread.sleep(1000) // Waiting for writer.
+    val result = index.read("lr")
+    result.length should be (20)
+    for (i <- 0 to 19) {
+      result(i)._1 should be (i + 1)
+      result(i)._2 should be (i)
+    }
+    index.read("lr", 5).map(_._1) should be ((6 to 20).toArray)
+    index.read("scalar", 8).map(_._2) should be (Array(8f, 9f))
+    index.read("lr") should be (FileReader.readScalar(logdir.getPath, "lr"))
+  }
+
   "read event file with a non-existent tag" should "return a empty array" in {
     TestUtils.cancelOnWindows()
     val logdir = com.google.common.io.Files.createTempDir()